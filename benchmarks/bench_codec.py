@@ -0,0 +1,65 @@
+"""Compare optical payload codecs: bytes on the wire and encode/decode cost.
+
+Run with ``python benchmarks/bench_codec.py``.
+"""
+
+from __future__ import annotations
+
+import ast
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from unified_ai.codec import FrameCodec, ReprCodec  # noqa: E402
+
+
+def payloads() -> dict[str, object]:
+    memories = [
+        {
+            "key": f"memory {i}",
+            "content": f"I would like some productivity tips for week {i}",
+            "timestamp": "2024-01-01T00:00:00",
+            "access_count": i % 7,
+        }
+        for i in range(2000)
+    ]
+    return {
+        "reply": "Reasoned: hello there",
+        "status": {"status": "spawned"},
+        "snapshot": {"memories": memories, "features": ["smart_packet_shaping"]},
+    }
+
+
+def main() -> None:
+    legacy = ReprCodec()
+    frame = FrameCodec()
+    print(f"{'payload':<10} {'codec':<7} {'bytes':>9} {'encode us':>10} {'decode us':>10}")
+    for name, value in payloads().items():
+        number = 20 if name == "snapshot" else 20000
+        legacy_wire = legacy.encode(value).encode()
+        frame_wire = frame.encode(value)
+        rows = [
+            (
+                "repr",
+                len(legacy_wire),
+                timeit.timeit(lambda: legacy.encode(value).encode(), number=number),
+                # Consumers of the repr format have to parse a Python literal.
+                timeit.timeit(lambda: ast.literal_eval(legacy_wire.decode()), number=number)
+                if not isinstance(value, str)
+                else timeit.timeit(lambda: legacy_wire.decode(), number=number),
+            ),
+            (
+                "frame",
+                len(frame_wire),
+                timeit.timeit(lambda: frame.encode(value), number=number),
+                timeit.timeit(lambda: frame.decode(frame_wire), number=number),
+            ),
+        ]
+        for codec, size, enc, dec in rows:
+            print(f"{name:<10} {codec:<7} {size:>9} {enc / number * 1e6:>10.2f} {dec / number * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
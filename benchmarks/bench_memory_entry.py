@@ -0,0 +1,67 @@
+"""Compare bytes per memory of ``MemoryEntry`` with the previous design.
+
+The previous entry was a regular dataclass holding a ``datetime``.  Both
+layouts are measured with ``tracemalloc`` for the entries themselves and
+for a full ``BrainEngine`` store (entries, keys, content and index).
+
+Run with ``python benchmarks/bench_memory_entry.py --memories 1000000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from unified_ai.brain import BrainEngine, MemoryEntry  # noqa: E402
+
+
+@dataclass
+class LegacyMemoryEntry:
+    content: str
+    timestamp: datetime
+    access_count: int = 0
+
+
+def _measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--memories", type=int, default=200_000)
+    args = parser.parse_args()
+    n = args.memories
+    content = "shared content"
+
+    legacy = _measure(lambda: [LegacyMemoryEntry(content, datetime.utcnow()) for _ in range(n)])
+    compact = _measure(lambda: [MemoryEntry(content, time.time()) for _ in range(n)])
+    print(f"entry only:  legacy {legacy / n:.1f} B, slotted {compact / n:.1f} B per memory")
+
+    async def fill() -> BrainEngine:
+        brain = BrainEngine()
+        for i in range(n):
+            await brain.store_memory(f"memory {i}", f"I said something interesting, number {i}")
+        return brain
+
+    store = _measure(lambda: asyncio.run(fill()))
+    print(f"full store:  {store / n:.1f} B per memory (keys, content, entry and index)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare copying and sharing memories when spawning a local replica.
+
+``copy`` replays every memory into a fresh ``BrainEngine`` as
+``duplicate_local`` does by default; ``shared`` freezes the parent once and
+attaches the segment.  Added memory is measured with ``tracemalloc`` (the
+segment itself lives in shared memory and is reported separately).
+
+Run with ``python benchmarks/bench_replica.py --memories 1000000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from unified_ai.brain import BrainEngine  # noqa: E402
+from unified_ai.segment import FrozenSegment  # noqa: E402
+
+
+async def _copy(parent: BrainEngine) -> BrainEngine:
+    replica = BrainEngine()
+    async for batch in parent.stream_memories():
+        for memory in batch:
+            await replica.store_memory(memory["key"], memory["content"])
+    return replica
+
+
+async def _shared(parent: BrainEngine) -> BrainEngine:
+    replica = BrainEngine()
+    replica.attach_base(FrozenSegment.attach(parent.freeze().name))
+    return replica
+
+
+async def _measure(label: str, spawn, parent: BrainEngine) -> None:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    replica = await spawn(parent)
+    elapsed = time.perf_counter() - started
+    added = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<14} {elapsed * 1000:10.1f} ms  {added / 1e6:8.1f} MB added")
+    del replica
+
+
+async def run(memories: int, skip_copy: bool) -> None:
+    parent = BrainEngine()
+    for i in range(memories):
+        await parent.store_memory(f"memory {i}", f"I said something interesting, number {i}")
+
+    started = time.perf_counter()
+    segment = parent.freeze()
+    print(f"{memories} memories: freeze {time.perf_counter() - started:.2f}s, segment {segment.nbytes / 1e6:.1f} MB")
+    await _measure("shared spawn", _shared, parent)
+    if not skip_copy:
+        await _measure("copy spawn", _copy, parent)
+    await parent.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--memories", type=int, default=100_000)
+    parser.add_argument("--skip-copy", action="store_true", help="Only measure the shared path")
+    args = parser.parse_args()
+    asyncio.run(run(args.memories, args.skip_copy))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure ``SystemReplicator._secure`` throughput against the legacy cipher.
+
+The legacy path XORed the JSON payload byte by byte and base64-encoded it;
+the current one compresses first and XORs whole chunks.  Throughput is
+reported in MB/s of JSON input.
+
+Run with ``python benchmarks/bench_replication.py --memories 50000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from unified_ai import UnifiedAI  # noqa: E402
+from unified_ai.replicator import SystemReplicator  # noqa: E402
+
+
+def legacy_secure(token: str, key: bytes, data: object) -> str:
+    encoded = json.dumps({"token": token, "data": data}).encode()
+    xored = bytes(b ^ key[i % len(key)] for i, b in enumerate(encoded))
+    return base64.b64encode(xored).decode()
+
+
+def _timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--memories", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    snapshot = {
+        "memories": [
+            {
+                "key": f"memory {i}",
+                "content": f"I would like some productivity tips for week {i}",
+                "timestamp": "2024-01-01T00:00:00",
+                "access_count": i % 7,
+            }
+            for i in range(args.memories)
+        ],
+        "features": ["smart_packet_shaping"],
+    }
+    size = len(json.dumps({"token": "replica", "data": snapshot}))
+    engine = UnifiedAI()
+    replicator = SystemReplicator(engine, encryption_key="replication-key")
+
+    def seal(binary: bool):
+        engine.optical.codec.binary = binary
+        return replicator._secure(snapshot)
+
+    print(f"payload: {size / 1e6:.2f} MB of JSON")
+    rows = [("legacy", lambda: legacy_secure("replica", replicator.key, snapshot))]
+    for binary, label in ((False, "base64"), (True, "bytes")):
+        print(f"{label}: {len(seal(binary)) / 1e6:.2f} MB on the wire")
+        rows.append((label, lambda binary=binary: seal(binary)))
+
+    for label, func in rows:
+        elapsed = _timed(func, args.repeat)
+        print(f"{label:<7} {size / elapsed / 1e6:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
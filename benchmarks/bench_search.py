@@ -0,0 +1,68 @@
+"""Measure BM25 query latency of ``BrainEngine.search`` as the store grows.
+
+Memories are synthetic sentences drawn from a Zipf-distributed vocabulary so
+common terms have long postings lists, as in real text.
+
+Run with ``python benchmarks/bench_search.py --sizes 10000,100000,1000000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from unified_ai.brain import BrainEngine  # noqa: E402
+
+
+def _sentences(rng: random.Random, vocabulary: int, words: int):
+    terms = [f"w{i}" for i in range(vocabulary)]
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, vocabulary + 1)))
+    while True:
+        yield " ".join(rng.choices(terms, cum_weights=cumulative, k=words))
+
+
+async def run(size: int, queries: int, vocabulary: int, seed: int) -> None:
+    rng = random.Random(seed)
+    sentences = _sentences(rng, vocabulary, 8)
+    brain = BrainEngine()
+    started = time.perf_counter()
+    for i in range(size):
+        await brain.store_memory(f"memory {i}", next(sentences))
+    build = time.perf_counter() - started
+
+    samples = []
+    for _ in range(queries):
+        query = " ".join(next(sentences).split()[:4])
+        started = time.perf_counter()
+        await brain.search(query, 5)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    print(
+        f"{size} memories: index build {build:.2f}s, "
+        f"query mean {mean * 1000:.3f}ms, p99 {p99 * 1000:.3f}ms"
+    )
+    await brain.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for size in (int(value) for value in args.sizes.split(",")):
+        asyncio.run(run(size, args.queries, args.vocabulary, args.seed))
+
+
+if __name__ == "__main__":
+    main()
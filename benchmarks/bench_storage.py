@@ -0,0 +1,55 @@
+"""Measure restart time of a BrainEngine backed by ``AppendOnlyStorage``.
+
+Run with ``python benchmarks/bench_storage.py --memories 1000000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from unified_ai.brain import BrainEngine  # noqa: E402
+from unified_ai.storage import AppendOnlyStorage  # noqa: E402
+
+
+async def run(memories: int, compact: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "brain.db")
+        brain = BrainEngine(storage=AppendOnlyStorage(path, snapshot_every=10**12))
+        await brain.initialize()
+        started = time.perf_counter()
+        for i in range(memories):
+            await brain.store_memory(f"memory {i}", f"I said something interesting, number {i}")
+        write = time.perf_counter() - started
+        if compact:
+            await brain.storage.compact()
+        await brain.close()
+        size = sum(p.stat().st_size for p in Path(tmp).iterdir())
+
+        started = time.perf_counter()
+        reopened = BrainEngine(storage=AppendOnlyStorage(path))
+        await reopened.initialize()
+        load = time.perf_counter() - started
+        assert await reopened.memory_count() == memories
+        await reopened.close()
+
+    source = "snapshot" if compact else "log"
+    print(f"{memories} memories: write {write:.2f}s, {size / 1e6:.1f} MB on disk, restart from {source} {load:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--memories", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.memories, compact=False))
+    asyncio.run(run(args.memories, compact=True))
+
+
+if __name__ == "__main__":
+    main()
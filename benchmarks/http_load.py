@@ -0,0 +1,291 @@
+"""In-process load generator for the ``unified_ai`` HTTP API.
+
+The app from ``unified_ai.__main__`` is driven directly on the event loop
+with a stub Redis client, optionally slowed down to mimic network round
+trips.  Results are written as JSON so runs from different commits can be
+compared::
+
+    python benchmarks/http_load.py --requests 5000 --concurrency 64 --out base.json
+    python benchmarks/http_load.py --requests 5000 --concurrency 64 --compare base.json
+
+``--compare`` exits with status 1 when throughput drops or p99 latency grows by
+more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from unified_ai import UnifiedAI, _redis_stub  # noqa: E402
+import unified_ai.__main__ as api  # noqa: E402
+
+ROUTES = {
+    "query": ("POST", "/query"),
+    "health": ("GET", "/health"),
+    "metrics": ("GET", "/metrics"),
+}
+
+QUERIES = [
+    "hello there",
+    "any productivity tips for today?",
+    "I am learning rust",
+    "what a great day",
+    "I feel sad about the news",
+    "tell me something new",
+]
+
+Dispatch = Callable[[str, str, Any], Awaitable[int]]
+
+
+class SlowRedis(_redis_stub.Redis):
+    """Stub client that sleeps ``latency`` seconds per round trip."""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__()
+        self.latency = latency
+
+    async def publish(self, channel: str, data: Any) -> int:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await super().publish(channel, data)
+
+    async def ping(self) -> bool:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return True
+
+    def pipeline(self, transaction: bool = True) -> _redis_stub.FakePipeline:
+        pipe = super().pipeline(transaction)
+        execute = pipe.execute
+        latency = self.latency
+
+        async def slow_execute() -> list:
+            # One round trip for the whole pipeline, not one per command.
+            self.latency, saved = 0.0, latency
+            try:
+                if saved:
+                    await asyncio.sleep(saved)
+                return await execute()
+            finally:
+                self.latency = saved
+
+        pipe.execute = slow_execute
+        return pipe
+
+
+def _make_dispatch(app: Any) -> Dispatch:
+    routes = getattr(app, "_routes", None)
+    if routes is not None:
+        # Local FastAPI stub: call the route handlers directly.
+        from fastapi import HTTPException, Request
+        from fastapi.testclient import TestClient
+
+        request = Request(app)
+
+        async def dispatch(method: str, path: str, payload: Any) -> int:
+            handler = routes[(method, path)]
+            try:
+                await handler(*TestClient._build_args(handler, payload or {}, request))
+            except HTTPException as exc:
+                return exc.status_code
+            return 200
+
+        return dispatch
+
+    import httpx
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    async def dispatch(method: str, path: str, payload: Any) -> int:
+        response = await client.request(method, path, json=payload)
+        return response.status_code
+
+    return dispatch
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summarise(latencies: List[float], elapsed: float, errors: int) -> Dict[str, float]:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def _plan(args: argparse.Namespace) -> List[Tuple[str, Any]]:
+    rng = random.Random(args.seed)
+    names, weights = zip(*args.mix.items())
+    plan = []
+    for _ in range(args.requests):
+        route = rng.choices(names, weights)[0]
+        payload = {"query": rng.choice(QUERIES)} if route == "query" else None
+        plan.append((route, payload))
+    return plan
+
+
+async def _load(dispatch: Dispatch, plan: List[Tuple[str, Any]], concurrency: int) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = {route: [] for route in ROUTES}
+    errors: Dict[str, int] = {route: 0 for route in ROUTES}
+    cursor = iter(plan)
+
+    async def worker() -> None:
+        for route, payload in cursor:
+            method, path = ROUTES[route]
+            started = time.perf_counter()
+            status = await dispatch(method, path, payload)
+            latencies[route].append(time.perf_counter() - started)
+            if status >= 400:
+                errors[route] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    everything = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "overall": _summarise(everything, elapsed, sum(errors.values())),
+        "routes": {
+            route: _summarise(samples, elapsed, errors[route]) for route, samples in latencies.items() if samples
+        },
+    }
+
+
+async def _allocations(dispatch: Dispatch, plan: List[Tuple[str, Any]]) -> Dict[str, float]:
+    """Measure memory churn of sequential requests.
+
+    ``retained_blocks_per_request`` is the growth in live allocator blocks
+    (a leak indicator); ``peak_bytes_per_request`` is the traced peak.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+        for route, payload in plan:
+            method, path = ROUTES[route]
+            await dispatch(method, path, payload)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        retained = sys.getallocatedblocks() - blocks
+    finally:
+        gc.enable()
+    return {
+        "retained_blocks_per_request": retained / len(plan),
+        "peak_bytes_per_request": peak / len(plan),
+    }
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    engine = UnifiedAI(coalesce_window=args.coalesce_window)
+    engine.redis = engine.optical.redis = SlowRedis(args.redis_latency)
+    await engine.initialize()
+    api.app.state.engine = engine
+    api.app.state.coordinator = None
+    dispatch = _make_dispatch(api.app)
+    try:
+        plan = _plan(args)
+        await _load(dispatch, plan[: min(len(plan), 200)], args.concurrency)  # warm-up
+        results = await _load(dispatch, plan, args.concurrency)
+        results["allocations"] = await _allocations(dispatch, plan[: args.alloc_sample])
+    finally:
+        await engine.close()
+    return {
+        "commit": _commit(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "redis_latency_ms": args.redis_latency * 1000,
+            "coalesce_window": args.coalesce_window,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a description of every regression beyond ``tolerance``."""
+    problems = []
+    for route, now in current["results"]["routes"].items():
+        then = baseline["results"]["routes"].get(route)
+        if not then:
+            continue
+        if now["rps"] < then["rps"] * (1 - tolerance):
+            problems.append(f"{route}: rps {then['rps']:.0f} -> {now['rps']:.0f}")
+        if now["p99_ms"] > then["p99_ms"] * (1 + tolerance):
+            problems.append(f"{route}: p99 {then['p99_ms']:.2f}ms -> {now['p99_ms']:.2f}ms")
+    return problems
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route '{name}'")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test the UnifiedAI API in-process")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix("query=8,health=1,metrics=1"))
+    parser.add_argument("--redis-latency", type=float, default=0.0, help="Injected seconds per Redis round trip")
+    parser.add_argument("--coalesce-window", type=float, default=None)
+    parser.add_argument("--alloc-sample", type=int, default=200, help="Requests measured for allocations")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        problems = compare(report, baseline, args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
-from typing import Any, Optional, Dict, List
+from itertools import islice
+from typing import Any, AsyncIterable, Optional, Dict, Iterable, List, Tuple
+import asyncio
+import heapq
 import logging
+import time
 from datetime import datetime
 import json
 from pathlib import Path
@@ -8,14 +12,38 @@ from pathlib import Path
 class BrainEngine:
     """Engine for advanced reasoning, problem-solving, and memory storage."""
 
-    def __init__(self, memory_limit: int = 1000) -> None:
-        """Initialize the engine with a configurable memory limit."""
+    def __init__(
+        self, memory_limit: int = 1000, default_ttl: Optional[float] = None, expiry_interval: float = 1.0
+    ) -> None:
+        """Initialize the engine with a memory limit and optional default TTL in seconds.
+
+        Once ``initialize`` has been awaited, expired memories are removed
+        every ``expiry_interval`` seconds until ``close``.
+        """
         self.memories: Dict[str, Dict[str, Any]] = {}
         self.memory_limit = memory_limit
+        self.default_ttl = default_ttl
+        self.expiry_interval = expiry_interval
+        self._expires: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_task: Optional[asyncio.Task] = None
+        self.expiry_stats = {"expired": 0, "last_cycle": 0}
         self._setup_logging()
         self.logger.info("BrainEngine initialized.")
         self._load_optical_engine_datasheet()
 
+    async def initialize(self) -> None:
+        """Start removing expired memories in the background."""
+        if self.expiry_interval and self._expiry_task is None:
+            self._expiry_task = asyncio.create_task(self.run_expiry(self.expiry_interval))
+
+    async def close(self) -> None:
+        """Stop the background expiry started by ``initialize``."""
+        if self._expiry_task is not None:
+            self._expiry_task.cancel()
+            await asyncio.gather(self._expiry_task, return_exceptions=True)
+            self._expiry_task = None
+
     def _setup_logging(self) -> None:
         """Configure logging for the engine."""
         logging.basicConfig(
@@ -188,19 +216,124 @@ class BrainEngine:
             self.logger.error("Error in learning: %s", exc)
             return False
 
-    def store_memory(self, key: str, value: Dict[str, Any]) -> None:
-        """Save a memory item, evicting the oldest if necessary."""
+    def store_memory(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Save a memory item, evicting the oldest if necessary.
+
+        The item expires after ``ttl`` seconds, or ``default_ttl`` if unset.
+        """
         if len(self.memories) >= self.memory_limit:
             self.logger.warning("Memory limit reached. Evicting oldest memory.")
             oldest_key = next(iter(self.memories))
             self.memories.pop(oldest_key)
+            self._expires.pop(oldest_key, None)
             self.logger.debug("Evicted memory with key: %s", oldest_key)
 
         self.memories[key] = value
+        self._set_ttl(key, ttl)
         self.logger.debug("Stored memory with key: %s", key)
 
+    def _set_ttl(self, key: str, ttl: Optional[float]) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl is None:
+            self._expires.pop(key, None)
+            return
+        deadline = time.time() + ttl
+        self._expires[key] = deadline
+        heapq.heappush(self._expiry_heap, (deadline, key))
+
+    def _is_expired(self, key: str) -> bool:
+        deadline = self._expires.get(key)
+        return deadline is not None and deadline <= time.time()
+
+    def expire_memories(self, limit: Optional[int] = None) -> int:
+        """Remove up to ``limit`` memories whose TTL has passed."""
+        now = time.time()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now and (limit is None or removed < limit):
+            deadline, key = heapq.heappop(self._expiry_heap)
+            if self._expires.get(key) != deadline:
+                continue  # stored again with a new deadline, or already gone
+            del self._expires[key]
+            self.memories.pop(key, None)
+            removed += 1
+        self.expiry_stats["expired"] += removed
+        return removed
+
+    async def run_expiry(self, interval: float = 1.0, slice_size: int = 1000) -> None:
+        """Expire memories forever, ``slice_size`` at a time between yields."""
+        while True:
+            await asyncio.sleep(interval)
+            cycle = 0
+            while True:
+                removed = self.expire_memories(limit=slice_size)
+                cycle += removed
+                if removed < slice_size:
+                    break
+                await asyncio.sleep(0)
+            self.expiry_stats["last_cycle"] = cycle
+            if cycle:
+                self.logger.info("Expired %d memories", cycle)
+
+    def store_many(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Save many memory items at once, evicting the oldest only once at the end."""
+        stored = 0
+        for key, value in records:
+            self.memories[key] = value
+            self._set_ttl(key, None)
+            stored += 1
+        self._trim()
+        self.logger.debug("Stored %d memories", stored)
+        return stored
+
+    async def store_many_async(
+        self, records: AsyncIterable[Tuple[str, Dict[str, Any]]], batch_size: int = 1000
+    ) -> int:
+        """Save memory items read from an async iterable, such as a network stream.
+
+        The oldest memories are evicted every ``batch_size`` records, so the
+        engine never holds more than ``memory_limit + batch_size`` of them,
+        and the event loop gets a turn between batches.
+        """
+        stored = 0
+        async for key, value in records:
+            self.memories[key] = value
+            self._set_ttl(key, None)
+            stored += 1
+            if stored % batch_size == 0:
+                self._trim()
+                await asyncio.sleep(0)
+        self._trim()
+        self.logger.debug("Stored %d memories", stored)
+        return stored
+
+    def _trim(self) -> None:
+        overflow = len(self.memories) - self.memory_limit
+        if overflow > 0:
+            self.logger.warning("Memory limit reached. Evicting %d oldest memories.", overflow)
+            for oldest_key in list(islice(self.memories, overflow)):
+                del self.memories[oldest_key]
+                self._expires.pop(oldest_key, None)
+
+    def import_memories(self, memories: Iterable[Dict[str, Any]]) -> int:
+        """Bulk-load memories exported as ``{"key": ..., **memory}`` dicts."""
+        return self.store_many(_exported_records(memories))
+
+    async def import_memories_async(self, memories: AsyncIterable[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """Bulk-load exported memories read from an async iterable."""
+
+        async def records():
+            async for memory in memories:
+                yield _exported_record(memory)
+
+        return await self.store_many_async(records(), batch_size=batch_size)
+
     def retrieve_memory(self, key: str) -> Optional[Any]:
         """Fetch a memory and update its access count."""
+        if self._is_expired(key):
+            # Only this key; the backlog is left to ``run_expiry``.
+            del self._expires[key]
+            self.memories.pop(key, None)
+            self.expiry_stats["expired"] += 1
         memory_data = self.memories.get(key)
         if memory_data:
             memory_data["access_count"] += 1
@@ -225,7 +358,9 @@ class BrainEngine:
         """Return memories relevant to the query using simple keyword matching."""
         relevant: List[Dict[str, Any]] = []
         query_lower = query.lower()
-        for memory_data in self.memories.values():
+        for key, memory_data in self.memories.items():
+            if self._is_expired(key):
+                continue
             content_lower = str(memory_data["content"]).lower()
             tags = memory_data.get("tags", [])
             if query_lower in content_lower or any(t.lower() in query_lower for t in tags):
@@ -236,9 +371,19 @@ class BrainEngine:
     def clear_memories(self) -> None:
         """Remove all stored memories."""
         self.memories.clear()
+        self._expires.clear()
+        self._expiry_heap.clear()
         self.logger.info("All memories cleared.")
 
 
+def _exported_record(memory: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    return memory["key"], {field: value for field, value in memory.items() if field != "key"}
+
+
+def _exported_records(memories: Iterable[Dict[str, Any]]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    return (_exported_record(memory) for memory in memories)
+
+
 async def main() -> None:
     """Demonstration of BrainEngine usage (requires 'fetch')."""
     engine = BrainEngine(memory_limit=5)
@@ -13,10 +13,13 @@ def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> bool | None:
     if not marker:
         return None
 
+    # ``funcargs`` also holds fixtures requested only indirectly (for example
+    # ``tmp_path_factory`` behind ``tmp_path``); pass just the test's own.
+    kwargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
     loop = asyncio.new_event_loop()
     try:
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(pyfuncitem.obj(**pyfuncitem.funcargs))
+        loop.run_until_complete(pyfuncitem.obj(**kwargs))
     finally:
         asyncio.set_event_loop(None)
         loop.close()
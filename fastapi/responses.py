@@ -0,0 +1,35 @@
+"""Response classes mirroring ``fastapi.responses`` for the local stub."""
+
+from __future__ import annotations
+
+from typing import AsyncIterable, Iterable, Optional, Union
+
+
+class Response:
+    media_type: Optional[str] = None
+
+    def __init__(self, content: str | bytes = b"", status_code: int = 200, media_type: Optional[str] = None) -> None:
+        self.body = content.encode() if isinstance(content, str) else content
+        self.status_code = status_code
+        if media_type is not None:
+            self.media_type = media_type
+
+
+class PlainTextResponse(Response):
+    media_type = "text/plain"
+
+
+class StreamingResponse(Response):
+    """Response whose body is produced chunk by chunk from an iterator."""
+
+    def __init__(
+        self,
+        content: Union[AsyncIterable[str | bytes], Iterable[str | bytes]],
+        status_code: int = 200,
+        media_type: Optional[str] = None,
+    ) -> None:
+        super().__init__(b"", status_code, media_type)
+        self.body_iterator = content
+
+
+__all__ = ["Response", "PlainTextResponse", "StreamingResponse"]
@@ -4,21 +4,28 @@ from __future__ import annotations
 
 import asyncio
 import inspect
+import json
 import threading
 from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
 from . import FastAPI, HTTPException, Request
+from .responses import Response, StreamingResponse
 
 
 @dataclass
 class _Response:
     status_code: int
     _payload: Any
+    media_type: Optional[str] = "application/json"
 
     def json(self) -> Any:
         return self._payload
 
+    @property
+    def text(self) -> str:
+        return self._payload if isinstance(self._payload, str) else json.dumps(self._payload)
+
 
 class TestClient:
     def __init__(self, app: FastAPI) -> None:
@@ -65,16 +72,32 @@ class TestClient:
         async def invoke() -> Any:
             args = self._build_args(handler, payload, request)
             if inspect.iscoroutinefunction(handler):
-                return await handler(*args)
-            return handler(*args)
+                result = await handler(*args)
+            else:
+                result = handler(*args)
+            if isinstance(result, StreamingResponse):
+                result.body = await self._drain(result.body_iterator)
+            return result
 
         future = asyncio.run_coroutine_threadsafe(invoke(), self._loop)
         try:
             result = future.result()
+            if isinstance(result, Response):
+                return _Response(result.status_code, result.body.decode(), result.media_type)
             return _Response(200, result)
         except HTTPException as exc:
             return _Response(exc.status_code, {"detail": exc.detail})
 
+    @staticmethod
+    async def _drain(iterator: Any) -> bytes:
+        chunks = []
+        if hasattr(iterator, "__aiter__"):
+            async for chunk in iterator:
+                chunks.append(chunk)
+        else:
+            chunks.extend(iterator)
+        return b"".join(c.encode() if isinstance(c, str) else c for c in chunks)
+
     async def _run_events(self, events):
         for func in events:
             result = func()
@@ -1,3 +1,5 @@
+import base64
+import json
 import pytest
 from pathlib import Path
 from unittest.mock import AsyncMock
@@ -7,6 +9,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from unified_ai.replicator import SystemReplicator
 from unified_ai import UnifiedAI
+from unified_ai.brain import BrainEngine
 
 
 @pytest.mark.asyncio
@@ -15,16 +18,19 @@ async def test_duplicate_local_invokes_store(monkeypatch):
     engine.connect = AsyncMock()
     engine.initialize = AsyncMock()
     engine.optical.transfer_data = AsyncMock()
-    # snapshot to return one memory and feature
-    async def fake_snapshot(self):
-        return {"memories": [{"key": "k", "content": "v"}], "features": ["feat"]}
-
-    monkeypatch.setattr(SystemReplicator, "_snapshot", fake_snapshot)
+    # one memory and feature to copy; memories are streamed from the brain
+    await engine.brain.store_memory("k", "v")
+    engine.feature_manager.enabled.add("feat")
 
     duplicate = AsyncMock()
     duplicate.connect = AsyncMock()
     duplicate.initialize = AsyncMock()
-    duplicate.brain.store_memory = AsyncMock()
+    imported = []
+
+    async def collect(memories):
+        imported.extend([mem async for mem in memories])
+
+    duplicate.brain.import_memories = AsyncMock(side_effect=collect)
     from unittest.mock import MagicMock
     duplicate.feature_manager.enable = MagicMock()
     # patch UnifiedAI constructor to return our duplicate
@@ -35,22 +41,196 @@ async def test_duplicate_local_invokes_store(monkeypatch):
 
     duplicate.connect.assert_awaited_once()
     duplicate.initialize.assert_awaited_once()
-    duplicate.brain.store_memory.assert_awaited_with("k", "v")
+    duplicate.brain.import_memories.assert_awaited_once()
+    assert [(m["key"], m["content"]) for m in imported] == [("k", "v")]
     duplicate.feature_manager.enable.assert_called_with("feat")
     assert result is duplicate
 
 
 @pytest.mark.asyncio
-async def test_duplicate_remote_sends(monkeypatch):
+async def test_duplicate_remote_sends_the_snapshot_in_parts():
     engine = UnifiedAI()
     engine.optical.transfer_data = AsyncMock(return_value=True)
-    engine.brain.db = AsyncMock()  # avoid real DB
+    for i in range(5):
+        await engine.brain.store_memory(f"k{i}", f"v{i}")
+    replicator = SystemReplicator(engine, token="t", snapshot_batch=2)
+    assert await replicator.duplicate_remote("channel") is True
+
+    parts = [json.loads(call.args[0])["data"] for call in engine.optical.transfer_data.await_args_list]
+    assert [(p["part"], p["final"], len(p["memories"])) for p in parts] == [(0, False, 2), (1, False, 2), (2, True, 1)]
+    assert {p["type"] for p in parts} == {"snapshot"}
 
-    async def fake_snapshot(self):
-        return {"foo": "bar"}
 
-    monkeypatch.setattr(SystemReplicator, "_snapshot", fake_snapshot)
+@pytest.mark.asyncio
+async def test_replica_applies_snapshot_parts_and_acks_the_last():
+    engine = UnifiedAI()
+    engine.optical.transfer_data = AsyncMock(return_value=True)
+    for i in range(5):
+        await engine.brain.store_memory(f"k{i}", f"v{i}")
+    engine.brain._alias("folded", "k1")
+    replicator = SystemReplicator(engine, token="t", snapshot_batch=2)
+    replica = UnifiedAI()
+    await replica.brain.store_memory("stale", "not on the primary")
+    replica.brain._alias("stale alias", "k2")
+    receiver = SystemReplicator(replica)
+
+    await replicator.sync_remote("replica")
+    parts = [json.loads(call.args[0])["data"] for call in engine.optical.transfer_data.await_args_list]
+    assert [await receiver.apply_sync(part) for part in parts[:-1]] == [None, None]
+    ack = await receiver.apply_sync(parts[-1])
+    assert ack == {"log_id": engine.brain.log_id, "seq": engine.brain.sequence}
+    assert await replica.brain.export_memories() == await engine.brain.export_memories()
+    assert replica.brain.aliases() == {"folded": "k1"}
+
+    # A part without its predecessors asks for a fresh snapshot.
+    fresh = SystemReplicator(UnifiedAI())
+    assert await fresh.apply_sync(parts[1]) == {"log_id": None, "seq": None}
+
+
+@pytest.mark.asyncio
+async def test_sync_remote_sends_deltas_after_first_snapshot():
+    engine = UnifiedAI()
+    engine.optical.transfer_data = AsyncMock(return_value=True)
+    replica = UnifiedAI()
+    replicator = SystemReplicator(engine, token="t")
+    receiver = SystemReplicator(replica)
+
+    async def deliver():
+        payload = json.loads(engine.optical.transfer_data.await_args.args[0])
+        ack = await receiver.apply_sync(payload["data"])
+        replicator.acknowledge("replica", ack["log_id"], ack["seq"])
+        return payload["data"]
+
+    for i in range(3):
+        await engine.brain.store_memory(f"k{i}", f"v{i}")
+    assert await replicator.sync_remote("replica")
+    assert (await deliver())["type"] == "snapshot"
+
+    await engine.brain.store_memory("k3", "v3")
+    await engine.brain.retrieve_memory("k0")
+    await engine.brain.retrieve_memory("k0")
+    engine.brain._remove("k1")
+    assert await replicator.sync_remote("replica")
+    delta = await deliver()
+    assert delta["type"] == "delta"
+    assert {c["key"]: c["op"] for c in delta["changes"]} == {"k3": "put", "k0": "access", "k1": "delete"}
+    assert await replica.brain.export_memories() == await engine.brain.export_memories()
+
+
+@pytest.mark.asyncio
+async def test_sync_remote_falls_back_to_snapshot_when_log_truncated():
+    engine = UnifiedAI()
+    engine.brain = BrainEngine(change_log_size=2)
+    engine.optical.transfer_data = AsyncMock(return_value=True)
+    replicator = SystemReplicator(engine)
+
+    await replicator.sync_remote("replica")
+    for i in range(3):
+        await engine.brain.store_memory(f"k{i}", f"v{i}")
+    await replicator.sync_remote("replica")
+    payload = json.loads(engine.optical.transfer_data.await_args.args[0])
+    assert payload["data"]["type"] == "snapshot"
+    assert len(payload["data"]["memories"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_remote_resends_until_acknowledged():
+    engine = UnifiedAI()
+    engine.optical.transfer_data = AsyncMock(return_value=True)
+    replica = UnifiedAI()
     replicator = SystemReplicator(engine, token="t")
-    res = await replicator.duplicate_remote("channel")
-    engine.optical.transfer_data.assert_awaited()
-    assert res is True
+    receiver = SystemReplicator(replica)
+
+    def sent():
+        return json.loads(engine.optical.transfer_data.await_args.args[0])["data"]
+
+    await replicator.sync_remote("replica")
+    ack = await receiver.apply_sync(sent())
+    replicator.acknowledge("replica", ack["log_id"], ack["seq"])
+
+    await engine.brain.store_memory("k0", "v0")
+    await replicator.sync_remote("replica")
+    lost = sent()
+    await engine.brain.store_memory("k1", "v1")
+    await replicator.sync_remote("replica")
+    # The first delta never arrived, so the second one still starts from the ack.
+    assert sent()["since"] == lost["since"]
+    ack = await receiver.apply_sync(sent())
+    replicator.acknowledge("replica", ack["log_id"], ack["seq"])
+    assert await replica.brain.export_memories() == await engine.brain.export_memories()
+
+    # A late ack for the older delta does not move the position back.
+    replicator.acknowledge("replica", lost["log_id"], lost["seq"])
+    assert replicator._acked["replica"] == (ack["log_id"], ack["seq"])
+
+
+@pytest.mark.asyncio
+async def test_replica_refuses_delta_with_a_gap():
+    engine = UnifiedAI()
+    engine.optical.transfer_data = AsyncMock(return_value=True)
+    replicator = SystemReplicator(engine, token="t")
+    receiver = SystemReplicator(UnifiedAI())
+
+    def sent():
+        return json.loads(engine.optical.transfer_data.await_args.args[0])["data"]
+
+    await replicator.sync_remote("replica")
+    ack = await receiver.apply_sync(sent())
+    replicator.acknowledge("replica", ack["log_id"], ack["seq"])
+    await engine.brain.store_memory("k0", "v0")
+    await replicator.sync_remote("replica")
+    delta = sent()
+    delta["since"] += 1
+
+    ack = await receiver.apply_sync(delta)
+    assert ack == {"log_id": None, "seq": None}
+    assert await receiver.engine.brain.memory_count() == 0
+    replicator.acknowledge("replica", ack["log_id"], ack["seq"])
+    await replicator.sync_remote("replica")
+    assert sent()["type"] == "snapshot"
+
+
+def _legacy_secure(token, key, data):
+    encoded = json.dumps({"token": token, "data": data}).encode()
+    return base64.b64encode(bytes(b ^ key[i % len(key)] for i, b in enumerate(encoded))).decode()
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_secure_roundtrip_and_legacy_format(binary):
+    engine = UnifiedAI()
+    engine.optical.codec.binary = binary
+    replicator = SystemReplicator(engine, token="t", encryption_key="s3cret")
+    data = {"memories": [{"key": f"k{i}", "content": "x" * i} for i in range(300)]}
+
+    sealed = replicator._secure(data)
+    assert isinstance(sealed, bytes) is binary
+    assert len(sealed) < len(json.dumps(data))
+    assert replicator._unsecure(sealed) == data
+    assert replicator._unsecure(_legacy_secure("t", b"s3cret", data)) == data
+    with pytest.raises(ValueError):
+        SystemReplicator(engine, token="other", encryption_key="s3cret")._unsecure(sealed)
+
+
+def test_bulk_xor_matches_bytewise_across_chunks():
+    from unified_ai.replicator import _CHUNK, _xor
+
+    key = b"abcdefg"
+    data = bytes(range(256)) * (_CHUNK // 256 + 3)
+    expected = bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
+    assert _xor(data, key) == expected
+
+
+@pytest.mark.asyncio
+async def test_duplicate_local_shared_reads_parent_segment():
+    engine = UnifiedAI()
+    engine.optical.transfer_data = AsyncMock()
+    for i in range(3):
+        await engine.brain.store_memory(f"k{i}", f"v{i}")
+
+    duplicate = await SystemReplicator(engine).duplicate_local(shared=True)
+    assert duplicate.brain.base.name == engine.brain.freeze().name
+    assert await duplicate.brain.retrieve_memory("k1") == "v1"
+    await duplicate.brain.store_memory("k1", "mine")
+    assert await engine.brain.retrieve_memory("k1") == "v1"
+    await duplicate.close()
+    await engine.close()
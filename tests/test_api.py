@@ -1,3 +1,4 @@
+import json
 import sys
 from pathlib import Path
 from contextlib import asynccontextmanager
@@ -32,7 +33,94 @@ async def test_api_endpoints(monkeypatch):
         assert resp.json() == {"response": "reply"}
 
         health = client.get("/health").json()
-        assert health == {"redis": True, "features": ["net"]}
+        assert health == {"redis": True, "features": ["net"], "ready": True}
 
         metrics = client.get("/metrics").json()
-        assert metrics == {"memory_count": 5, "network_features": ["net"]}
+        assert metrics == {
+            "memory_count": 5,
+            "memory_footprint_bytes": 0,
+            "memory_evictions": 0,
+            "network_features": ["net"],
+        }
+
+
+@pytest.mark.asyncio
+async def test_memories_export_streams_ndjson(monkeypatch):
+    engine = UnifiedAI()
+    for i in range(5):
+        await engine.brain.store_memory(f"k{i}", f"v{i}")
+
+    @asynccontextmanager
+    async def fake_engine_lifespan(app=None, engine_param=None):
+        yield engine
+
+    monkeypatch.setattr(api, "engine_lifespan", fake_engine_lifespan)
+
+    with TestClient(api.app) as client:
+        resp = client.get("/memories/export")
+        assert resp.status_code == 200
+        assert resp.media_type == "application/x-ndjson"
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [m["key"] for m in lines] == [f"k{i}" for i in range(5)]
+    assert lines[0]["content"] == "v0"
+
+
+def test_storage_flag_requires_a_single_worker(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["unified_ai", "--storage", "data/brain.db"])
+    assert api._parse_args().storage == "data/brain.db"
+    monkeypatch.setattr(sys, "argv", ["unified_ai", "--storage", "data/brain.db", "--workers", "2"])
+    with pytest.raises(SystemExit):
+        api._parse_args()
+
+
+def test_max_bytes_flag_and_env(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["unified_ai", "--max-bytes", "1000000", "--eviction", "lfu"])
+    args = api._parse_args()
+    assert (args.max_bytes, args.eviction) == (1_000_000, "lfu")
+    monkeypatch.setattr(api, "MAX_BYTES", "2048")
+    monkeypatch.setattr(sys, "argv", ["unified_ai"])
+    assert api._parse_args().max_bytes == 2048
+    monkeypatch.setattr(sys, "argv", ["unified_ai", "--eviction", "random"])
+    with pytest.raises(SystemExit):
+        api._parse_args()
+
+
+def test_ttl_flags_and_env(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["unified_ai", "--ttl", "3600", "--expiry-interval", "5"])
+    args = api._parse_args()
+    assert (args.ttl, args.expiry_interval) == (3600, 5)
+    monkeypatch.setattr(api, "TTL", "60")
+    monkeypatch.setattr(sys, "argv", ["unified_ai"])
+    assert api._parse_args().ttl == 60
+    engine = UnifiedAI(ttl=60, expiry_interval=5)
+    assert (engine.brain.ttl, engine.brain.expiry_interval) == (60, 5)
+
+
+def test_dedup_threshold_flag_and_env(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["unified_ai", "--dedup-threshold", "0.95"])
+    assert api._parse_args().dedup_threshold == 0.95
+    monkeypatch.setattr(sys, "argv", ["unified_ai", "--dedup-threshold", "0.5"])
+    with pytest.raises(SystemExit):
+        api._parse_args()
+    monkeypatch.setattr(api, "DEDUP_THRESHOLD", "0.9")
+    monkeypatch.setattr(sys, "argv", ["unified_ai"])
+    assert api._parse_args().dedup_threshold == 0.9
+    assert UnifiedAI(dedup_threshold=0.95).brain._fingerprints is not None
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_the_byte_budget(monkeypatch):
+    engine = UnifiedAI(max_bytes=2000, eviction="lfu")
+
+    @asynccontextmanager
+    async def fake_engine_lifespan(app=None, engine_param=None):
+        yield engine
+
+    monkeypatch.setattr(api, "engine_lifespan", fake_engine_lifespan)
+    for i in range(20):
+        await engine.brain.store_memory(f"k{i}", f"memory number {i}")
+
+    with TestClient(api.app) as client:
+        metrics = client.get("/metrics").json()
+    assert 0 < metrics["memory_footprint_bytes"] <= 2000
+    assert metrics["memory_evictions"] == 20 - metrics["memory_count"] > 0
@@ -0,0 +1,56 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from brain_engine import BrainEngine as SyncBrainEngine
+from unified_ai.brain import ENTRY_OVERHEAD, BrainEngine
+
+
+@pytest.mark.asyncio
+async def test_store_many_accepts_async_iterables_and_enforces_budget():
+    async def records():
+        for i in range(25):
+            yield f"k{i}", f"memory {i}"
+
+    brain = BrainEngine(max_bytes=10 * (ENTRY_OVERHEAD + 120))
+    assert await brain.store_many(records(), batch_size=10) == 25
+    assert brain.footprint_bytes <= brain.max_bytes
+    assert await brain.retrieve_memory("k24") == "memory 24"
+    assert (await brain.search("memory 24", 1))[0]["key"] == "k24"
+
+
+@pytest.mark.asyncio
+async def test_import_memories_round_trips_export():
+    source = BrainEngine()
+    await source.store_many([("a", "first"), ("b", "second")])
+    await source.retrieve_memory("b")
+    replica = BrainEngine()
+    assert await replica.import_memories(await source.export_memories()) == 2
+    assert await replica.export_memories() == await source.export_memories()
+
+
+def test_sync_engine_store_many_trims_oldest_once():
+    engine = SyncBrainEngine(memory_limit=3)
+    records = [(f"k{i}", {"content": i, "access_count": 0}) for i in range(5)]
+    assert engine.store_many(records) == 5
+    assert list(engine.memories) == ["k2", "k3", "k4"]
+    engine.import_memories([{"key": "k9", "content": 9, "access_count": 2}])
+    assert engine.retrieve_memory("k9") == 9
+    assert engine.memories["k9"]["access_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_engine_loads_async_streams_in_batches():
+    engine = SyncBrainEngine(memory_limit=4)
+    held = []
+
+    async def exported():
+        for i in range(10):
+            held.append(len(engine.memories))
+            yield {"key": f"k{i}", "content": i, "access_count": i}
+
+    assert await engine.import_memories_async(exported(), batch_size=3) == 10
+    # Trimmed every third record rather than only at the end.
+    assert max(held) <= 4 + 3
+    assert list(engine.memories) == ["k6", "k7", "k8", "k9"]
+    assert engine.memories["k9"]["access_count"] == 9
@@ -0,0 +1,39 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai import UnifiedAI
+from unified_ai.codec import HEADER, FLAG_ZLIB, CodecError, FrameCodec, ReprCodec
+
+
+def test_frame_roundtrip_and_compression():
+    codec = FrameCodec(compress_threshold=64)
+    snapshot = {"memories": [{"key": f"k{i}", "content": "hello " * 5} for i in range(50)]}
+    for value in ("short text", b"\x00\x01raw", snapshot, [1, 2, 3]):
+        assert codec.decode(codec.encode(value)) == value
+
+    frame = codec.encode(snapshot)
+    assert HEADER.unpack_from(frame)[2] & FLAG_ZLIB
+    assert len(frame) < len(str(snapshot))
+    assert codec.decode(memoryview(bytearray(frame))) == snapshot
+
+
+def test_frames_are_length_prefixed_and_legacy_passes_through():
+    codec = FrameCodec()
+    stream = codec.encode("a") + codec.encode({"b": 1}) + codec.encode(b"c")
+    assert list(codec.iter_decode(stream)) == ["a", {"b": 1}, b"c"]
+    assert codec.decode("{'legacy': True}") == "{'legacy': True}"
+    assert codec.decode(b"plain text") == "plain text"
+    with pytest.raises(CodecError):
+        codec.decode(codec.encode("truncated")[:-2])
+    assert ReprCodec().encode({"a": 1}) == "{'a': 1}"
+
+
+@pytest.mark.asyncio
+async def test_engine_publishes_frames():
+    codec = FrameCodec()
+    engine = UnifiedAI(codec=codec)
+    await engine.interact("hello")
+    channel, payload = engine.optical.redis._published[0]
+    assert channel == "UnifiedAI"
+    assert codec.decode(payload) == "Reasoned: hello"
@@ -0,0 +1,116 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai.brain import BrainEngine
+from unified_ai.dedup import SimHashIndex, simhash
+
+
+def test_simhash_ignores_case_punctuation_and_filler():
+    assert simhash("Tell me about the weather in Paris") == simhash("tell me, um, about weather in paris!!")
+    assert simhash("tell me about the weather in paris") != simhash("order a pizza with extra cheese")
+
+
+def test_index_finds_within_distance_and_forgets_removed_keys():
+    index = SimHashIndex(max_distance=3)
+    index.add("a", 0b1011 << 40)
+    assert index.find((0b1011 << 40) ^ 0b111) == "a"
+    assert index.find((0b1011 << 40) ^ 0b1111) is None
+    index.remove("a")
+    assert index.find(0b1011 << 40) is None
+    with pytest.raises(ValueError):
+        SimHashIndex.for_similarity(0)
+    with pytest.raises(ValueError):
+        SimHashIndex.for_similarity(0.8)
+
+
+def test_index_probes_neighbouring_buckets():
+    index = SimHashIndex(max_distance=7)
+    index.add("a", 0)
+    # Seven bits spread over all four 16-bit bands: two bands differ in one bit.
+    near = (0b11 << 0) | (0b11 << 16) | (1 << 32) | (1 << 48) | (1 << 60)
+    assert index.find(near) == "a"
+    assert index.find(near | 1 << 5) is None
+
+
+@pytest.mark.asyncio
+async def test_filler_only_inputs_are_not_folded():
+    assert simhash("um, really?") is None
+    brain = BrainEngine(dedup_threshold=0.95)
+    for text in ("um", "please", "really?"):
+        await brain.store_memory(text, text)
+    assert await brain.memory_count() == 3
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_fold_into_existing_memory():
+    brain = BrainEngine(dedup_threshold=0.95)
+    await brain.reason("What is the weather in Paris?")
+    variant = "so um basically what is the weather in paris"
+    assert await brain.reason(variant) == f"Reasoned: {variant}"
+    assert await brain.memory_count() == 1
+    assert await brain.reason(variant) == "I recall you said: What is the weather in Paris?"
+    exported = await brain.export_memories()
+    assert exported[0]["access_count"] == 2
+    assert "unified_ai_brain_dedup_folds_total 1.0" in brain.metrics.render()
+
+    brain._remove(exported[0]["key"])
+    assert await brain.retrieve_memory(variant) is None
+
+
+@pytest.mark.asyncio
+async def test_dedup_is_opt_in():
+    brain = BrainEngine()
+    await brain.store_memory("a", "hello there")
+    await brain.store_memory("b", "Hello, there!")
+    assert await brain.memory_count() == 2
+
+
+@pytest.mark.asyncio
+async def test_aliases_survive_restart_and_compaction(tmp_path):
+    from unified_ai.storage import AppendOnlyStorage
+
+    path = str(tmp_path / "brain.db")
+    brain = BrainEngine(storage=AppendOnlyStorage(path), dedup_threshold=0.95)
+    await brain.initialize()
+    await brain.store_memory("a", "what is the weather in paris")
+    await brain.store_memory("b", "so um what is the weather in paris")
+    await brain.storage.compact()
+    await brain.store_memory("c", "um what is the weather in paris please")
+    await brain.store_memory("d", "order a pizza with extra cheese")
+    await brain.store_memory("e", "please order a pizza with extra cheese")
+    await brain.store_memory("e", "tomatoes grow well in the garden")
+    await brain.close()
+
+    reopened = BrainEngine(storage=AppendOnlyStorage(path), dedup_threshold=0.95)
+    await reopened.initialize()
+    assert reopened.aliases() == {"b": "a", "c": "a"}
+    assert await reopened.retrieve_memory("c") == "what is the weather in paris"
+    reopened._remove("a")
+    await reopened.close()
+
+    again = BrainEngine(storage=AppendOnlyStorage(path))
+    await again.initialize()
+    assert again.aliases() == {} and await again.retrieve_memory("b") is None
+    await again.close()
+
+
+@pytest.mark.asyncio
+async def test_aliases_replicate_through_the_change_log():
+    primary = BrainEngine(dedup_threshold=0.95)
+    replica = BrainEngine()
+    await primary.store_memory("a", "what is the weather in paris")
+    await primary.store_memory("b", "so um what is the weather in paris")
+    await replica.apply_changes(primary.changes_since(0))
+    assert await replica.retrieve_memory("b") == "what is the weather in paris"
+
+    mark = primary.sequence
+    await primary.store_memory("b", "order a pizza with extra cheese")
+    await replica.apply_changes(primary.changes_since(mark))
+    assert replica.aliases() == {}
+    assert await replica.retrieve_memory("b") == "order a pizza with extra cheese"
+
+    # A full snapshot drops aliases the primary no longer has.
+    replica._alias("stale", "a")
+    await replica.apply_changes(await primary.export_memories(), replace=True)
+    assert replica.aliases() == {}
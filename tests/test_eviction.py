@@ -0,0 +1,65 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai.brain import ENTRY_OVERHEAD, BrainEngine
+from unified_ai.eviction import HybridPolicy, LFUPolicy, LRUPolicy
+
+
+def test_policies_pick_expected_victims():
+    lru = LRUPolicy()
+    for key in "abc":
+        lru.insert(key)
+    lru.access("a", 1)
+    assert lru.victim() == "b"
+
+    lfu = LFUPolicy()
+    for key in "abc":
+        lfu.insert(key)
+    lfu.access("a", 1)
+    lfu.access("b", 1)
+    lfu.access("b", 2)
+    assert lfu.victim() == "c"
+    lfu.remove("c")
+    assert lfu.victim() == "a"
+
+    # Counts restored by replication or imports can jump past other buckets.
+    lfu = LFUPolicy()
+    lfu.insert("a", 0)
+    lfu.insert("b", 5)
+    lfu.access("a", 100)
+    assert lfu.victim() == "b"
+    lfu.access("b", 200)
+    lfu.insert("c", 150)
+    assert lfu.victim() == "a"
+
+    hybrid = HybridPolicy(promote_after=2)
+    for key in "abc":
+        hybrid.insert(key)
+    hybrid.access("a", 1)
+    hybrid.access("a", 2)  # promoted to the protected segment
+    hybrid.access("b", 1)
+    assert hybrid.victim() == "c"
+    hybrid.remove("c")
+    hybrid.remove("b")
+    assert hybrid.victim() == "a"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", ["lru", "lfu", "hybrid"])
+async def test_brain_stays_within_byte_budget(policy):
+    budget = 10 * (ENTRY_OVERHEAD + 120)
+    brain = BrainEngine(max_bytes=budget, eviction=policy)
+    await brain.store_memory("hot", "keep me around")
+    for i in range(50):
+        await brain.retrieve_memory("hot")
+        await brain.store_memory(f"cold {i}", "x" * 20)
+        assert brain.footprint_bytes <= budget
+
+    assert await brain.retrieve_memory("cold 49") is not None
+    if policy != "lru":
+        assert await brain.retrieve_memory("hot") == "keep me around"
+    evicted = 51 - await brain.memory_count()
+    assert evicted > 0
+    assert f"unified_ai_brain_evictions_total {float(evicted)}" in brain.metrics.render()
+    assert "unified_ai_brain_footprint_bytes" in brain.metrics.render()
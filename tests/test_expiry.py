@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from brain_engine import BrainEngine as SyncBrainEngine
+from unified_ai.brain import BrainEngine
+
+
+@pytest.mark.asyncio
+async def test_expire_removes_due_memories_and_reports_bytes():
+    brain = BrainEngine(ttl=60)
+    await brain.store_memory("old", "expiring conversation")
+    await brain.store_memory("short", "gone soon", ttl=0.01)
+    await brain.store_memory("kept", "stays", ttl=3600)
+    await brain.store_memory("old", "rewritten later")  # new deadline supersedes the first
+
+    removed, reclaimed = brain.expire(now=time.time() + 120)
+    assert removed == 2 and reclaimed > 0
+    assert await brain.memory_count() == 1
+    assert await brain.search("conversation") == [] and await brain.search("rewritten") == []
+    assert brain.footprint_bytes > 0
+    assert "unified_ai_brain_expired_total 2.0" in brain.metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_expired_memories_are_not_recalled_before_collection():
+    brain = BrainEngine(expiry_interval=0)
+    await brain.store_memory("k", "v", ttl=0)
+    assert await brain.retrieve_memory("k") is None
+    assert await brain.memory_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_background_task_expires_in_slices():
+    brain = BrainEngine(ttl=0.01, expiry_interval=0.02, expiry_slice=3)
+    await brain.initialize()
+    await brain.store_many((f"k{i}", "x") for i in range(10))
+    await asyncio.sleep(0.1)
+    assert await brain.memory_count() == 0
+    await brain.close()
+
+
+def test_sync_engine_ttl():
+    engine = SyncBrainEngine(default_ttl=3600)
+    engine.store_memory("a", {"content": "x", "access_count": 0}, ttl=0)
+    engine.store_memory("b", {"content": "y", "access_count": 0})
+    assert engine.retrieve_memory("a") is None
+    assert engine.retrieve_contextual_memories("y") == [engine.memories["b"]]
+    assert engine.expire_memories() == 0
+    assert engine.expiry_stats["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_engine_reads_expire_only_their_key_and_initialize_sweeps():
+    engine = SyncBrainEngine(expiry_interval=0.02)
+    for key in ("a", "b", "c"):
+        engine.store_memory(key, {"content": key, "access_count": 0}, ttl=0)
+    assert engine.retrieve_memory("a") is None
+    assert set(engine.memories) == {"b", "c"} and engine.expiry_stats["expired"] == 1
+
+    await engine.initialize()
+    await asyncio.sleep(0.1)
+    assert engine.memories == {} and engine.expiry_stats["expired"] == 3
+    await engine.close()
+    assert engine._expiry_task is None
+
+
+@pytest.mark.asyncio
+async def test_per_memory_ttl_survives_restart(tmp_path):
+    from unified_ai.storage import AppendOnlyStorage
+
+    path = str(tmp_path / "brain.db")
+    brain = BrainEngine(storage=AppendOnlyStorage(path), expiry_interval=0)
+    await brain.initialize()
+    await brain.store_memory("short", "fleeting", ttl=0.05)
+    await brain.store_memory("kept", "lasting")
+    await brain.storage.compact()
+    await brain.store_memory("later", "also fleeting", ttl=0.05)
+    await brain.close()
+
+    await asyncio.sleep(0.1)
+    reopened = BrainEngine(storage=AppendOnlyStorage(path), expiry_interval=0)
+    await reopened.initialize()
+    assert await reopened.retrieve_memory("short") is None
+    assert await reopened.retrieve_memory("later") is None
+    assert await reopened.retrieve_memory("kept") == "lasting"
+    await reopened.close()
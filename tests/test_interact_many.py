@@ -0,0 +1,74 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai import UnifiedAI
+
+
+INPUTS = ["hello there", "I love productivity tips", "hello there", "this is bad"]
+
+
+@pytest.mark.asyncio
+async def test_interact_many_matches_sequential():
+    sequential = UnifiedAI()
+    expected = [await sequential.interact(text) for text in INPUTS]
+
+    batched = UnifiedAI()
+    assert await batched.interact_many(INPUTS) == expected
+    assert sorted(batched.optical.redis._published) == sorted(sequential.optical.redis._published)
+
+
+@pytest.mark.asyncio
+async def test_interact_many_rejects_inappropriate_input():
+    engine = UnifiedAI()
+    with pytest.raises(ValueError):
+        await engine.interact_many(["hi", "do harm"])
+    assert engine.optical.redis._published == []
+
+    results = await engine.interact_many(["hi", "do harm"], return_exceptions=True)
+    assert results[0] == await UnifiedAI().interact("hi")
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_interact_many_counts_outcomes_and_stage_times():
+    engine = UnifiedAI()
+    await engine.interact_many(INPUTS + ["do harm"], return_exceptions=True)
+
+    text = engine.metrics.render()
+    assert 'unified_ai_interactions_total{outcome="ok"} 4.0' in text
+    assert 'unified_ai_interactions_total{outcome="rejected"} 1.0' in text
+    assert 'unified_ai_stage_seconds_count{engine="aura",stage="validate_input"} 5.0' in text
+    assert 'unified_ai_stage_seconds_count{engine="brain",stage="reason"} 4.0' in text
+    assert 'unified_ai_stage_seconds_count{engine="speech",stage="transmit_speech"} 4.0' in text
+
+
+@pytest.mark.asyncio
+async def test_interact_many_writes_new_memories_in_bulk(monkeypatch):
+    engine = UnifiedAI()
+    calls = []
+    store_many = engine.brain.store_many
+
+    async def spy(records, *args, **kwargs):
+        calls.append(records)
+        return await store_many(records, *args, **kwargs)
+
+    monkeypatch.setattr(engine.brain, "store_many", spy)
+    monkeypatch.setattr(engine.brain, "store_memory", None)
+    replies = await engine.interact_many(["first note", "second note", "first note"])
+    assert len(calls) == 1
+    assert await engine.brain.memory_count() == 2
+    assert "first note" in replies[2] and "recall" in replies[2]
+
+
+@pytest.mark.asyncio
+async def test_interact_many_shares_coalesced_queries():
+    engine = UnifiedAI(coalesce_window=1.0)
+    single = await engine.interact("hello there")
+    replies = await engine.interact_many(["hello there", "something new", "something new"])
+    assert replies[0] == single
+    assert replies[1] == replies[2]
+    assert await engine.brain.memory_count() == 2
+    assert engine.singleflight.hit_rate() == pytest.approx(2 / 4)
+    # The batch's results are shared with later single queries too.
+    assert await engine.interact("something new") == replies[1]
@@ -10,9 +10,19 @@ from unittest.mock import AsyncMock
 async def test_lifespan_calls_close():
     engine = UnifiedAI()
     engine.connect = AsyncMock()
-    engine.close = AsyncMock()
+    engine.close = AsyncMock(side_effect=engine.close)
 
     async with lifespan(engine=engine):
         engine.connect.assert_awaited_once()
 
     engine.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_background_tasks():
+    engine = UnifiedAI()
+    async with lifespan(engine=engine):
+        tasks = list(engine.bg_tasks)
+        assert tasks and not any(task.done() for task in tasks)
+    assert all(task.done() for task in tasks)
+    assert engine.bg_tasks == []
@@ -0,0 +1,49 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from fastapi.testclient import TestClient
+
+import unified_ai.__main__ as api  # noqa: E402
+from unified_ai import UnifiedAI
+from unified_ai.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("latency_seconds", "Latency", {"stage": "x"}, buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        hist.observe(value)
+    registry.counter("errors_total", "Errors").inc(2)
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{stage="x",le="0.1"} 1.0' in text
+    assert 'latency_seconds_bucket{stage="x",le="1.0"} 3.0' in text
+    assert 'latency_seconds_bucket{stage="x",le="+Inf"} 4.0' in text
+    assert 'latency_seconds_count{stage="x"} 4.0' in text
+    assert "# TYPE errors_total counter" in text
+    assert "errors_total 2.0" in text
+    assert hist.quantile(0.5) == 1.0
+
+
+@pytest.mark.asyncio
+async def test_interact_records_engine_latencies():
+    engine = UnifiedAI()
+    await engine.interact("hello")
+    with pytest.raises(ValueError):
+        await engine.interact("harm")
+
+    text = engine.metrics.render()
+    assert 'unified_ai_stage_seconds_count{engine="brain",stage="reason"} 1.0' in text
+    assert 'unified_ai_stage_seconds_count{engine="speech",stage="transmit_speech"} 1.0' in text
+    assert "unified_ai_redis_publishes_total 2.0" in text
+    assert 'unified_ai_interactions_total{outcome="rejected"} 1.0' in text
+
+
+def test_prometheus_endpoint():
+    with TestClient(api.app) as client:
+        client.post("/query", json={"query": "hi"})
+        resp = client.get("/metrics/prometheus")
+    assert resp.status_code == 200
+    assert resp.media_type.startswith("text/plain")
+    assert 'unified_ai_interactions_total{outcome="ok"}' in resp.text
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai import UnifiedAI
+from unified_ai import _redis_stub
+from unified_ai.metrics import MetricsRegistry
+from unified_ai.publish_buffer import PublishBuffer
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_by_size_and_interval():
+    client = _redis_stub.Redis()
+    buffer = PublishBuffer(client, max_batch=3, flush_interval=0.01)
+    for i in range(3):
+        await buffer.put("chan", i)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert client._published == [("chan", 0), ("chan", 1), ("chan", 2)]
+
+    await buffer.put("chan", 3)
+    assert len(client._published) == 3
+    await asyncio.sleep(0.03)
+    assert client._published[-1] == ("chan", 3)
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_buffer_drops_when_full_and_flushes_on_close():
+    client = _redis_stub.Redis()
+    metrics = MetricsRegistry()
+    buffer = PublishBuffer(client, max_batch=10, flush_interval=1.0, max_queue=2, block=False, metrics=metrics)
+    results = [await buffer.put("chan", i) for i in range(4)]
+    assert results == [True, True, False, False]
+    assert "unified_ai_publish_buffer_dropped_total 2.0" in metrics.render()
+
+    await buffer.close()
+    assert client._published == [("chan", 0), ("chan", 1)]
+
+
+@pytest.mark.asyncio
+async def test_engine_close_flushes_write_behind_publishes():
+    engine = UnifiedAI(write_behind=True)
+    engine.optical.buffer.flush_interval = 10.0
+    reply = await engine.interact("hello")
+    assert reply == await UnifiedAI().interact("hello")
+    await engine.close()
+    assert [channel for channel, _ in engine.optical.redis._published] == ["UnifiedAI", "SpeechOutput"]
@@ -0,0 +1,62 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai.brain import ENTRY_OVERHEAD, BrainEngine
+from unified_ai.search import BM25Index
+
+
+def test_bm25_ranks_and_updates_incrementally():
+    index = BM25Index()
+    index.add("a", "the cat sat on the mat")
+    index.add("b", "the dog chased the cat")
+    index.add("c", "a bird sang")
+    assert [key for key, _ in index.search("cat mat", 3)] == ["a", "b"]
+
+    index.add("a", "a bird flew away")
+    assert [key for key, _ in index.search("cat mat", 3)] == ["b"]
+    index.remove("b")
+    assert index.search("cat", 3) == []
+    assert index.search("bird", 1)[0][0] in {"a", "c"}
+
+
+def test_pruned_search_matches_exhaustive_ranking():
+    index = BM25Index()
+    for i in range(200):
+        words = ["common"] * (1 + i % 3) + [f"rare{i % 7}", f"mid{i % 2}"]
+        index.add(str(i), " ".join(words))
+    exhaustive = index.search("common rare3 mid1", 200)
+    assert index.search("common rare3 mid1", 5) == exhaustive[:5]
+
+
+@pytest.mark.asyncio
+async def test_reason_recalls_paraphrases():
+    brain = BrainEngine()
+    text = "I am practising the guitar every evening"
+    assert await brain.reason(text) == f"Reasoned: {text.lower()}"
+    assert await brain.reason("i am practising guitar every evening!") == f"I recall you said: {text}"
+    assert (await brain.reason("guitar practice")).startswith("Reasoned:")
+
+    results = await brain.search("evening guitar", 2)
+    assert results[0]["content"] == text
+
+
+@pytest.mark.asyncio
+async def test_evicted_memories_leave_the_index():
+    brain = BrainEngine(max_bytes=ENTRY_OVERHEAD + 200)
+    await brain.store_memory("first", "remember the alamo")
+    await brain.store_memory("second", "something else entirely")
+    assert await brain.search("alamo") == []
+
+
+@pytest.mark.asyncio
+async def test_expired_memories_are_skipped_before_collection():
+    brain = BrainEngine(expiry_interval=3600)
+    await brain.store_memory("live", "I am practising the guitar every day")
+    for i in range(3):
+        await brain.store_memory(f"gone{i}", "I am practising the guitar every evening", ttl=0)
+
+    assert [hit["key"] for hit in await brain.search("guitar evening", 2)] == ["live"]
+    # The expired exact matches rank first but must not block the live one.
+    reply = await brain.reason("I am practising the guitar every evening")
+    assert reply == "I recall you said: I am practising the guitar every day"
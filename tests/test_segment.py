@@ -0,0 +1,117 @@
+import subprocess
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai.brain import BrainEngine
+from unified_ai.segment import FrozenSegment
+
+
+def test_segment_lookup_and_attach():
+    rows = [(f"k{i}", f"content {i} é", float(i), i % 3) for i in range(100)]
+    segment = FrozenSegment.build(rows)
+    try:
+        assert len(segment) == 100
+        assert segment.get("k42") == ("content 42 é", 42.0, 0)
+        assert segment.get("missing") is None
+        assert list(segment.rows()) == rows
+        other = FrozenSegment.attach(segment.name)
+        assert other.get("k7") == ("content 7 é", 7.0, 1)
+        other.close()
+    finally:
+        segment.release()
+        segment.close()
+
+
+def test_segment_outlives_processes_that_attach_it():
+    segment = FrozenSegment.build([("k1", "shared", 1.0, 0)])
+    code = (
+        f"import sys; sys.path.append({str(Path(__file__).resolve().parents[1])!r}); "
+        "from unified_ai.segment import FrozenSegment; "
+        f"s = FrozenSegment.attach({segment.name!r}); print(s.get('k1')[0]); s.close()"
+    )
+    try:
+        for _ in range(2):
+            child = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+            assert child.stdout.strip() == "shared"
+        other = FrozenSegment.attach(segment.name)
+        assert other.get("k1") == ("shared", 1.0, 0)
+        other.close()
+    finally:
+        segment.release()
+        segment.close()
+    segment.release()
+
+
+@pytest.mark.asyncio
+async def test_replica_overlay_leaves_parent_and_base_untouched():
+    parent = BrainEngine()
+    for i in range(10):
+        await parent.store_memory(f"k{i}", f"memory number {i}")
+    segment = parent.freeze()
+    assert parent.freeze() is segment
+
+    replica = BrainEngine()
+    replica.attach_base(FrozenSegment.attach(segment.name))
+    assert await replica.memory_count() == 10
+    assert await replica.retrieve_memory("k1") == "memory number 1"
+    await replica.store_memory("k2", "changed")
+    await replica.store_memory("new", "only in the replica")
+    replica._remove("k3")
+
+    assert await replica.memory_count() == 10
+    assert await replica.retrieve_memory("k2") == "changed"
+    assert await replica.retrieve_memory("k3") is None
+    assert (await replica.search("number 5", 1))[0]["key"] == "k5"
+    assert [m["key"] for m in await replica.search("changed")] == ["k2"]
+    exported = {m["key"]: m for m in await replica.export_memories()}
+    assert exported["k1"]["access_count"] == 1 and "k3" not in exported
+
+    assert await parent.retrieve_memory("k2") == "memory number 2"
+    assert segment.get("k1")[2] == 0
+    assert await parent.memory_count() == 10
+    await replica.close()
+    assert await parent.retrieve_memory("k1") == "memory number 1"
+    await parent.close()
+
+
+@pytest.mark.asyncio
+async def test_replica_searches_the_base_in_place():
+    parent = BrainEngine()
+    texts = ["I practise the guitar every evening", "tomatoes grow well in the garden", "the guitar needs new strings"]
+    for i, text in enumerate(texts * 5):
+        await parent.store_memory(f"k{i}", f"{text} {i}")
+    replica = BrainEngine()
+    replica.attach_base(FrozenSegment.attach(parent.freeze().name))
+
+    async def same_results(query, k):
+        ours, theirs = await replica.search(query, k), await parent.search(query, k)
+        assert [(m["key"], m["content"]) for m in ours] == [(m["key"], m["content"]) for m in theirs]
+        assert [m["score"] for m in ours] == pytest.approx([m["score"] for m in theirs])
+
+    for query in ("guitar", "garden tomatoes", "new strings evening"):
+        await same_results(query, 4)
+    assert len(replica._index) == 0
+    assert "recall" in await replica.reason("I practise the guitar every evening 0")
+
+    # Overlay writes and removals shadow the base in searches.
+    await replica.store_memory("k1", "gardening with tomatoes indoors")
+    replica._remove("k4")
+    await parent.store_memory("k1", "gardening with tomatoes indoors")
+    parent._remove("k4")
+    await same_results("tomatoes garden", 5)
+    await replica.close()
+    await parent.close()
+
+
+@pytest.mark.asyncio
+async def test_freeze_is_reused_across_retrievals():
+    brain = BrainEngine()
+    await brain.store_memory("k", "v")
+    segment = brain.freeze()
+    await brain.retrieve_memory("k")
+    assert brain.freeze() is segment
+    await brain.store_memory("k", "changed")
+    assert brain.freeze() is not segment
+    await brain.close()
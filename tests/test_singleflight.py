@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai import UnifiedAI
+from unified_ai.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight(window=0.05)
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("same", work) for _ in range(5)))
+    assert results == [1] * 5
+    assert await flight.do("same", work) == 1  # still inside the window
+    assert await flight.do("other", work) == 2
+    await asyncio.sleep(0.06)
+    assert await flight.do("same", work) == 3
+    assert flight.hit_rate() == pytest.approx(5 / 8)
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_cached():
+    flight = SingleFlight(window=1.0)
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(flight.do("k", flaky), flight.do("k", flaky), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        await flight.do("k", flaky)
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_coalesces_identical_queries():
+    engine = UnifiedAI(coalesce_window=0.0)
+    replies = await asyncio.gather(*(engine.interact("hello") for _ in range(3)))
+    assert replies == ["I see. You said: Reasoned: hello"] * 3
+    assert len(engine.optical.redis._published) == 2
+    assert "unified_ai_singleflight_hits_total 2.0" in engine.metrics.render()
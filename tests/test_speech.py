@@ -25,9 +25,12 @@ async def test_interact_sequence(monkeypatch):
         call_order.append(f"soul_analyze:{text}")
         return "neutral"
 
-    async def reason(text):
+    async def remember():
+        call_order.append("brain_remember")
+
+    async def deliberate(text):
         call_order.append(f"brain:{text}")
-        return "memory"
+        return "memory", remember
 
     async def transfer(data, target):
         call_order.append(f"optical:{data}")
@@ -51,7 +54,7 @@ async def test_interact_sequence(monkeypatch):
 
     monkeypatch.setattr(engine.aura, "validate_output", AsyncMock(side_effect=aura_validate_output))
     monkeypatch.setattr(engine.soul, "analyze_emotion", AsyncMock(side_effect=analyze_emotion))
-    monkeypatch.setattr(engine.brain, "reason", AsyncMock(side_effect=reason))
+    monkeypatch.setattr(engine.brain, "deliberate", AsyncMock(side_effect=deliberate))
     monkeypatch.setattr(engine.optical, "transfer_data", AsyncMock(side_effect=transfer))
     monkeypatch.setattr(engine.soul, "craft_reply", AsyncMock(side_effect=craft_reply))
     monkeypatch.setattr(engine.speech, "analyze_text", AsyncMock(side_effect=speech_analyze))
@@ -65,6 +68,7 @@ async def test_interact_sequence(monkeypatch):
         "aura:hi",
         "soul_analyze:hi",
         "brain:hi",
+        "brain_remember",
         "optical:memory",
         "aura:memory",
         "soul_craft:memory,neutral",
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai import UnifiedAI
+from unified_ai.stages import StageAborted, StageGraph
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    graph = StageGraph()
+    graph.add("a", lambda r: slow(1))
+    graph.add("b", lambda r: slow(2))
+    graph.add("c", lambda r: slow(r["a"] + r["b"]), "a", "b")
+
+    started = time.perf_counter()
+    results = await graph.run()
+    elapsed = time.perf_counter() - started
+
+    assert results == {"a": 1, "b": 2, "c": 3}
+    assert elapsed < 0.14
+    assert set(graph.timings) == {"a", "b", "c"}
+    assert graph.critical_path()[-1] == "c"
+
+
+@pytest.mark.asyncio
+async def test_guard_cancels_speculative_stages():
+    finished = []
+
+    async def reject():
+        await asyncio.sleep(0.01)
+        return False
+
+    async def speculative():
+        await asyncio.sleep(0.05)
+        finished.append("speculative")
+
+    graph = StageGraph()
+    graph.add("guard", lambda r: reject(), guard=True)
+    graph.add("work", lambda r: speculative())
+
+    with pytest.raises(StageAborted):
+        await graph.run()
+    await asyncio.sleep(0.06)
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_interact_records_stage_timings():
+    engine = UnifiedAI()
+    await engine.interact("hello")
+    assert "brain.reason" in engine.last_stage_timings
+    assert "speech.transmit_speech" in engine.last_stage_timings
+    assert engine.last_critical_path[-1] == "speech.transmit_speech"
+
+    with pytest.raises(ValueError):
+        await engine.interact("harm")
+    assert await engine.brain.memory_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_input_is_never_stored_or_published(monkeypatch):
+    engine = UnifiedAI()
+    validate = engine.aura.validate_output
+
+    async def slow_validate(text):
+        await asyncio.sleep(0.01)
+        return await validate(text)
+
+    monkeypatch.setattr(engine.aura, "validate_output", slow_validate)
+    with pytest.raises(ValueError):
+        await engine.interact("please do harm now")
+    assert engine.optical.redis._published == []
+    assert await engine.brain.memory_count() == 0
+
+    assert "Reasoned: hello there" in await engine.interact("hello there")
+    assert await engine.brain.memory_count() == 1
+    assert [channel for channel, _ in engine.optical.redis._published] == ["UnifiedAI", "SpeechOutput"]
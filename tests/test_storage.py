@@ -0,0 +1,99 @@
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai.brain import BrainEngine
+from unified_ai.storage import AppendOnlyStorage
+
+
+async def _open(path, **options):
+    brain = BrainEngine(storage=AppendOnlyStorage(str(path), **options))
+    await brain.initialize()
+    return brain
+
+
+@pytest.mark.asyncio
+async def test_memories_survive_restart(tmp_path):
+    path = tmp_path / "brain.db"
+    brain = await _open(path)
+    await brain.store_memory("a", "first")
+    await brain.store_memory("b", "second")
+    await brain.store_memory("a", "updated")
+    await brain.retrieve_memory("b")
+    await brain.retrieve_memory("b")
+    stamps = {m["key"]: m["timestamp"] for m in await brain.export_memories()}
+    await brain.close()
+
+    reopened = await _open(path)
+    assert await reopened.memory_count() == 2
+    assert await reopened.retrieve_memory("a") == "updated"
+    exported = {m["key"]: m["access_count"] for m in await reopened.export_memories()}
+    assert exported == {"a": 1, "b": 2}
+    assert {m["key"]: m["timestamp"] for m in await reopened.export_memories()} == stamps
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_compaction_writes_snapshot_and_drops_old_logs(tmp_path):
+    path = tmp_path / "brain.db"
+    brain = await _open(path)
+    for i in range(20):
+        await brain.store_memory(f"k{i}", f"v{i}")
+    await brain.storage.compact()
+    await brain.store_memory("after", "snapshot")
+    await brain.close()
+
+    assert (tmp_path / "brain.db.snapshot").exists()
+    assert len(list(tmp_path.glob("brain.db.log.*"))) == 1
+
+    reopened = await _open(path)
+    assert await reopened.memory_count() == 21
+    assert await reopened.retrieve_memory("k7") == "v7"
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_torn_tail_record_is_ignored(tmp_path):
+    path = tmp_path / "brain.db"
+    brain = await _open(path)
+    await brain.store_memory("kept", "value")
+    await brain.close()
+    log = next(tmp_path.glob("brain.db.log.*"))
+    with open(log, "a", encoding="utf-8") as fh:
+        fh.write('["p","lost","val')
+
+    reopened = await _open(path)
+    assert await reopened.retrieve_memory("kept") == "value"
+    assert await reopened.retrieve_memory("lost") is None
+    await reopened.store_memory("new", "entry")
+    await reopened.close()
+
+    again = await _open(path)
+    assert await again.memory_count() == 2
+    await again.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_memories_yields_batches_and_skips_removed():
+    brain = BrainEngine()
+    for i in range(5):
+        await brain.store_memory(f"k{i}", f"v{i}")
+    stream = brain.stream_memories(batch_size=2)
+    first = await stream.__anext__()
+    assert [m["key"] for m in first] == ["k0", "k1"]
+    brain._remove("k2")
+    rest = [m["key"] async for batch in stream for m in batch]
+    assert rest == ["k3", "k4"]
+    assert len(await brain.export_memories()) == 4
+
+
+@pytest.mark.asyncio
+async def test_unified_ai_storage_option_keeps_memories(tmp_path):
+    from unified_ai import UnifiedAI, lifespan
+
+    path = str(tmp_path / "brain.db")
+    async with lifespan(engine=UnifiedAI(storage=path)) as engine:
+        await engine.interact("hello there")
+    async with lifespan(engine=UnifiedAI(storage=path)) as engine:
+        assert await engine.brain.memory_count() == 1
+        assert "I recall you said: hello there" in await engine.interact("hello there")
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai import UnifiedAI
+from unified_ai import _redis_stub
+from unified_ai.streams import StreamConsumer
+
+
+async def _wait_for(predicate, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_workers_share_stream_and_run_concurrently():
+    client = _redis_stub.Redis()
+    for i in range(6):
+        await client.xadd("jobs", {"data": str(i)})
+
+    seen = []
+    running = 0
+    peak = 0
+
+    async def handler(message):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        seen.append(message)
+        running -= 1
+
+    workers = [
+        StreamConsumer(client, "jobs", "grp", handler, consumer=f"w{i}", concurrency=2, block_ms=10)
+        for i in range(2)
+    ]
+    tasks = [asyncio.create_task(worker.run()) for worker in workers]
+    await _wait_for(lambda: len(seen) == 6)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert sorted(seen) == [str(i) for i in range(6)]
+    assert 1 < peak <= 4
+    assert client._groups[("jobs", "grp")]["pending"] == {}
+
+
+@pytest.mark.asyncio
+async def test_pending_messages_are_reclaimed_after_crash():
+    client = _redis_stub.Redis()
+    await client.xgroup_create("jobs", "grp", id="0", mkstream=True)
+    await client.xadd("jobs", {"data": "lost"})
+    # A worker reads the message and dies before acknowledging it.
+    await client.xreadgroup("grp", "crashed", {"jobs": ">"}, count=1)
+
+    handled = []
+
+    async def handler(message):
+        handled.append(message)
+
+    survivor = StreamConsumer(client, "jobs", "grp", handler, consumer="alive", claim_idle_ms=0)
+    assert await survivor.reclaim() == 1
+    await _wait_for(lambda: handled == ["lost"])
+    await _wait_for(lambda: client._groups[("jobs", "grp")]["pending"] == {})
+
+
+@pytest.mark.asyncio
+async def test_engine_streams_transport_publishes_with_xadd():
+    engine = UnifiedAI(transport="streams")
+    await engine.interact("hello")
+    assert await engine.optical.redis.xlen("UnifiedAI") == 1
+    assert [channel for channel, _ in engine.optical.redis._published] == ["SpeechOutput"]
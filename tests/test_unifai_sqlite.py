@@ -0,0 +1,234 @@
+import asyncio
+import importlib
+import sqlite3
+import time
+import types
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+pytest.importorskip("aiosqlite")
+
+
+def _stub(name, **attrs):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+
+
+# unifAI.py pulls in the GUI and sentiment libraries at import time.
+_stub("textblob", TextBlob=object)
+_stub("tkinter", Tk=object, END="end")
+_stub("tkinter.scrolledtext", ScrolledText=object)
+sys.modules["tkinter"].scrolledtext = sys.modules["tkinter.scrolledtext"]
+
+from unified_ai.unifAI import MIGRATIONS, BrainEngine  # noqa: E402
+
+
+@asynccontextmanager
+async def _brain(*args, **kwargs):
+    brain = BrainEngine(*args, **kwargs)
+    await brain.initialize()
+    try:
+        yield brain
+    finally:
+        # Also on failure: an open connection's thread would hang the run.
+        await brain.close()
+
+
+def _rows(path, sql="SELECT key, content FROM memories ORDER BY key"):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+@pytest.mark.asyncio
+async def test_writes_are_durable_once_they_return(tmp_path):
+    path = str(tmp_path / "brain.db")
+    async with _brain(path) as brain:
+        await asyncio.gather(*(brain.store_memory(f"k{i}", f"v{i}") for i in range(50)))
+        # A separate connection only sees committed data.
+        assert len(_rows(path)) == 50
+        await brain.store_memory("k1", "changed")
+        assert ("k1", "changed") in _rows(path)
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_survives_failing_writes(tmp_path):
+    path = str(tmp_path / "brain.db")
+    async with _brain(path, commit_window=0.001) as brain:
+        loading = True
+
+        async def failing_writes():
+            i = 0
+            while loading:
+                # A dict cannot be bound as a parameter, so the write fails.
+                await brain.store_memory(f"bad{i}", {"not": "text"})
+                i += 1
+
+        async def bulk_load():
+            nonlocal loading
+            try:
+                return await brain.store_many(((f"k{i}", f"v{i}") for i in range(5000)), batch_size=50)
+            finally:
+                loading = False
+
+        stored, _ = await asyncio.gather(bulk_load(), failing_writes())
+        assert stored == 5000
+        assert await brain.memory_count() == 5000
+    assert len(_rows(path)) == 5000
+
+
+@pytest.mark.asyncio
+async def test_access_counts_are_deferred_and_flushed_on_close(tmp_path):
+    path = str(tmp_path / "brain.db")
+    async with _brain(path, access_flush_interval=3600) as brain:
+        await brain.store_memory("k", "v")
+        for _ in range(3):
+            assert await brain.retrieve_memory("k") == "v"
+        assert await brain.retrieve_memory("missing") is None
+        assert _rows(path, "SELECT access_count FROM memories") == [(0,)]
+    assert _rows(path, "SELECT access_count FROM memories") == [(3,)]
+
+
+@pytest.mark.asyncio
+async def test_fts_index_follows_upserts_and_deletes():
+    async with _brain() as brain:
+        await brain.store_memory("a", "I am practising the guitar every evening")
+        await brain.store_memory("b", "tomatoes grow well in the garden")
+        assert [m["key"] for m in await brain.search("guitar")] == ["a"]
+
+        await brain.store_memory("a", "I am practising the piano every evening")
+        assert await brain.search("guitar") == []
+        assert [m["key"] for m in await brain.search("piano evening")] == ["a"]
+        assert await brain.search('"; DROP TABLE memories') == []
+
+        await brain._write("DELETE FROM memories WHERE key = ?", ("b",))
+        assert await brain.search("tomatoes") == []
+
+
+@pytest.mark.asyncio
+async def test_reads_use_a_read_only_pool(tmp_path):
+    async with _brain(str(tmp_path / "brain.db"), read_pool_size=2) as brain:
+        await brain.store_many((f"k{i}", f"v{i}") for i in range(20))
+        results = await asyncio.gather(*(brain.retrieve_memory(f"k{i}") for i in range(20)))
+        assert results == [f"v{i}" for i in range(20)]
+        stats = brain.pool_stats()
+        assert stats["size"] == 2 and stats["idle"] == 2 and stats["acquisitions"] == 20
+
+        async with brain.read_connection() as db:
+            with pytest.raises(sqlite3.OperationalError):
+                await db.execute("DELETE FROM memories")
+            async with brain.read_connection():
+                # Both connections are taken, so the next read waits for one.
+                pending = asyncio.create_task(brain.retrieve_memory("k1"))
+                await asyncio.sleep(0.05)
+                assert not pending.done()
+        assert await pending == "v1"
+        stats = brain.pool_stats()
+        assert stats["wait_seconds_max"] >= 0.04
+        rendered = brain.metrics.render()
+        assert f"unified_ai_read_pool_wait_seconds_count {float(stats['acquisitions'])}" in rendered
+        # The waiting read lands above the 25 ms bucket.
+        assert 'unified_ai_read_pool_wait_seconds_bucket{le="0.025"} ' + f"{float(stats['acquisitions'] - 1)}" in rendered
+        assert "unified_ai_read_pool_idle 2.0" in rendered
+    assert brain.pool_stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_in_memory_database_reads_through_the_writer():
+    async with _brain(read_pool_size=4) as brain:
+        await brain.store_memory("k", "v")
+        assert await brain.retrieve_memory("k") == "v"
+        assert brain.pool_stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pre_versioning_database_is_migrated(tmp_path):
+    path = str(tmp_path / "brain.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE memories (key TEXT PRIMARY KEY, content TEXT, timestamp TEXT, access_count INTEGER)"
+        )
+        conn.execute("INSERT INTO memories VALUES ('old', 'gardening tomatoes', '2024-01-02T03:04:05', 7)")
+    async with _brain(path) as brain:
+        assert await brain.memory_count() == 1
+        assert [m["key"] for m in await brain.search("tomatoes")] == ["old"]
+        assert (await brain.top_k_accessed(1))[0]["timestamp"] == "2024-01-02 03:04:05"
+
+    assert _rows(path, "PRAGMA user_version") == [(len(MIGRATIONS),)]
+    indexes = {name for (name,) in _rows(path, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"memories_timestamp", "memories_access_count"} <= indexes
+    # Reopening an up-to-date database applies nothing.
+    async with _brain(path) as brain:
+        assert await brain.memory_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_count_tracks_upserts_imports_and_deletes():
+    async with _brain() as brain:
+        await asyncio.gather(*(brain.store_memory(f"k{i % 10}", f"v{i}") for i in range(50)))
+        await brain.store_many((f"k{i}", "bulk") for i in range(5, 15))
+        await brain.import_memories(
+            {"key": f"k{i}", "content": "imported", "timestamp": "2024-01-01T00:00:00", "access_count": i}
+            for i in range(12, 20)
+        )
+        await brain._write("DELETE FROM memories WHERE key IN ('k0', 'k1')", ())
+        async with brain.db.execute("SELECT COUNT(*) FROM memories") as cursor:
+            (actual,) = await cursor.fetchone()
+        assert actual == 18
+        assert await brain.memory_count() == actual
+        assert [m["key"] for m in await brain.top_k_accessed(2)] == ["k19", "k18"]
+
+
+@pytest.mark.asyncio
+async def test_recent_since_compares_in_utc(monkeypatch):
+    monkeypatch.setenv("TZ", "Etc/GMT-5")
+    time.tzset()
+    try:
+        async with _brain() as brain:
+            await brain.store_memory("new", "just now")
+            await brain.import_memories(
+                [{"key": "old", "content": "long ago", "timestamp": "2020-06-01T12:00:00", "access_count": 0}]
+            )
+            utc_now = datetime.now(timezone.utc)
+            naive_now = utc_now.replace(tzinfo=None)
+            assert [m["key"] for m in await brain.recent_since(naive_now - timedelta(minutes=1))] == ["new"]
+            assert await brain.recent_since(naive_now + timedelta(minutes=1)) == []
+            # Naive values are UTC, not local time, five hours ahead here.
+            assert await brain.recent_since(datetime.now() - timedelta(minutes=1)) == []
+            assert [m["key"] for m in await brain.recent_since(utc_now.astimezone() - timedelta(minutes=1))] == ["new"]
+            assert [m["key"] for m in await brain.recent_since(datetime(2020, 6, 1, 12))] == ["new", "old"]
+            assert [m["key"] for m in await brain.recent_since(datetime(2020, 6, 1, 12, tzinfo=timezone.utc))] == [
+                "new",
+                "old",
+            ]
+            assert [m["key"] for m in await brain.recent_since("2020-06-01 12:00:01")] == ["new"]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+@pytest.mark.asyncio
+async def test_import_memories_keeps_timestamps_and_counts():
+    async def exported():
+        for i in range(250):
+            yield {"key": f"k{i}", "content": f"v{i}", "timestamp": "2024-01-01 00:00:00", "access_count": i}
+
+    async with _brain() as brain:
+        assert await brain.import_memories(exported(), batch_size=100) == 250
+        assert await brain.store_many([("k1", "replaced"), ("new", "added")]) == 2
+        async with brain.db.execute(
+            "SELECT content, timestamp, access_count FROM memories WHERE key IN ('k1', 'k7') ORDER BY key"
+        ) as cursor:
+            rows = await cursor.fetchall()
+        # An upsert replaces content and timestamp but keeps the access count.
+        assert rows[0][0] == "replaced" and rows[0][1] != "2024-01-01 00:00:00" and rows[0][2] == 1
+        assert rows[1] == ("v7", "2024-01-01 00:00:00", 7)
+        assert await brain.memory_count() == 251
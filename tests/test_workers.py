@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from unified_ai import UnifiedAI
+from unified_ai import _redis_stub
+from unified_ai.workers import WorkerCoordinator
+
+
+@pytest.mark.asyncio
+async def test_ready_once_every_worker_reports_and_features_are_shared():
+    shared = _redis_stub.Redis()
+    first, second = UnifiedAI(), UnifiedAI()
+    one = WorkerCoordinator(shared, expected=2, worker_id="w1")
+    two = WorkerCoordinator(shared, expected=2, worker_id="w2")
+
+    await one.start(first)
+    assert not await one.ready()
+    await second.enable_feature("smart_packet_shaping")
+    await two.start(second)
+    assert await one.ready() and await two.ready()
+
+    await first.enable_feature("deterministic_ethernet_fabric")
+    await two._beat()
+    assert second.feature_manager.enabled == {"smart_packet_shaping", "deterministic_ethernet_fabric"}
+    await one._beat()
+    assert "smart_packet_shaping" in first.feature_manager.enabled
+
+    await two.stop()
+    assert not await one.ready()
+    await one.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_features_are_decoded_for_binary_clients():
+    shared = _redis_stub.Redis()
+    engine = UnifiedAI()
+    coordinator = WorkerCoordinator(shared, expected=1, worker_id="w1")
+    # Without decode_responses Redis returns set members as bytes.
+    await shared.sadd(coordinator.features_key, b"smart_packet_shaping")
+    await coordinator.start(engine)
+    assert engine.feature_manager.enabled == {"smart_packet_shaping"}
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_crashed_workers_are_pruned():
+    shared = _redis_stub.Redis()
+    coordinator = WorkerCoordinator(shared, expected=1, worker_id="w1", ttl=6.0)
+    await shared.zadd(coordinator.workers_key, {"crashed": time.time() - 60})
+    await coordinator.start(UnifiedAI())
+    assert await coordinator.live_workers() == 1
+    assert await shared.zcard(coordinator.workers_key) == 1
+    await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_memories_are_shared_between_workers():
+    shared = _redis_stub.Redis()
+    first, second = UnifiedAI(), UnifiedAI()
+    one = WorkerCoordinator(shared, expected=2, worker_id="w1")
+    two = WorkerCoordinator(shared, expected=2, worker_id="w2")
+    await one.start(first)
+    await two.start(second)
+
+    await first.interact("I practise the guitar every evening")
+    await one.sync_memories()
+    await two.sync_memories()
+    assert "recall" in await second.interact("I practise the guitar every evening")
+    await two.sync_memories()
+    await one.sync_memories()
+    # Merged changes are not sent back, so the log only holds real writes.
+    assert await shared.xlen(one.memory_log_key) == 2
+    assert await first.brain.retrieve_memory("i practise the guitar every evening") is not None
+
+    # A worker starting later loads the shared memories from the hashes.
+    third = UnifiedAI()
+    three = WorkerCoordinator(shared, expected=3, worker_id="w3")
+    await three.start(third)
+    assert await third.brain.memory_count() == 1
+    for coordinator in (one, two, three):
+        await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_keep_the_newer_memory():
+    shared = _redis_stub.Redis()
+    first, second = UnifiedAI(), UnifiedAI()
+    one = WorkerCoordinator(shared, expected=2, worker_id="w1")
+    two = WorkerCoordinator(shared, expected=2, worker_id="w2")
+    await one.start(first)
+    await two.start(second)
+
+    await first.brain.store_memory("k", "older")
+    await asyncio.sleep(0.01)
+    await second.brain.store_memory("k", "newer")
+    await one.sync_memories()
+    await two.sync_memories()
+    await one.sync_memories()
+    assert await first.brain.retrieve_memory("k") == await second.brain.retrieve_memory("k") == "newer"
+
+    await first.brain.store_memory("gone", "soon")
+    await one.sync_memories()
+    await two.sync_memories()
+    assert second.brain._peek("gone") is not None
+    first.brain._remove("gone")
+    await one.sync_memories()
+    await two.sync_memories()
+    assert second.brain._peek("gone") is None
+    for coordinator in (one, two):
+        await coordinator.stop()
+
+
+@pytest.mark.asyncio
+async def test_aliases_are_shared_between_workers():
+    shared = _redis_stub.Redis()
+    first, second = UnifiedAI(dedup_threshold=0.95), UnifiedAI(dedup_threshold=0.95)
+    one = WorkerCoordinator(shared, expected=2, worker_id="w1")
+    two = WorkerCoordinator(shared, expected=2, worker_id="w2")
+    await one.start(first)
+    await two.start(second)
+    await first.brain.store_memory("a", "what is the weather in paris")
+    await first.brain.store_memory("b", "so um what is the weather in paris")
+    await one.sync_memories()
+    await two.sync_memories()
+    assert second.brain.aliases() == {"b": "a"}
+
+    third = UnifiedAI()
+    three = WorkerCoordinator(shared, expected=3, worker_id="w3")
+    await three.start(third)
+    assert await third.brain.retrieve_memory("b") == "what is the weather in paris"
+    for coordinator in (one, two, three):
+        await coordinator.stop()
+
+@pytest.mark.asyncio
+async def test_worker_behind_a_trimmed_log_reloads_the_hashes():
+    shared = _redis_stub.Redis()
+    first, second = UnifiedAI(), UnifiedAI()
+    one = WorkerCoordinator(shared, expected=2, worker_id="w1", memory_log_size=2)
+    two = WorkerCoordinator(shared, expected=2, worker_id="w2", memory_log_size=2)
+    await one.start(first)
+    await two.start(second)
+    for i in range(5):
+        await first.brain.store_memory(f"k{i}", f"v{i}")
+        await one.sync_memories()
+    await two.sync_memories()
+    assert await second.brain.memory_count() == 5
+    for coordinator in (one, two):
+        await coordinator.stop()
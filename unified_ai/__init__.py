@@ -1,7 +1,8 @@
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Awaitable, Optional, Sequence, Union
 
 try:  # pragma: no cover - optional dependency
     import redis.asyncio as redis
@@ -15,60 +16,325 @@ from .aura import AuraEngine
 from .speech import SpeechEngine
 from .network_features import NetworkFeatureManager, NETWORK_FEATURES
 from .replicator import SystemReplicator
+from .stages import StageAborted, StageGraph
+from .streams import StreamConsumer
+from .workers import WorkerCoordinator
+from .singleflight import SingleFlight
+from .metrics import Histogram, LoopLagMonitor, MetricsRegistry
+from .storage import AppendOnlyStorage
+
+BLOCKED_REPLY = "Output blocked due to ethics rules"
+
+INTERACT_STAGES = (
+    "aura.validate_input",
+    "soul.analyze_emotion",
+    "brain.reason",
+    "brain.remember",
+    "optical.transfer_data",
+    "aura.validate_output",
+    "soul.craft_reply",
+    "speech.analyze_text",
+    "speech.synthesize_speech",
+    "speech.transmit_speech",
+)
 
 
 class UnifiedAI:
-    """Central orchestrator coordinating all engines."""
+    """Central orchestrator coordinating all engines.
+
+    ``storage`` persists the brain's memories across restarts; pass an
+    :class:`AppendOnlyStorage` or the path to keep its files at.
+    ``max_bytes`` and ``eviction`` bound the brain's footprint, and ``ttl``
+    and ``expiry_interval`` expire its memories, and ``dedup_threshold`` folds
+    near-duplicate memories together (see :class:`BrainEngine`).
+    """
 
-    def __init__(self, redis_url: str = "redis://localhost:6379/0") -> None:
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        write_behind: bool = False,
+        codec: Any = None,
+        transport: str = "pubsub",
+        stream_concurrency: int = 16,
+        coalesce_window: Optional[float] = None,
+        storage: Union[str, AppendOnlyStorage, None] = None,
+        max_bytes: Optional[int] = None,
+        eviction: str = "lru",
+        ttl: Optional[float] = None,
+        expiry_interval: float = 1.0,
+        dedup_threshold: Optional[float] = None,
+    ) -> None:
+        if transport not in {"pubsub", "streams"}:
+            raise ValueError(f"Unknown transport '{transport}'")
         self.feature_manager = NetworkFeatureManager()
         self.redis_url = redis_url
-        self.redis = redis.from_url(redis_url, decode_responses=True)
+        # Binary codecs need raw bytes back from subscriptions.
+        self._decode_responses = not getattr(codec, "binary", False)
+        self.redis = redis.from_url(redis_url, decode_responses=self._decode_responses)
+        self.metrics = MetricsRegistry()
         self.soul = SoulEngine()
-        self.brain = BrainEngine()
-        self.optical = OpticalEngine(self.redis, self.feature_manager)
+        if isinstance(storage, str):
+            storage = AppendOnlyStorage(storage)
+        self.brain = BrainEngine(
+            metrics=self.metrics,
+            storage=storage,
+            max_bytes=max_bytes,
+            eviction=eviction,
+            ttl=ttl,
+            expiry_interval=expiry_interval,
+            dedup_threshold=dedup_threshold,
+        )
+        self.optical = OpticalEngine(self.redis, self.feature_manager, self.metrics, codec)
+        if write_behind:
+            self.optical.enable_write_behind()
+        self.transport = transport
+        self.stream_concurrency = stream_concurrency
+        if transport == "streams":
+            self.optical.use_stream("UnifiedAI")
         self.aura = AuraEngine()
         self.speech = SpeechEngine(self.optical)
         self.logger = logging.getLogger(self.__class__.__name__)
         self.bg_tasks: list[asyncio.Task] = []
+        self.coordinator: Optional[WorkerCoordinator] = None
+        self.last_stage_timings: dict[str, float] = {}
+        self.last_critical_path: list[str] = []
+        self._stage_seconds = {stage: self._stage_histogram(stage) for stage in INTERACT_STAGES}
+        self._interactions = {
+            outcome: self.metrics.counter(
+                "unified_ai_interactions_total", "Interactions by outcome", {"outcome": outcome}
+            )
+            for outcome in ("ok", "rejected", "blocked", "error")
+        }
+        # Opt-in: identical concurrent queries share one interaction.
+        self.singleflight: Optional[SingleFlight] = None
+        if coalesce_window is not None:
+            self.singleflight = SingleFlight(coalesce_window, self.metrics)
+        self.loop_lag = self.metrics.histogram(
+            "unified_ai_event_loop_lag_seconds", "Delay of the event loop waking a periodic timer"
+        )
 
     async def connect(self) -> None:
         """Establish the Redis connection."""
-        self.redis = redis.from_url(self.redis_url, decode_responses=True)
+        self.redis = redis.from_url(self.redis_url, decode_responses=self._decode_responses)
 
     async def initialize(self) -> None:
         await self.brain.initialize()
         await self.optical.initialize()
         self.bg_tasks.append(asyncio.create_task(self._listener()))
+        self.bg_tasks.append(asyncio.create_task(LoopLagMonitor(self.loop_lag).run()))
 
     async def close(self) -> None:
         for task in self.bg_tasks:
             task.cancel()
+        await asyncio.gather(*self.bg_tasks, return_exceptions=True)
+        self.bg_tasks.clear()
+        await self.optical.close()
         if self.redis:
             await self.redis.close()
         await self.brain.close()
 
     async def enable_feature(self, feature: str) -> None:
         self.feature_manager.enable(feature)
+        if self.coordinator is not None and feature in self.feature_manager.enabled:
+            await self.coordinator.share_feature(feature)
 
     def list_enabled_features(self) -> list[str]:
         return self.feature_manager.list_enabled()
 
+    def _stage_histogram(self, stage: str) -> Histogram:
+        engine, _, call = stage.partition(".")
+        return self.metrics.histogram(
+            "unified_ai_stage_seconds", "Wall time of engine calls made by interact", {"engine": engine, "stage": call}
+        )
+
+    def _observe_stage(self, stage: str, elapsed: float) -> None:
+        histogram = self._stage_seconds.get(stage)
+        if histogram is None:
+            histogram = self._stage_seconds[stage] = self._stage_histogram(stage)
+        histogram.observe(elapsed)
+
     async def interact(self, text: str) -> str:
-        if not await self.aura.validate_output(text):
-            raise ValueError("Inappropriate content")
-        emotion = await self.soul.analyze_emotion(text)
-        memory_response = await self.brain.reason(text)
-        await self.optical.transfer_data(memory_response, "UnifiedAI")
-        if not await self.aura.validate_output(memory_response):
-            return "Output blocked due to ethics rules"
-        reply = await self.soul.craft_reply(memory_response, emotion)
-        analysis = await self.speech.analyze_text(reply)
-        speech_data = await self.speech.synthesize_speech(analysis)
-        await self.speech.transmit_speech(speech_data)
+        """Run ``text`` through the engines and return the crafted reply.
+
+        Emotion analysis and reasoning start alongside input validation and
+        are cancelled if the aura rejects the input; reasoning only works out
+        the reply, and nothing is stored or published until the input has
+        been accepted.  Per-stage wall times of
+        the call are kept in ``last_stage_timings`` and the slowest dependency
+        chain in ``last_critical_path``.  With ``coalesce_window`` set,
+        identical concurrent queries share a single interaction.
+        """
+        if self.singleflight is not None:
+            return await self.singleflight.do(text, lambda: self._observed_interact(text))
+        return await self._observed_interact(text)
+
+    async def _observed_interact(self, text: str) -> str:
+        try:
+            reply = await self._interact(text)
+        except ValueError:
+            self._interactions["rejected"].inc()
+            raise
+        except Exception:
+            self._interactions["error"].inc()
+            raise
+        if reply == BLOCKED_REPLY:
+            self._interactions["blocked"].inc()
+        else:
+            self._interactions["ok"].inc()
         return reply
 
+    async def _interact(self, text: str) -> str:
+        analysis = StageGraph(self._observe_stage)
+        analysis.add("aura.validate_input", lambda r: self.aura.validate_output(text), guard=True)
+        analysis.add("soul.analyze_emotion", lambda r: self.soul.analyze_emotion(text))
+        analysis.add("brain.reason", lambda r: self.brain.deliberate(text))
+        analysis.add("brain.remember", lambda r: r["brain.reason"][1](), "aura.validate_input", "brain.reason")
+        analysis.add(
+            "optical.transfer_data",
+            lambda r: self.optical.transfer_data(r["brain.reason"][0], "UnifiedAI"),
+            "aura.validate_input",
+            "brain.reason",
+        )
+        analysis.add(
+            "aura.validate_output",
+            lambda r: self.aura.validate_output(r["brain.reason"][0]),
+            "brain.reason",
+        )
+        try:
+            results = await analysis.run()
+        except StageAborted:
+            raise ValueError("Inappropriate content") from None
+        finally:
+            self.last_stage_timings = analysis.timings
+            self.last_critical_path = analysis.critical_path()
+        if not results["aura.validate_output"]:
+            return BLOCKED_REPLY
+        memory_response = results["brain.reason"][0]
+
+        delivery = StageGraph(self._observe_stage)
+        delivery.add(
+            "soul.craft_reply",
+            lambda r: self.soul.craft_reply(memory_response, results["soul.analyze_emotion"]),
+        )
+        delivery.add("speech.analyze_text", lambda r: self.speech.analyze_text(r["soul.craft_reply"]), "soul.craft_reply")
+        delivery.add(
+            "speech.synthesize_speech",
+            lambda r: self.speech.synthesize_speech(r["speech.analyze_text"]),
+            "speech.analyze_text",
+        )
+        delivery.add(
+            "speech.transmit_speech",
+            lambda r: self.speech.transmit_speech(r["speech.synthesize_speech"]),
+            "speech.synthesize_speech",
+        )
+        try:
+            replies = await delivery.run()
+        finally:
+            self.last_stage_timings = {**analysis.timings, **delivery.timings}
+            self.last_critical_path = analysis.critical_path() + delivery.critical_path()
+        return replies["soul.craft_reply"]
+
+    async def interact_many(
+        self, texts: Sequence[str], return_exceptions: bool = False
+    ) -> list[Union[str, BaseException]]:
+        """Run a batch of inputs through every stage once, in input order.
+
+        Replies match what successive :meth:`interact` calls would return.  All
+        optical and speech publishes for the batch go out in a single Redis
+        pipeline and new memories are written in bulk.  Inputs rejected by the
+        aura raise ``ValueError`` before any work is done unless
+        ``return_exceptions`` is set, in which case the error takes that
+        input's slot in the result.  Outcomes are counted per input, and each
+        input is charged an equal share of a batched stage's wall time.  With
+        ``coalesce_window`` set, inputs identical to one another or to a
+        concurrent query share a single interaction.
+        """
+        texts = list(texts)
+        valid = await self._batch_stage("aura.validate_input", len(texts), self.aura.validate_outputs(texts))
+        rejected = len(texts) - sum(valid)
+        if rejected:
+            self._interactions["rejected"].inc(rejected)
+            if not return_exceptions:
+                raise ValueError("Inappropriate content")
+        accepted = [text for text, ok in zip(texts, valid) if ok]
+        if self.singleflight is not None:
+            replies = await self.singleflight.do_many(accepted, self._observed_interact_many)
+        else:
+            replies = await self._observed_interact_many(accepted)
+
+        results: list[Union[str, BaseException]] = []
+        pending = iter(replies)
+        for ok in valid:
+            results.append(next(pending) if ok else ValueError("Inappropriate content"))
+        return results
+
+    async def _observed_interact_many(self, texts: list[str]) -> list[str]:
+        try:
+            replies = await self._interact_many(texts)
+        except Exception:
+            self._interactions["error"].inc(len(texts))
+            raise
+        blocked = replies.count(BLOCKED_REPLY)
+        self._interactions["blocked"].inc(blocked)
+        self._interactions["ok"].inc(len(replies) - blocked)
+        return replies
+
+    async def _interact_many(self, texts: list[str]) -> list[str]:
+        if not texts:
+            return []
+        emotions = await self._batch_stage("soul.analyze_emotion", len(texts), self.soul.analyze_emotions(texts))
+        memory_responses = await self._batch_stage("brain.reason", len(texts), self.brain.reason_many(texts))
+        outbound: list[tuple[Any, str]] = [(resp, "UnifiedAI") for resp in memory_responses]
+        allowed = await self._batch_stage(
+            "aura.validate_output", len(memory_responses), self.aura.validate_outputs(memory_responses)
+        )
+
+        replies: list[str] = []
+        for memory_response, emotion, ok in zip(memory_responses, emotions, allowed):
+            if not ok:
+                replies.append(BLOCKED_REPLY)
+                continue
+            reply = await self._batch_stage("soul.craft_reply", 1, self.soul.craft_reply(memory_response, emotion))
+            analysis = await self._batch_stage("speech.analyze_text", 1, self.speech.analyze_text(reply))
+            speech_data = await self._batch_stage("speech.synthesize_speech", 1, self.speech.synthesize_speech(analysis))
+            outbound.append((speech_data, "SpeechOutput"))
+            replies.append(reply)
+
+        started = time.perf_counter()
+        try:
+            await self.optical.transfer_many(outbound)
+        finally:
+            # One pipeline carries both kinds of publish; split its time by item.
+            share = (time.perf_counter() - started) / len(outbound)
+            spoken = len(outbound) - len(memory_responses)
+            self._observe_shares("optical.transfer_data", share * len(memory_responses), len(memory_responses))
+            self._observe_shares("speech.transmit_speech", share * spoken, spoken)
+        return replies
+
+    async def _batch_stage(self, stage: str, count: int, call: Awaitable[Any]) -> Any:
+        """Await a stage call made for ``count`` inputs, charging each an equal share."""
+        started = time.perf_counter()
+        try:
+            return await call
+        finally:
+            self._observe_shares(stage, time.perf_counter() - started, count)
+
+    def _observe_shares(self, stage: str, elapsed: float, count: int) -> None:
+        for _ in range(count):
+            self._observe_stage(stage, elapsed / count)
+
     async def _listener(self) -> None:
+        if self.transport == "streams":
+            consumer = StreamConsumer(
+                self.optical.redis,
+                "UnifiedAI",
+                "unified_ai",
+                self.optical.process_message,
+                concurrency=self.stream_concurrency,
+                codec=self.optical.codec,
+            )
+            await consumer.run()
+            return
         async for message in self.optical.subscribe("UnifiedAI"):
             await self.optical.process_message(message)
 
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import argparse
+import json
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 try:  # pragma: no cover - optional dependency
     import uvicorn
@@ -9,14 +13,45 @@ except ModuleNotFoundError:  # pragma: no cover - used in tests
     uvicorn = None
 
 from . import UnifiedAI, lifespan as engine_lifespan
+from .dedup import SimHashIndex
+from .eviction import POLICIES
+from .metrics import PROMETHEUS_CONTENT_TYPE
+from .workers import WorkerCoordinator
 
-engine = UnifiedAI()
+WORKERS = int(os.environ.get("UNIFIED_AI_WORKERS", "1"))
+COALESCE_WINDOW = os.environ.get("UNIFIED_AI_COALESCE_WINDOW")
+STORAGE = os.environ.get("UNIFIED_AI_STORAGE")
+MAX_BYTES = os.environ.get("UNIFIED_AI_MAX_BYTES")
+EVICTION = os.environ.get("UNIFIED_AI_EVICTION", "lru")
+TTL = os.environ.get("UNIFIED_AI_TTL")
+EXPIRY_INTERVAL = float(os.environ.get("UNIFIED_AI_EXPIRY_INTERVAL", "1.0"))
+DEDUP_THRESHOLD = os.environ.get("UNIFIED_AI_DEDUP_THRESHOLD")
+
+# Each pre-forked worker imports this module and so builds its own engine.
+engine = UnifiedAI(
+    coalesce_window=float(COALESCE_WINDOW) if COALESCE_WINDOW else None,
+    storage=STORAGE or None,
+    max_bytes=int(MAX_BYTES) if MAX_BYTES else None,
+    eviction=EVICTION,
+    ttl=float(TTL) if TTL else None,
+    expiry_interval=EXPIRY_INTERVAL,
+    dedup_threshold=float(DEDUP_THRESHOLD) if DEDUP_THRESHOLD else None,
+)
 
 @asynccontextmanager
 async def app_lifespan(app: FastAPI):
     async with engine_lifespan(app, engine) as eng:
         app.state.engine = eng
-        yield
+        coordinator = None
+        if WORKERS > 1:
+            coordinator = WorkerCoordinator(eng.redis, expected=WORKERS)
+            await coordinator.start(eng)
+        app.state.coordinator = coordinator
+        try:
+            yield
+        finally:
+            if coordinator is not None:
+                await coordinator.stop()
 
 app = FastAPI(lifespan=app_lifespan)
 
@@ -36,18 +71,118 @@ async def query_endpoint(payload: dict, request: Request):
 async def health_endpoint(request: Request):
     ai: UnifiedAI = request.app.state.engine
     redis_ok = await ai.redis.ping()
-    return {"redis": bool(redis_ok), "features": ai.list_enabled_features()}
+    coordinator = getattr(request.app.state, "coordinator", None)
+    ready = await coordinator.ready() if coordinator is not None else True
+    return {"redis": bool(redis_ok), "features": ai.list_enabled_features(), "ready": ready}
 
 @app.get("/metrics")
 async def metrics_endpoint(request: Request):
     ai: UnifiedAI = request.app.state.engine
     mem_count = await ai.brain.memory_count()
-    return {"memory_count": mem_count, "network_features": ai.list_enabled_features()}
+    return {
+        "memory_count": mem_count,
+        "memory_footprint_bytes": ai.brain.footprint_bytes,
+        "memory_evictions": ai.brain.evictions,
+        "network_features": ai.list_enabled_features(),
+    }
+
+@app.get("/metrics/prometheus")
+async def prometheus_endpoint(request: Request):
+    ai: UnifiedAI = request.app.state.engine
+    return PlainTextResponse(ai.metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/memories/export")
+async def export_endpoint(request: Request):
+    ai: UnifiedAI = request.app.state.engine
+
+    async def lines():
+        async for batch in ai.brain.stream_memories():
+            yield "".join(json.dumps(memory) + "\n" for memory in batch)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the UnifiedAI API")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Worker processes, each with its own engine, sharing memories through Redis (default: $UNIFIED_AI_WORKERS or 1)",
+    )
+    parser.add_argument(
+        "--coalesce-window",
+        type=float,
+        default=None,
+        help="Share one computation between identical /query payloads arriving within this many seconds",
+    )
+    parser.add_argument(
+        "--storage",
+        default=STORAGE,
+        help="Keep memories across restarts in an append-only store at this path (default: $UNIFIED_AI_STORAGE)",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=int(MAX_BYTES) if MAX_BYTES else None,
+        help="Evict memories once they take more than this many bytes (default: $UNIFIED_AI_MAX_BYTES, unbounded)",
+    )
+    parser.add_argument(
+        "--eviction",
+        choices=sorted(POLICIES),
+        default=EVICTION,
+        help="Which memories --max-bytes evicts first (default: $UNIFIED_AI_EVICTION or lru)",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=float(TTL) if TTL else None,
+        help="Forget memories this many seconds after they were stored (default: $UNIFIED_AI_TTL, never)",
+    )
+    parser.add_argument(
+        "--expiry-interval",
+        type=float,
+        default=EXPIRY_INTERVAL,
+        help="Seconds between sweeps removing expired memories (default: $UNIFIED_AI_EXPIRY_INTERVAL or 1)",
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=float(DEDUP_THRESHOLD) if DEDUP_THRESHOLD else None,
+        help="Fold memories at least this similar (0.89-1) into one (default: $UNIFIED_AI_DEDUP_THRESHOLD, off)",
+    )
+    args = parser.parse_args()
+    if args.storage and args.workers > 1:
+        # Every worker would append to the same log files.
+        parser.error("--storage needs a single worker")
+    if args.dedup_threshold is not None:
+        try:
+            SimHashIndex.for_similarity(args.dedup_threshold)
+        except ValueError as exc:
+            parser.error(f"--dedup-threshold: {exc}")
+    return args
 
 def main() -> None:
     if not uvicorn:
         raise RuntimeError("uvicorn is not available in this environment")
-    uvicorn.run("unified_ai.__main__:app", host="0.0.0.0", port=8000)
+    args = _parse_args()
+    # Workers re-import this module; the variable tells them how many peers
+    # must report in before /health declares the deployment ready.
+    os.environ["UNIFIED_AI_WORKERS"] = str(args.workers)
+    if args.coalesce_window is not None:
+        os.environ["UNIFIED_AI_COALESCE_WINDOW"] = str(args.coalesce_window)
+    if args.storage:
+        os.environ["UNIFIED_AI_STORAGE"] = args.storage
+    if args.max_bytes is not None:
+        os.environ["UNIFIED_AI_MAX_BYTES"] = str(args.max_bytes)
+    os.environ["UNIFIED_AI_EVICTION"] = args.eviction
+    if args.ttl is not None:
+        os.environ["UNIFIED_AI_TTL"] = str(args.ttl)
+    os.environ["UNIFIED_AI_EXPIRY_INTERVAL"] = str(args.expiry_interval)
+    if args.dedup_threshold is not None:
+        os.environ["UNIFIED_AI_DEDUP_THRESHOLD"] = str(args.dedup_threshold)
+    uvicorn.run("unified_ai.__main__:app", host=args.host, port=args.port, workers=args.workers)
 
 
 if __name__ == "__main__":
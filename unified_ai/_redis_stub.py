@@ -2,7 +2,30 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import time
+from typing import Any, Optional
+
+
+class ResponseError(Exception):
+    """Mirror of ``redis.exceptions.ResponseError``."""
+
+
+def _parse_id(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _in_range(score: float, min: Any, max: Any) -> bool:
+    def bound(value: Any) -> tuple[float, bool]:
+        text = str(value)
+        exclusive = text.startswith("(")
+        text = text.lstrip("(")
+        return float({"-inf": "-inf", "+inf": "inf"}.get(text, text)), exclusive
+
+    low, low_open = bound(min)
+    high, high_open = bound(max)
+    return (low < score if low_open else low <= score) and (score < high if high_open else score <= high)
 
 
 class FakePubSub:
@@ -17,19 +40,239 @@ class FakePubSub:
             yield {}
 
 
+class FakePipeline:
+    """Buffer commands and replay them against the fake client on ``execute``."""
+
+    def __init__(self, client: "Redis") -> None:
+        self._client = client
+        self._commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def publish(self, channel: str, data: Any) -> "FakePipeline":
+        self._commands.append(("publish", (channel, data), {}))
+        return self
+
+    def xadd(self, name: str, fields: dict, **kwargs: Any) -> "FakePipeline":
+        self._commands.append(("xadd", (name, fields), kwargs))
+        return self
+
+    def hset(self, name: str, key: Any, value: Any) -> "FakePipeline":
+        self._commands.append(("hset", (name, key, value), {}))
+        return self
+
+    def hdel(self, name: str, *keys: Any) -> "FakePipeline":
+        self._commands.append(("hdel", (name, *keys), {}))
+        return self
+
+    async def execute(self) -> list[Any]:
+        commands, self._commands = self._commands, []
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        self._commands.clear()
+
+
 class Redis:
     """Minimal subset of ``redis.asyncio.Redis`` used in tests."""
 
     def __init__(self) -> None:
         self._published: list[tuple[str, Any]] = []
+        self._streams: dict[str, list[tuple[str, dict]]] = {}
+        self._groups: dict[tuple[str, str], dict[str, Any]] = {}
+        self._last_id = (0, 0)
+        self._stream_added: Optional[asyncio.Event] = None
+        self._sets: dict[str, set] = {}
+        self._zsets: dict[str, dict[Any, float]] = {}
+        self._hashes: dict[str, dict[Any, Any]] = {}
 
     async def publish(self, channel: str, data: Any) -> int:
         self._published.append((channel, data))
         return 1
 
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
     def pubsub(self) -> FakePubSub:
         return FakePubSub()
 
+    # ------------------------------------------------------- sets and zsets
+
+    async def sadd(self, name: str, *values: Any) -> int:
+        members = self._sets.setdefault(name, set())
+        added = len(set(values) - members)
+        members.update(values)
+        return added
+
+    async def smembers(self, name: str) -> set:
+        return set(self._sets.get(name, set()))
+
+    async def zadd(self, name: str, mapping: dict[Any, float]) -> int:
+        scores = self._zsets.setdefault(name, {})
+        added = len(set(mapping) - set(scores))
+        scores.update(mapping)
+        return added
+
+    async def zrem(self, name: str, *values: Any) -> int:
+        scores = self._zsets.get(name, {})
+        return sum(1 for value in values if scores.pop(value, None) is not None)
+
+    async def zcount(self, name: str, min: Any, max: Any) -> int:
+        return sum(1 for score in self._zsets.get(name, {}).values() if _in_range(score, min, max))
+
+    async def zcard(self, name: str) -> int:
+        return len(self._zsets.get(name, {}))
+
+    async def zremrangebyscore(self, name: str, min: Any, max: Any) -> int:
+        scores = self._zsets.get(name, {})
+        doomed = [member for member, score in scores.items() if _in_range(score, min, max)]
+        for member in doomed:
+            del scores[member]
+        return len(doomed)
+
+    # ------------------------------------------------------------- hashes
+
+    async def hset(self, name: str, key: Any, value: Any) -> int:
+        fields = self._hashes.setdefault(name, {})
+        added = key not in fields
+        fields[key] = value
+        return int(added)
+
+    async def hdel(self, name: str, *keys: Any) -> int:
+        fields = self._hashes.get(name, {})
+        return sum(1 for key in keys if fields.pop(key, None) is not None)
+
+    async def hgetall(self, name: str) -> dict:
+        return dict(self._hashes.get(name, {}))
+
+    # ------------------------------------------------------------ streams
+
+    async def xadd(self, name: str, fields: dict, id: str = "*", maxlen: Optional[int] = None, approximate: bool = True) -> str:
+        now = int(time.time() * 1000)
+        ms, seq = self._last_id
+        self._last_id = (now, 0) if now > ms else (ms, seq + 1)
+        entry_id = "%d-%d" % self._last_id
+        entries = self._streams.setdefault(name, [])
+        entries.append((entry_id, dict(fields)))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        if self._stream_added is not None:
+            self._stream_added.set()
+        return entry_id
+
+    async def xlen(self, name: str) -> int:
+        return len(self._streams.get(name, []))
+
+    async def xrange(self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None) -> list:
+        low = (0, 0) if min == "-" else _parse_id(min)
+        high = None if max == "+" else _parse_id(max)
+        entries = [
+            e for e in self._streams.get(name, []) if low <= _parse_id(e[0]) and (high is None or _parse_id(e[0]) <= high)
+        ]
+        return entries[:count]
+
+    async def xrevrange(self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None) -> list:
+        return list(reversed(await self.xrange(name, min, max)))[:count]
+
+    async def xread(self, streams: dict[str, str], count: Optional[int] = None, block: Optional[int] = None) -> list:
+        result = []
+        for name, start in streams.items():
+            after = _parse_id(start)
+            entries = [e for e in self._streams.get(name, []) if _parse_id(e[0]) > after][:count]
+            if entries:
+                result.append([name, entries])
+        return result
+
+    async def xgroup_create(self, name: str, groupname: str, id: str = "$", mkstream: bool = False) -> bool:
+        if name not in self._streams:
+            if not mkstream:
+                raise ResponseError("ERR The XGROUP subcommand requires the key to exist")
+            self._streams[name] = []
+        if (name, groupname) in self._groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        entries = self._streams[name]
+        last = entries[-1][0] if id == "$" and entries else ("0-0" if id == "$" else id)
+        self._groups[(name, groupname)] = {"last": last, "pending": {}}
+        return True
+
+    async def xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: dict[str, str],
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+        noack: bool = False,
+    ) -> list:
+        result = self._read_group(groupname, consumername, streams, count, noack)
+        if result or block is None:
+            return result
+        if self._stream_added is None:
+            self._stream_added = asyncio.Event()
+        self._stream_added.clear()
+        try:
+            await asyncio.wait_for(self._stream_added.wait(), block / 1000 if block else None)
+        except asyncio.TimeoutError:
+            return []
+        return self._read_group(groupname, consumername, streams, count, noack)
+
+    def _read_group(self, groupname: str, consumername: str, streams: dict, count: Optional[int], noack: bool) -> list:
+        result = []
+        now = time.monotonic()
+        for name, start in streams.items():
+            group = self._groups.get((name, groupname))
+            if group is None:
+                raise ResponseError("NOGROUP No such key or consumer group")
+            pending = group["pending"]
+            if start == ">":
+                after = _parse_id(group["last"])
+                entries = [e for e in self._streams.get(name, []) if _parse_id(e[0]) > after][:count]
+                if entries:
+                    group["last"] = entries[-1][0]
+                if not noack:
+                    for entry_id, _ in entries:
+                        pending[entry_id] = [consumername, now, 1]
+            else:
+                after = _parse_id(start)
+                entries = [
+                    e
+                    for e in self._streams.get(name, [])
+                    if e[0] in pending and pending[e[0]][0] == consumername and _parse_id(e[0]) > after
+                ][:count]
+            if entries:
+                result.append([name, entries])
+        return result
+
+    async def xack(self, name: str, groupname: str, *ids: str) -> int:
+        pending = self._groups.get((name, groupname), {}).get("pending", {})
+        return sum(1 for entry_id in ids if pending.pop(entry_id, None) is not None)
+
+    async def xautoclaim(
+        self,
+        name: str,
+        groupname: str,
+        consumername: str,
+        min_idle_time: int,
+        start_id: str = "0-0",
+        count: Optional[int] = None,
+        justid: bool = False,
+    ) -> list:
+        pending = self._groups[(name, groupname)]["pending"]
+        entries = dict(self._streams.get(name, []))
+        now = time.monotonic()
+        start = _parse_id(start_id)
+        claimed = []
+        for entry_id in sorted(pending, key=_parse_id):
+            if _parse_id(entry_id) < start or (now - pending[entry_id][1]) * 1000 < min_idle_time:
+                continue
+            if count is not None and len(claimed) >= count:
+                return [entry_id, claimed, []]
+            owner = pending[entry_id]
+            owner[0], owner[1], owner[2] = consumername, now, owner[2] + 1
+            claimed.append(entry_id if justid else (entry_id, entries.get(entry_id, {})))
+        return ["0-0", claimed, []]
+
     async def ping(self) -> bool:
         return True
 
@@ -1,5 +1,6 @@
 import json
 import logging
+from typing import Iterable, List
 
 
 class AuraEngine:
@@ -31,3 +32,7 @@ class AuraEngine:
         if any(word in lowered for word in ["bias", "discriminate"]):
             return False
         return True
+
+    async def validate_outputs(self, outputs: Iterable[str]) -> List[bool]:
+        """Validate a batch of outputs, preserving their order."""
+        return [await self.validate_output(output) for output in outputs]
@@ -1,23 +1,217 @@
+import asyncio
+import heapq
 import logging
+import sys
+import time
+import uuid
+from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+from .dedup import SimHashIndex, simhash
+from .eviction import make_policy
+from .metrics import MetricsRegistry
+from .search import BM25Index
+from .segment import FrozenSegment
+from .storage import AppendOnlyStorage, SnapshotRow
 
-@dataclass
+
+def _to_epoch(timestamp: datetime) -> float:
+    # Timestamps are naive UTC, as produced by ``datetime.utcnow()``.
+    return timestamp.replace(tzinfo=timezone.utc).timestamp()
+
+
+@dataclass(slots=True)
 class MemoryEntry:
+    """A stored memory.
+
+    Slotted, with the timestamp held as epoch seconds rather than a
+    ``datetime``, to keep per-entry overhead low in large stores.
+    """
+
     content: str
-    timestamp: datetime
+    created: float
     access_count: int = 0
 
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.created, timezone.utc).replace(tzinfo=None)
+
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.created = _to_epoch(value)
+
+
+def _entry_overhead() -> int:
+    sample = MemoryEntry("", 0.5)
+    # Instance, its float timestamp and one slot in the store.
+    return sys.getsizeof(sample) + sys.getsizeof(sample.created) + 24
+
+
+ENTRY_OVERHEAD = _entry_overhead()
+
+
+def _entry_size(key: str, entry: MemoryEntry) -> int:
+    return ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(entry.content)
+
+
+def _entry_from_storage(content: str, timestamp: str, access_count: int) -> MemoryEntry:
+    return MemoryEntry(content, _to_epoch(datetime.fromisoformat(timestamp)), access_count)
+
+
+Records = Union[Iterable[Any], AsyncIterable[Any]]
+
+
+async def _iterate(records: Records) -> AsyncIterator[Any]:
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
+async def _batches(records: Records, size: int) -> AsyncIterator[List[Any]]:
+    batch: List[Any] = []
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    else:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
 
 class BrainEngine:
-    """Reasoning, memory management, and learning with an in-memory store."""
+    """Reasoning, memory management, and learning with an in-memory store.
+
+    Pass ``storage`` (for example ``AppendOnlyStorage(db_path)``) to persist
+    memories across restarts; without it everything lives in memory only.
+
+    ``max_bytes`` bounds the estimated footprint of the store.  Once it is
+    exceeded memories are evicted according to ``eviction``: ``"lru"``,
+    ``"lfu"`` (by ``access_count``) or ``"hybrid"`` (segmented LRU).
+
+    Memory content is kept in a BM25 index.  ``reason`` recalls the best match
+    when it shares at least ``recall_threshold`` of its distinct terms with
+    the input, so paraphrases find earlier memories, not only exact repeats.
+
+    Every put, removal and access-count bump is numbered in ``sequence`` and
+    kept in a change log of the last ``change_log_size`` changes, from which
+    ``changes_since`` builds deltas for replicas.  ``log_id`` identifies this
+    run's log so replicas notice when numbering restarts.
 
-    def __init__(self, db_path: str = "brain.db") -> None:
+    ``freeze`` packs the memories into a shareable :class:`FrozenSegment`;
+    an empty engine given a mapping of one through ``attach_base`` reads it
+    in place and keeps its own writes, access counts and removals in a
+    private overlay.  Each engine closes the mappings it holds on ``close``.
+
+    Memories expire ``ttl`` seconds after they were stored, or after the
+    ``ttl`` passed to ``store_memory``.  Deadlines sit in a heap; once
+    initialised, a background task removes expired memories every
+    ``expiry_interval`` seconds in slices of ``expiry_slice`` so a large
+    backlog never blocks the event loop.  Expired memories are also dropped
+    when they are next retrieved.
+
+    With ``dedup_threshold`` set, ``store_memory`` and ``store_many``
+    fingerprint content with SimHash.  When a stored memory agrees on at least that share of
+    fingerprint bits, the new key becomes an alias of it and its access count
+    is bumped instead of storing a near-duplicate.  Aliases are kept in
+    ``storage`` and carried by ``changes_since`` like memories.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "brain.db",
+        storage: Optional[AppendOnlyStorage] = None,
+        max_bytes: Optional[int] = None,
+        eviction: str = "lru",
+        metrics: Optional[MetricsRegistry] = None,
+        recall_threshold: float = 0.8,
+        change_log_size: int = 100_000,
+        ttl: Optional[float] = None,
+        expiry_interval: float = 1.0,
+        expiry_slice: int = 1000,
+        dedup_threshold: Optional[float] = None,
+    ) -> None:
         self.db_path = db_path
+        self.recall_threshold = recall_threshold
+        self.storage = storage
+        self.max_bytes = max_bytes
         self.logger = logging.getLogger(self.__class__.__name__)
         self._memories: Dict[str, MemoryEntry] = {}
+        self._index = BM25Index()
+        self.base: Optional[FrozenSegment] = None
+        # Base keys shadowed by the overlay or removed; always a subset of base.
+        # Their record offsets and token counts keep base search in step.
+        self._hidden: set = set()
+        self._hidden_positions: Set[int] = set()
+        self._hidden_length = 0
+        self._frozen: Optional[Tuple[Tuple[str, int], FrozenSegment]] = None
+        # Bumped by puts and removals but not by accesses; keys ``_frozen``.
+        self._content_version = 0
+        self.ttl = ttl
+        self.expiry_interval = expiry_interval
+        self.expiry_slice = expiry_slice
+        # ``_expires`` is authoritative; heap items not matching it are stale.
+        self._expires: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_task: Optional[asyncio.Task] = None
+        self._fingerprints = SimHashIndex.for_similarity(dedup_threshold) if dedup_threshold is not None else None
+        # Alias key -> canonical key, and canonical key -> its aliases.
+        self._aliases: Dict[str, str] = {}
+        self._aliased: Dict[str, set] = {}
+        self._policy = make_policy(eviction) if max_bytes is not None else None
+        self.footprint_bytes = 0
+        self.log_id = uuid.uuid4().hex
+        self.sequence = 0
+        # (sequence, op, key, whether the change was merged from a peer)
+        self._changes: Deque[Tuple[int, str, str, bool]] = deque(maxlen=change_log_size)
+        self._merging = False
+        self.metrics = metrics or MetricsRegistry()
+        self._evictions = self.metrics.counter(
+            "unified_ai_brain_evictions_total", "Memories evicted to stay within the byte budget"
+        )
+        self.metrics.gauge(
+            "unified_ai_brain_footprint_bytes", "Estimated bytes held by brain memories", callback=lambda: self.footprint_bytes
+        )
+        self.metrics.gauge(
+            "unified_ai_brain_memories", "Memories held by the brain", callback=self._count
+        )
+        self._expired = self.metrics.counter("unified_ai_brain_expired_total", "Memories removed after their TTL")
+        self._expired_bytes = self.metrics.counter(
+            "unified_ai_brain_expired_bytes_total", "Estimated bytes reclaimed from expired memories"
+        )
+        self._last_expiry = self.metrics.gauge(
+            "unified_ai_brain_expiry_last_cycle_bytes", "Estimated bytes reclaimed by the last expiry cycle"
+        )
+        self._folds = self.metrics.counter(
+            "unified_ai_brain_dedup_folds_total", "Near-duplicate memories folded into an existing one"
+        )
         self.rules = {
             "productivity": "Try time-blocking and prioritizing tasks with a Pomodoro technique.",
             "learning": "Consider spaced repetition and hands-on projects.",
@@ -28,36 +222,559 @@ class BrainEngine:
         self.db: "BrainEngine" = self
 
     async def initialize(self) -> None:
-        # Nothing to initialise for the in-memory backend, but the coroutine is
-        # retained for interface compatibility.
-        return None
+        if self.storage is not None:
+            await self._load()
+        if self.expiry_interval and self._expiry_task is None:
+            self._expiry_task = asyncio.create_task(self._expiry_loop())
 
-    async def store_memory(self, key: str, value: str) -> None:
-        entry = self._memories.get(key)
+    async def _load(self) -> None:
+        loaded, deadlines, aliases = await asyncio.to_thread(self.storage.load, _entry_from_storage)
+        self._memories = {sys.intern(key): entry for key, entry in loaded.items()}
+        self.footprint_bytes = 0
+        self._index.clear()
+        for key, entry in self._memories.items():
+            self.footprint_bytes += _entry_size(key, entry)
+            self._index.add(key, entry.content)
+            if self._policy is not None:
+                self._policy.insert(key, entry.access_count)
+            deadline = deadlines.get(key)
+            if deadline is None and self.ttl is not None:
+                # Stored before deadlines were persisted.
+                deadline = entry.created + self.ttl
+            if deadline is not None:
+                self._set_deadline(key, deadline)
+            if self._fingerprints is not None:
+                self._fingerprints.add(key, simhash(entry.content))
+        for alias, target in aliases.items():
+            self._aliases[sys.intern(alias)] = target
+            self._aliased.setdefault(target, set()).add(alias)
+        self.storage.start(self._snapshot_rows, self.aliases)
+        self._enforce_budget()
+
+    def _snapshot_rows(self) -> Callable[[], Iterator[SnapshotRow]]:
+        items = [(key, entry, self._expires.get(key)) for key, entry in self._memories.items()]
+
+        def rows() -> Iterator[SnapshotRow]:
+            for key, entry, expires in items:
+                yield key, entry.content, entry.timestamp.isoformat(), entry.access_count, expires
+
+        return rows
+
+    async def store_memory(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, expiring after ``ttl`` (or the default) seconds."""
+        self._store(key, value, time.time(), ttl=ttl)
+
+    def _store(self, key: str, value: str, created: float, enforce: bool = True, ttl: Optional[float] = None) -> None:
+        if self._fingerprints is not None:
+            match = self._fingerprints.find(simhash(value))
+            if match is not None and match != key:
+                entry = self._memories.get(match) or self._promote(match)
+                if entry is not None:
+                    self._alias(key, match)
+                    self._set_access_count(match, entry, entry.access_count + 1)
+                    self._folds.inc()
+                    return
+        self._put(key, value, created, enforce=enforce, ttl=ttl)
+
+    def _alias(self, key: str, target: str) -> None:
+        if self._peek(key) is not None:
+            # The key held its own memory; it now points at the duplicate.
+            self._remove(key)
+        self._unalias(key)
+        self._aliases[key] = target
+        self._aliased.setdefault(target, set()).add(key)
+        if self.storage is not None:
+            self.storage.alias(key, target)
+        self._record("alias", key)
+
+    def _drop_alias(self, key: str) -> None:
+        self._unalias(key)
+        if self.storage is not None:
+            self.storage.delete(key)
+        self._record("delete", key)
+
+    def aliases(self) -> Dict[str, str]:
+        """Return a copy of the map from folded keys to the memory they alias."""
+        return dict(self._aliases)
+
+    def _unalias(self, key: str) -> None:
+        target = self._aliases.pop(key, None)
+        if target is not None:
+            aliases = self._aliased[target]
+            aliases.discard(key)
+            if not aliases:
+                del self._aliased[target]
+
+    async def store_many(self, records: Records, batch_size: int = 1000) -> int:
+        """Store ``(key, content)`` pairs from an iterable or async iterable.
+
+        Each record is applied as soon as it is read, so a generator feeding
+        this sees its earlier records already stored.  The byte budget is
+        enforced once per ``batch_size`` records, and the event loop gets a
+        turn between batches.  Returns the number of records stored.
+        """
+        now = time.time()
+        stored = 0
+        async for key, value in _iterate(records):
+            self._store(key, value, now, enforce=False)
+            stored += 1
+            if stored % batch_size == 0:
+                self._enforce_budget()
+                await asyncio.sleep(0)
+        self._enforce_budget()
+        return stored
+
+    async def import_memories(self, memories: Records, batch_size: int = 1000) -> int:
+        """Bulk-load memories in the ``export_memories`` format.
+
+        Unlike ``store_many`` the exported timestamps and access counts are
+        kept, so a replica hydrated this way matches its source.
+        """
+        stored = 0
+        async for batch in _batches(memories, batch_size):
+            for memory in batch:
+                created = _to_epoch(datetime.fromisoformat(memory["timestamp"]))
+                self._put(memory["key"], memory["content"], created, memory.get("access_count", 0), enforce=False)
+            stored += len(batch)
+            self._enforce_budget()
+            await asyncio.sleep(0)
+        return stored
+
+    def _put(
+        self,
+        key: str,
+        value: str,
+        created: float,
+        access_count: Optional[int] = None,
+        enforce: bool = True,
+        ttl: Optional[float] = None,
+    ) -> None:
+        entry = self._memories.get(key) or self._promote(key)
         if entry:
+            self.footprint_bytes -= sys.getsizeof(entry.content)
             entry.content = value
-            entry.timestamp = datetime.utcnow()
+            entry.created = created
+            self.footprint_bytes += sys.getsizeof(value)
+            if access_count is not None:
+                entry.access_count = access_count
+            if self._policy is not None:
+                self._policy.access(key, entry.access_count)
         else:
-            self._memories[key] = MemoryEntry(content=value, timestamp=datetime.utcnow())
+            key = sys.intern(key)
+            entry = self._memories[key] = MemoryEntry(value, created, access_count or 0)
+            self.footprint_bytes += _entry_size(key, entry)
+            if self._policy is not None:
+                self._policy.insert(key, entry.access_count)
+        self._index.add(key, value)
+        if self._aliases:
+            self._unalias(key)
+        if self._fingerprints is not None:
+            self._fingerprints.add(key, simhash(value))
+        ttl = self.ttl if ttl is None else ttl
+        deadline = None if ttl is None else created + ttl
+        if deadline is not None:
+            self._set_deadline(key, deadline)
+        elif self._expires:
+            self._expires.pop(key, None)
+        if self.storage is not None:
+            self.storage.put(key, value, entry.timestamp.isoformat(), entry.access_count, deadline)
+        self._record("put", key)
+        if enforce:
+            self._enforce_budget(keep=key)
 
     async def retrieve_memory(self, key: str) -> Optional[str]:
-        entry = self._memories.get(key)
+        key = self._aliases.get(key, key)
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.time():
+            self._expire_one(key)
+            return None
+        entry = self._memories.get(key) or self._promote(key)
         if not entry:
             return None
-        entry.access_count += 1
+        self._set_access_count(key, entry, entry.access_count + 1)
         return entry.content
 
+    def _set_access_count(self, key: str, entry: MemoryEntry, access_count: int) -> None:
+        entry.access_count = access_count
+        if self._policy is not None:
+            self._policy.access(key, access_count)
+        if self.storage is not None:
+            self.storage.touch(key, access_count)
+        self._record("access", key)
+
+    @property
+    def evictions(self) -> int:
+        """Memories evicted so far to stay within ``max_bytes``."""
+        return int(self._evictions.value)
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        """Evict until the footprint fits ``max_bytes``, sparing ``keep``."""
+        if self.max_bytes is None:
+            return
+        while self.footprint_bytes > self.max_bytes and len(self._memories) > 1:
+            victim = self._policy.victim()
+            if victim is not None and victim == keep:
+                # The memory just written is the policy's pick (e.g. a fresh
+                # entry under LFU); evict the next candidate instead.
+                self._policy.remove(keep)
+                victim = self._policy.victim()
+                self._policy.insert(keep, self._memories[keep].access_count)
+            if victim is None:
+                break
+            self._remove(victim)
+            self._evictions.inc()
+
+    def _remove(self, key: str) -> None:
+        entry = self._memories.pop(key, None)
+        if entry is not None:
+            self.footprint_bytes -= _entry_size(key, entry)
+            if self._policy is not None:
+                self._policy.remove(key)
+        else:
+            # A memory only present in the shared base.
+            self._hide(key)
+        self._index.remove(key)
+        self._expires.pop(key, None)
+        if self._fingerprints is not None:
+            self._fingerprints.remove(key)
+        for alias in self._aliased.pop(key, ()):
+            del self._aliases[alias]
+        if self.storage is not None:
+            self.storage.delete(key)
+        self._record("delete", key)
+
+    # ---------------------------------------------------------------- expiry
+
+    def _set_deadline(self, key: str, deadline: float) -> None:
+        self._expires[key] = deadline
+        heapq.heappush(self._expiry_heap, (deadline, key))
+
+    def _expire_one(self, key: str) -> int:
+        entry = self._memories.get(key)
+        size = _entry_size(key, entry) if entry is not None else 0
+        self._remove(key)
+        self._expired.inc()
+        self._expired_bytes.inc(size)
+        return size
+
+    def expire(self, now: Optional[float] = None, limit: Optional[int] = None) -> Tuple[int, int]:
+        """Remove up to ``limit`` memories whose TTL has passed.
+
+        Returns the number of memories removed and the estimated bytes
+        reclaimed.
+        """
+        now = time.time() if now is None else now
+        heap = self._expiry_heap
+        removed = reclaimed = 0
+        while heap and heap[0][0] <= now and (limit is None or removed < limit):
+            deadline, key = heapq.heappop(heap)
+            if self._expires.get(key) != deadline:
+                continue  # superseded by a later store or already removed
+            reclaimed += self._expire_one(key)
+            removed += 1
+        return removed, reclaimed
+
+    async def _expiry_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.expiry_interval)
+            try:
+                cycle_bytes = 0
+                while True:
+                    removed, reclaimed = self.expire(limit=self.expiry_slice)
+                    cycle_bytes += reclaimed
+                    if removed < self.expiry_slice:
+                        break
+                    await asyncio.sleep(0)
+                self._last_expiry.set(cycle_bytes)
+                if len(self._expiry_heap) > 2 * len(self._expires) + self.expiry_slice:
+                    # Drop stale heap items left behind by rewritten keys.
+                    self._expiry_heap = [(d, k) for k, d in self._expires.items()]
+                    heapq.heapify(self._expiry_heap)
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.error("Memory expiry failed: %s", exc)
+
+    # ------------------------------------------------------------ change log
+
+    def _record(self, op: str, key: str) -> None:
+        if op != "access":
+            self._content_version += 1
+        self.sequence += 1
+        self._changes.append((self.sequence, op, key, self._merging))
+
+    def changes_since(self, sequence: int, merged: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """Return the changes made after ``sequence``, or ``None`` if truncated.
+
+        Changes are coalesced per key into the memory's current state: a
+        ``put`` with every field, an ``access`` carrying only the new count,
+        an ``alias`` naming the ``target`` a near-duplicate was folded into,
+        or a ``delete``.  ``None`` means the log no longer reaches back to
+        ``sequence`` and a full snapshot is needed.  Without ``merged``, keys
+        whose latest change was merged from a peer are left out.
+        """
+        if sequence >= self.sequence:
+            return []
+        if not self._changes or self._changes[0][0] > sequence + 1:
+            return None
+        latest: Dict[str, Tuple[str, bool]] = {}
+        for _, op, key, peer in islice(self._changes, sequence + 1 - self._changes[0][0], None):
+            previous = latest.get(key)
+            if op == "access" and previous is not None:
+                # An access keeps an earlier put, and a local change stays local.
+                op = "put" if previous[0] == "put" else op
+                peer = peer and previous[1]
+            latest[key] = (op, peer)
+        changes = []
+        for key, (op, peer) in latest.items():
+            if peer and not merged:
+                continue
+            entry = self._memories.get(key)
+            if op == "alias" and key in self._aliases:
+                changes.append({"op": "alias", "key": key, "target": self._aliases[key]})
+            elif entry is None:
+                changes.append({"op": "delete", "key": key})
+            elif op == "access":
+                changes.append({"op": "access", "key": key, "access_count": entry.access_count})
+            else:
+                changes.append(
+                    {
+                        "op": "put",
+                        "key": key,
+                        "content": entry.content,
+                        "timestamp": entry.timestamp.isoformat(),
+                        "access_count": entry.access_count,
+                    }
+                )
+        return changes
+
+    async def apply_changes(
+        self, changes: Iterable[Dict[str, Any]], replace: bool = False, merge: bool = False
+    ) -> None:
+        """Apply records from ``changes_since`` or ``export_memories``.
+
+        Exported memories count as puts.  With ``replace`` the changes are a
+        full snapshot and memories they do not mention are removed.  With
+        ``merge`` they come from a peer writing the same memories: the newer
+        of two puts wins, access counts only grow, and the changes are marked
+        as merged in the change log (see ``changes_since``).
+        """
+        seen = set()
+        self._merging = merge
+        try:
+            for change in changes:
+                key = change["key"]
+                seen.add(key)
+                op = change.get("op", "put")
+                if op == "put":
+                    created = _to_epoch(datetime.fromisoformat(change["timestamp"]))
+                    current = self._peek(key) if merge else None
+                    if current is None or current.created <= created:
+                        self._put(key, change["content"], created, change["access_count"])
+                elif op == "access":
+                    entry = self._memories.get(key) or self._promote(key)
+                    if entry is not None and not (merge and entry.access_count >= change["access_count"]):
+                        self._set_access_count(key, entry, change["access_count"])
+                elif op == "alias":
+                    self._alias(key, change["target"])
+                elif op == "delete" and key in self._aliases:
+                    self._drop_alias(key)
+                elif op == "delete" and self._peek(key) is not None:
+                    self._remove(key)
+        finally:
+            self._merging = False
+        if replace:
+            self.retain(seen)
+
+    def retain(self, keys: Set[str]) -> int:
+        """Remove every memory and alias whose key is not in ``keys``; return how many."""
+        doomed = [key for key in self._keys() if key not in keys]
+        for key in doomed:
+            self._remove(key)
+        stale = [alias for alias in self._aliases if alias not in keys]
+        for alias in stale:
+            self._drop_alias(alias)
+        return len(doomed) + len(stale)
+
+    # ------------------------------------------------------------ shared base
+
+    def freeze(self) -> FrozenSegment:
+        """Pack the current memories into a shareable segment.
+
+        The segment is cached and handed out again until a memory is stored
+        or removed, so spawning several replicas in a row pays for packing
+        only once.  Retrievals do not invalidate it; the access counts it
+        carries are those of the last repack.
+        """
+        version = (self.log_id, self._content_version)
+        if self._frozen is not None:
+            if self._frozen[0] == version:
+                return self._frozen[1]
+            self._frozen[1].release()
+            self._frozen[1].close()
+        segment = FrozenSegment.build(
+            (key, entry.content, entry.created, entry.access_count)
+            for key in self._keys()
+            for entry in (self._peek(key),)
+        )
+        self._frozen = (version, segment)
+        return segment
+
+    def attach_base(self, segment: FrozenSegment) -> None:
+        """Serve ``segment`` as read-only base memories beneath this engine.
+
+        The engine takes over the mapping and closes it on ``close``, so give
+        each engine its own, e.g. ``FrozenSegment.attach(parent.freeze().name)``.
+        """
+        if self._memories or self.base is not None:
+            raise RuntimeError("A base segment can only be attached to an empty engine")
+        self.base = segment
+        self._hidden = set()
+        self._hidden_positions = set()
+        self._hidden_length = 0
+
+    def _base_entry(self, key: str) -> Optional[MemoryEntry]:
+        if self.base is None or key in self._hidden:
+            return None
+        row = self.base.get(key)
+        return MemoryEntry(*row) if row is not None else None
+
+    def _peek(self, key: str) -> Optional[MemoryEntry]:
+        """Return the visible entry for ``key`` without copying it into the overlay."""
+        return self._memories.get(key) or self._base_entry(key)
+
+    def _promote(self, key: str) -> Optional[MemoryEntry]:
+        """Copy a base memory into the overlay before it is modified."""
+        entry = self._base_entry(key)
+        if entry is None:
+            return None
+        key = sys.intern(key)
+        self._hide(key)
+        self._memories[key] = entry
+        self._index.add(key, entry.content)
+        self.footprint_bytes += _entry_size(key, entry)
+        if self._policy is not None:
+            self._policy.insert(key, entry.access_count)
+        self._enforce_budget(keep=key)
+        return entry
+
+    def _keys(self) -> Iterator[str]:
+        yield from list(self._memories)
+        if self.base is not None:
+            for key in self.base.keys():
+                if key not in self._hidden:
+                    yield key
+
+    def _count(self) -> int:
+        base = len(self.base) - len(self._hidden) if self.base is not None else 0
+        return len(self._memories) + base
+
+    def _hide(self, key: str) -> None:
+        """Shadow the base memory ``key`` from reads and searches."""
+        position = self.base.position(key) if self.base is not None and key not in self._hidden else 0
+        if position:
+            self._hidden.add(key)
+            self._hidden_positions.add(position)
+            self._hidden_length += self.base.doc_length(position)
+
+    def _search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        if self.base is None:
+            return self._index.search(query, k)
+        # The base is searched through the postings frozen into its segment,
+        # so attaching it never copies its memories into ``_index``.
+        return self._index.search_layered(query, k, self.base, self._hidden_positions, self._hidden_length)
+
     async def reason(self, text: str) -> str:
+        reply, commit = await self.deliberate(text)
+        await commit()
+        return reply
+
+    async def deliberate(self, text: str) -> Tuple[str, Callable[[], Awaitable[Any]]]:
+        """Work out the reply to ``text`` without changing any memory.
+
+        Returns the reply together with a coroutine function applying the
+        writes ``reason`` makes (learning, storing, counting a recall), so a
+        caller can hold them back until the input has been accepted.
+        """
+        reply, memory, commit = self._deliberate(text)
+        if memory is not None:
+            return reply, lambda: self.store_memory(*memory)
+        return reply, commit
+
+    def _deliberate(
+        self, text: str
+    ) -> Tuple[str, Optional[Tuple[str, str]], Optional[Callable[[], Awaitable[Any]]]]:
+        """Return the reply, the ``(key, content)`` to store if ``text`` is new, and any other write."""
         lowered = text.lower()
         for key, val in self.rules.items():
             if key in lowered:
-                await self.learn(text)
-                return f"Reasoned: {val}"
-        mem = await self.retrieve_memory(lowered)
-        if mem:
-            return f"I recall you said: {mem}"
-        await self.store_memory(lowered, text)
-        return f"Reasoned: {lowered}"
+                return f"Reasoned: {val}", None, lambda: self.learn(text)
+        recalled = self._lookup(lowered)
+        if recalled is None:
+            recalled = self._recall(lowered)
+        if recalled is not None:
+            key, entry = recalled
+            return f"I recall you said: {entry.content}", None, lambda: self.retrieve_memory(key)
+        return f"Reasoned: {lowered}", (lowered, text), None
+
+    def _lookup(self, key: str) -> Optional[Tuple[str, MemoryEntry]]:
+        """Resolve ``key`` like ``retrieve_memory`` but without counting the access."""
+        key = self._aliases.get(key, key)
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.time():
+            return None
+        entry = self._peek(key)
+        return (key, entry) if entry is not None else None
+
+    def _recall(self, text: str) -> Optional[Tuple[str, MemoryEntry]]:
+        best = self._live_hits(text, 1)
+        if not best:
+            return None
+        recalled = self._lookup(best[0][0])
+        if recalled is None:
+            return None
+        key, entry = recalled
+        # Base memories are not in ``_index``; their content is passed along.
+        return recalled if self._index.coverage(text, key, entry.content) >= self.recall_threshold else None
+
+    def _live_hits(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Return the best ``k`` BM25 hits, skipping memories already past their TTL."""
+        now = time.time()
+        wanted = k
+        while True:
+            hits = self._search(query, wanted)
+            live = [(key, score) for key, score in hits if self._expires.get(key, now + 1) > now]
+            if len(live) >= k or len(hits) < wanted:
+                return live[:k]
+            # Expired memories not collected yet fill the top; look further.
+            wanted *= 2
+
+    async def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Return up to ``k`` memories ranked by BM25 relevance to ``query``."""
+        return [
+            {"key": key, "content": self._peek(key).content, "score": score}
+            for key, score in self._live_hits(query, k)
+        ]
+
+    async def reason_many(self, texts: List[str]) -> List[str]:
+        """Reason over a batch of texts.
+
+        Inputs are handled in order so a repeat later in the batch recalls the
+        memory stored by an earlier one, as successive ``reason`` calls would.
+        New memories go through one ``store_many`` call, so the byte budget
+        is enforced per batch rather than per input.
+        """
+        replies: List[str] = []
+
+        async def new_memories() -> AsyncIterator[Tuple[str, str]]:
+            for text in texts:
+                reply, memory, commit = self._deliberate(text)
+                replies.append(reply)
+                if memory is not None:
+                    yield memory
+                else:
+                    await commit()
+
+        await self.store_many(new_memories())
+        return replies
 
     async def learn(self, item: str) -> bool:
         try:
@@ -69,20 +786,68 @@ class BrainEngine:
             return False
 
     async def memory_count(self) -> int:
-        return len(self._memories)
+        return self._count()
 
     async def close(self) -> None:
+        if self._expiry_task is not None:
+            self._expiry_task.cancel()
+            await asyncio.gather(self._expiry_task, return_exceptions=True)
+            self._expiry_task = None
+        if self.storage is not None:
+            await self.storage.close()
         self._memories.clear()
+        self._index.clear()
+        self._expires.clear()
+        self._expiry_heap = []
+        self._aliases.clear()
+        self._aliased.clear()
+        if self._fingerprints is not None:
+            self._fingerprints.clear()
+        if self.base is not None:
+            self.base.close()
+            self.base = None
+        self._hidden = set()
+        self._hidden_positions = set()
+        self._hidden_length = 0
+        if self._frozen is not None:
+            self._frozen[1].release()
+            self._frozen[1].close()
+            self._frozen = None
+        self._changes.clear()
+        self.log_id = uuid.uuid4().hex
+        if self._policy is not None:
+            self._policy = make_policy(self._policy.name)
+        self.footprint_bytes = 0
+
+    async def stream_memories(self, batch_size: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield serialisable memories in batches of at most ``batch_size``.
+
+        The keys are listed up front, which costs one reference per memory;
+        beyond that only one batch of memory dicts exists at a time, however
+        large the memories are.  Memories removed while the export runs are
+        skipped; updated ones are exported as they are when their batch is
+        built.
+        """
+        keys = list(self._keys())
+        for start in range(0, len(keys), batch_size):
+            batch = []
+            for key in keys[start : start + batch_size]:
+                entry = self._peek(key)
+                if entry is not None:
+                    batch.append(
+                        {
+                            "key": key,
+                            "content": entry.content,
+                            "timestamp": entry.timestamp.isoformat(),
+                            "access_count": entry.access_count,
+                        }
+                    )
+            if batch:
+                yield batch
+            # Let other tasks run between batches of a large export.
+            await asyncio.sleep(0)
 
     async def export_memories(self) -> List[Dict[str, Any]]:
         """Return a serialisable snapshot of stored memories."""
 
-        return [
-            {
-                "key": key,
-                "content": entry.content,
-                "timestamp": entry.timestamp.isoformat(),
-                "access_count": entry.access_count,
-            }
-            for key, entry in self._memories.items()
-        ]
+        return [memory async for batch in self.stream_memories() for memory in batch]
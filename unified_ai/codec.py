@@ -0,0 +1,131 @@
+"""Wire codecs for payloads carried over the optical channel.
+
+:class:`ReprCodec` keeps the historical ``str(data)`` format.  :class:`FrameCodec`
+emits length-prefixed binary frames::
+
+    magic "UA" | version u8 | flags u8 | schema u8 | length u32 | body
+
+Bodies above ``compress_threshold`` bytes are compressed when that makes them
+smaller.  Decoding works on ``bytes`` or ``memoryview`` and slices the input
+without copying it.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Any, Iterator, Union
+
+try:  # pragma: no cover - optional dependency
+    import lz4.frame as lz4_frame
+except ModuleNotFoundError:  # pragma: no cover - lz4 is optional
+    lz4_frame = None
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+MAGIC = b"UA"
+VERSION = 1
+HEADER = struct.Struct("!2sBBBI")
+
+SCHEMA_TEXT = 0
+SCHEMA_JSON = 1
+SCHEMA_BYTES = 2
+
+FLAG_ZLIB = 0x01
+FLAG_LZ4 = 0x02
+
+
+class CodecError(ValueError):
+    """Raised when a frame cannot be decoded."""
+
+
+class ReprCodec:
+    """Legacy codec publishing ``str(data)``."""
+
+    binary = False
+
+    def encode(self, data: Any) -> str:
+        return str(data)
+
+    def decode(self, payload: Any) -> Any:
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            return str(payload, "utf-8")
+        return payload
+
+
+class FrameCodec:
+    """Binary frame codec with optional zlib or lz4 compression."""
+
+    binary = True
+
+    def __init__(self, compress_threshold: int = 512, compression: str = "zlib", level: int = 1) -> None:
+        if compression not in {"zlib", "lz4", "none"}:
+            raise ValueError(f"Unknown compression '{compression}'")
+        if compression == "lz4" and lz4_frame is None:
+            raise ValueError("lz4 compression requested but the lz4 package is not installed")
+        self.compress_threshold = compress_threshold
+        self.compression = compression
+        self.level = level
+
+    def encode(self, data: Any) -> bytes:
+        if isinstance(data, str):
+            schema, body = SCHEMA_TEXT, data.encode("utf-8")
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            schema, body = SCHEMA_BYTES, bytes(data)
+        else:
+            schema = SCHEMA_JSON
+            body = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+        flags = 0
+        if self.compression != "none" and len(body) > self.compress_threshold:
+            if self.compression == "lz4":
+                packed, flag = lz4_frame.compress(body), FLAG_LZ4
+            else:
+                packed, flag = zlib.compress(body, self.level), FLAG_ZLIB
+            if len(packed) < len(body):
+                body, flags = packed, flag
+        return HEADER.pack(MAGIC, VERSION, flags, schema, len(body)) + body
+
+    def decode(self, payload: Any) -> Any:
+        """Decode one frame; payloads without the frame magic pass through."""
+        if isinstance(payload, str):
+            return payload
+        view = memoryview(payload)
+        if len(view) < HEADER.size or view[:2] != MAGIC:
+            return str(view, "utf-8")
+        value, _ = self._decode_at(view, 0)
+        return value
+
+    def iter_decode(self, payload: Buffer) -> Iterator[Any]:
+        """Yield every frame packed back to back in ``payload``."""
+        view = memoryview(payload)
+        offset = 0
+        while offset < len(view):
+            value, offset = self._decode_at(view, offset)
+            yield value
+
+    def _decode_at(self, view: memoryview, offset: int) -> tuple[Any, int]:
+        try:
+            magic, version, flags, schema, length = HEADER.unpack_from(view, offset)
+        except struct.error as exc:
+            raise CodecError("Truncated frame header") from exc
+        if magic != MAGIC or version != VERSION:
+            raise CodecError(f"Unsupported frame (magic={magic!r}, version={version})")
+        start = offset + HEADER.size
+        end = start + length
+        if end > len(view):
+            raise CodecError("Truncated frame body")
+        body: Buffer = view[start:end]
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        elif flags & FLAG_LZ4:
+            if lz4_frame is None:
+                raise CodecError("Frame is lz4 compressed but lz4 is not installed")
+            body = lz4_frame.decompress(body)
+        if schema == SCHEMA_TEXT:
+            return str(body, "utf-8"), end
+        if schema == SCHEMA_JSON:
+            return json.loads(str(body, "utf-8")), end
+        if schema == SCHEMA_BYTES:
+            return bytes(body), end
+        raise CodecError(f"Unknown schema {schema}")
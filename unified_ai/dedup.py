@@ -0,0 +1,139 @@
+"""SimHash fingerprints and a banded LSH index for near-duplicate memories."""
+
+from __future__ import annotations
+
+import hashlib
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+
+from .search import tokenize
+
+FINGERPRINT_BITS = 64
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+# Bits flipped per band when probing.  Each flip multiplies the share of the
+# index a query inspects (17 probes of 65536 buckets per band at radius 1),
+# so wider radii would make lookups linear in practice.
+MAX_PROBE_RADIUS = 1
+
+# Words that carry no meaning for deciding whether two inputs are the same.
+FILLER_WORDS = frozenset(
+    {"a", "an", "the", "um", "uh", "er", "like", "just", "so", "well", "really", "actually", "basically", "please"}
+)
+
+
+def _token_hash(token: str) -> Tuple[int, int]:
+    """Return the token's 64 fingerprint bits and its vote weight."""
+    digest = hashlib.blake2b(token.encode(), digest_size=10).digest()
+    return int.from_bytes(digest[:8], "big"), 1 + int.from_bytes(digest[8:], "big")
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of ``text`` ignoring case, punctuation and filler words.
+
+    Returns ``None`` when nothing but filler is left, since such inputs
+    would all share the same empty fingerprint.
+    """
+    weights = [0] * FINGERPRINT_BITS
+    tokens = 0
+    for token in tokenize(text):
+        if token in FILLER_WORDS:
+            continue
+        tokens += 1
+        # Unequal weights make tied votes, which would all round to 0 and
+        # crowd fingerprints into a few LSH buckets, vanishingly rare.
+        value, weight = _token_hash(token)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+    if not tokens:
+        return None
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class SimHashIndex:
+    """Find fingerprints within ``max_distance`` bits of a query.
+
+    Fingerprints are split into ``BANDS`` fixed 16-bit bands.  By the
+    pigeonhole principle two fingerprints differing in at most
+    ``max_distance`` bits differ in at most ``max_distance // BANDS`` bits of
+    some band, so a query probes every bucket within that many bit flips of
+    each of its bands and compares only the keys found there.  Buckets stay
+    small however large the index grows, keeping lookups O(1) expected;
+    distances needing more than ``MAX_PROBE_RADIUS`` flips are rejected.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        radius = max_distance // BANDS
+        if max_distance < 0 or radius > MAX_PROBE_RADIUS:
+            raise ValueError(f"max_distance must be between 0 and {BANDS * (MAX_PROBE_RADIUS + 1) - 1}")
+        self.max_distance = max_distance
+        self._probes: List[int] = [
+            sum(1 << bit for bit in flipped)
+            for flips in range(radius + 1)
+            for flipped in combinations(range(BAND_BITS), flips)
+        ]
+        self._tables: List[Dict[int, Set[str]]] = [{} for _ in range(BANDS)]
+        self._fingerprints: Dict[str, int] = {}
+
+    @classmethod
+    def for_similarity(cls, threshold: float) -> "SimHashIndex":
+        """Index matching fingerprints that agree on at least ``threshold`` of their bits.
+
+        Thresholds below about 0.89 would need too many probes and raise
+        ``ValueError``.
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("Similarity threshold must be in (0, 1]")
+        return cls(round((1.0 - threshold) * FINGERPRINT_BITS))
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    @staticmethod
+    def _bands(fingerprint: int) -> List[int]:
+        mask = (1 << BAND_BITS) - 1
+        return [fingerprint >> (band * BAND_BITS) & mask for band in range(BANDS)]
+
+    def add(self, key: str, fingerprint: Optional[int]) -> None:
+        """Index ``key`` under ``fingerprint``; ``None`` only forgets ``key``."""
+        self.remove(key)
+        if fingerprint is None:
+            return
+        self._fingerprints[key] = fingerprint
+        for table, band in zip(self._tables, self._bands(fingerprint)):
+            table.setdefault(band, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for table, band in zip(self._tables, self._bands(fingerprint)):
+            bucket = table[band]
+            bucket.discard(key)
+            if not bucket:
+                del table[band]
+
+    def find(self, fingerprint: Optional[int]) -> Optional[str]:
+        """Return the closest indexed key within ``max_distance``, if any."""
+        if fingerprint is None:
+            return None
+        best: Optional[str] = None
+        best_distance = self.max_distance + 1
+        for table, band in zip(self._tables, self._bands(fingerprint)):
+            for probe in self._probes:
+                for key in table.get(band ^ probe, ()):
+                    distance = (self._fingerprints[key] ^ fingerprint).bit_count()
+                    if distance < best_distance:
+                        best, best_distance = key, distance
+                        if distance == 0:
+                            return best
+        return best
+
+    def clear(self) -> None:
+        self._fingerprints.clear()
+        for table in self._tables:
+            table.clear()
@@ -0,0 +1,164 @@
+"""Eviction policies for the bounded :class:`~unified_ai.brain.BrainEngine` store.
+
+Every policy tracks keys only and supports O(1) ``insert``, ``access`` and
+``remove``.  ``victim`` names the key to evict next without removing it, in
+O(1) except where :class:`LFUPolicy` notes otherwise.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class LRUPolicy:
+    """Evict the least recently stored or retrieved memory."""
+
+    name = "lru"
+
+    def __init__(self) -> None:
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def insert(self, key: str, access_count: int = 0) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def access(self, key: str, access_count: int) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        return next(iter(self._order), None)
+
+
+class LFUPolicy:
+    """Evict the memory with the lowest ``access_count``, oldest first on ties.
+
+    Keys are kept in per-count buckets, so moving a key between them is
+    O(1).  The lowest count is tracked in O(1) across the one-step bumps made
+    by ``retrieve_memory``; when the last key at the lowest count is removed
+    or jumps further (counts restored by ``apply_changes`` or an import),
+    the next ``victim`` call rescans the distinct counts.
+    """
+
+    name = "lfu"
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        # Lowest count in use, or None when it has to be recomputed.
+        self._min: Optional[int] = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _place(self, key: str, count: int) -> None:
+        self._counts[key] = count
+        self._buckets.setdefault(count, OrderedDict())[key] = None
+        if len(self._counts) == 1 or (self._min is not None and count < self._min):
+            self._min = count
+
+    def _unplace(self, key: str) -> Optional[int]:
+        count = self._counts.pop(key, None)
+        if count is None:
+            return None
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+        return count
+
+    def insert(self, key: str, access_count: int = 0) -> None:
+        self._unplace(key)
+        self._place(key, access_count)
+
+    def access(self, key: str, access_count: int) -> None:
+        previous = self._unplace(key)
+        if previous is None:
+            return
+        if previous == self._min and previous not in self._buckets:
+            # After a one-step bump the key is still the least used; after a
+            # larger jump another bucket may now be the lowest.
+            self._min = access_count if access_count == previous + 1 else None
+        self._place(key, access_count)
+
+    def remove(self, key: str) -> None:
+        self._unplace(key)
+
+    def victim(self) -> Optional[str]:
+        if not self._counts:
+            return None
+        if self._min is None or self._min not in self._buckets:
+            self._min = min(self._buckets)
+        return next(iter(self._buckets[self._min]))
+
+
+class HybridPolicy:
+    """Segmented LRU balancing recency and frequency.
+
+    New memories enter a probationary segment and move to a protected one once
+    they have been retrieved ``promote_after`` times.  The protected segment
+    holds at most ``protected_ratio`` of all keys; overflow decays back to the
+    most recent end of probation, so entries that stop being used lose their
+    protection.  Victims come from probation first.
+    """
+
+    name = "hybrid"
+
+    def __init__(self, promote_after: int = 2, protected_ratio: float = 0.8) -> None:
+        self.promote_after = promote_after
+        self.protected_ratio = protected_ratio
+        self._probation: "OrderedDict[str, None]" = OrderedDict()
+        self._protected: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._probation) + len(self._protected)
+
+    def insert(self, key: str, access_count: int = 0) -> None:
+        self.remove(key)
+        if access_count >= self.promote_after:
+            self._protect(key)
+        else:
+            self._probation[key] = None
+
+    def access(self, key: str, access_count: int) -> None:
+        if key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            if access_count >= self.promote_after:
+                del self._probation[key]
+                self._protect(key)
+            else:
+                self._probation.move_to_end(key)
+
+    def _protect(self, key: str) -> None:
+        self._protected[key] = None
+        limit = max(1, int(len(self) * self.protected_ratio))
+        while len(self._protected) > limit:
+            demoted, _ = self._protected.popitem(last=False)
+            self._probation[demoted] = None
+
+    def remove(self, key: str) -> None:
+        self._probation.pop(key, None)
+        self._protected.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        if self._probation:
+            return next(iter(self._probation))
+        return next(iter(self._protected), None)
+
+
+POLICIES = {policy.name: policy for policy in (LRUPolicy, LFUPolicy, HybridPolicy)}
+
+
+def make_policy(name: str):
+    try:
+        return POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown eviction policy '{name}'") from None
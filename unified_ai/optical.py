@@ -1,21 +1,69 @@
 import logging
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Iterable, Optional
 
 try:  # pragma: no cover - optional dependency
     import redis.asyncio as redis
 except ModuleNotFoundError:  # pragma: no cover - used in tests
     from . import _redis_stub as redis
 
+from .codec import ReprCodec
+from .metrics import MetricsRegistry
 from .network_features import NetworkFeatureManager
+from .publish_buffer import PublishBuffer
 
 
 class OpticalEngine:
     """High-speed data processing and communication via Redis."""
 
-    def __init__(self, redis_client: redis.Redis, feature_manager: NetworkFeatureManager) -> None:
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        feature_manager: NetworkFeatureManager,
+        metrics: Optional[MetricsRegistry] = None,
+        codec: Any = None,
+    ) -> None:
         self.redis = redis_client
+        self.codec = codec or ReprCodec()
         self.features = feature_manager
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.metrics = metrics or MetricsRegistry()
+        self._publishes = self.metrics.counter(
+            "unified_ai_redis_publishes_total", "Messages published to Redis"
+        )
+        self._publish_errors = self.metrics.counter(
+            "unified_ai_redis_publish_errors_total", "Failed Redis publishes"
+        )
+        self.buffer: Optional[PublishBuffer] = None
+        self.stream_targets: dict[str, Optional[int]] = {}
+
+    def use_stream(self, target: str, maxlen: Optional[int] = None) -> None:
+        """Deliver messages for ``target`` with XADD instead of PUBLISH.
+
+        Stream entries persist until consumed, so nothing is lost while no
+        listener is connected.  ``maxlen`` caps the stream length.
+        """
+        self.stream_targets[target] = maxlen
+
+    def enable_write_behind(
+        self,
+        max_batch: int = 64,
+        flush_interval: float = 0.005,
+        max_queue: int = 10000,
+        block: bool = True,
+    ) -> None:
+        """Coalesce publishes through a :class:`PublishBuffer`.
+
+        ``transfer_data`` then returns as soon as the message is queued, taking
+        the Redis round trip off the caller's critical path.
+        """
+        self.buffer = PublishBuffer(
+            self.redis,
+            max_batch=max_batch,
+            flush_interval=flush_interval,
+            max_queue=max_queue,
+            block=block,
+            metrics=self.metrics,
+        )
 
     async def initialize(self) -> None:
         """Enable important networking features."""
@@ -32,22 +80,59 @@ class OpticalEngine:
         try:
             if "smart_packet_shaping" in self.features.enabled:
                 self.logger.debug("Applying smart packet shaping")
-            await self.redis.publish(target, str(data))
+            if target in self.stream_targets:
+                await self.redis.xadd(target, {"data": self.codec.encode(data)}, maxlen=self.stream_targets[target])
+            elif self.buffer is not None:
+                return await self.buffer.put(target, self.codec.encode(data))
+            else:
+                await self.redis.publish(target, self.codec.encode(data))
+            self._publishes.inc()
             return True
         except Exception as exc:
+            self._publish_errors.inc()
             self.logger.error("Publish failed: %s", exc)
             return False
 
-    async def subscribe(self, channel: str) -> AsyncGenerator[str, None]:
+    async def transfer_many(self, items: Iterable[tuple[Any, str]]) -> bool:
+        """Publish many ``(data, target)`` pairs through one Redis pipeline."""
+        try:
+            if "smart_packet_shaping" in self.features.enabled:
+                self.logger.debug("Applying smart packet shaping")
+            if self.buffer is not None:
+                results = [await self.transfer_data(data, target) for data, target in items]
+                return all(results)
+            pipe = self.redis.pipeline(transaction=False)
+            sent = 0
+            for data, target in items:
+                if target in self.stream_targets:
+                    pipe.xadd(target, {"data": self.codec.encode(data)}, maxlen=self.stream_targets[target])
+                else:
+                    pipe.publish(target, self.codec.encode(data))
+                sent += 1
+            await pipe.execute()
+            self._publishes.inc(sent)
+            return True
+        except Exception as exc:
+            self._publish_errors.inc()
+            self.logger.error("Pipelined publish failed: %s", exc)
+            return False
+
+    async def close(self) -> None:
+        """Flush any buffered publishes."""
+        if self.buffer is not None:
+            await self.buffer.close()
+
+    async def subscribe(self, channel: str) -> AsyncGenerator[Any, None]:
+        """Yield messages from ``channel`` decoded with the engine's codec."""
         pubsub = self.redis.pubsub()
         await pubsub.subscribe(channel)
         try:
             async for item in pubsub.listen():
                 if item.get("type") == "message":
-                    yield item.get("data")
+                    yield self.codec.decode(item.get("data"))
         finally:
             await pubsub.unsubscribe(channel)
 
-    async def process_message(self, message: str) -> None:
+    async def process_message(self, message: Any) -> None:
         """Placeholder for future message handling."""
         self.logger.info("Received message: %s", message)
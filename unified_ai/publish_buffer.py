@@ -0,0 +1,120 @@
+"""Write-behind buffer that coalesces Redis publishes into pipelines."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+from .metrics import MetricsRegistry
+
+
+class PublishBuffer:
+    """Queue publishes and flush them through a Redis pipeline.
+
+    A flush happens once ``max_batch`` messages are waiting or
+    ``flush_interval`` seconds after the first message of a batch arrived,
+    whichever comes first.  The queue holds at most ``max_queue`` messages;
+    when it is full ``put`` waits for room (counted as *delayed*) or, with
+    ``block=False``, drops the message (counted as *dropped*).
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        max_batch: int = 64,
+        flush_interval: float = 0.005,
+        max_queue: int = 10000,
+        block: bool = True,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.redis = redis_client
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.block = block
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._queue: asyncio.Queue[Tuple[str, Any]] = asyncio.Queue(max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: List[Tuple[str, Any]] = []
+        metrics = metrics or MetricsRegistry()
+        self._publishes = metrics.counter("unified_ai_redis_publishes_total", "Messages published to Redis")
+        self._errors = metrics.counter("unified_ai_redis_publish_errors_total", "Failed Redis publishes")
+        self._flushes = metrics.counter("unified_ai_publish_buffer_flushes_total", "Pipelined buffer flushes")
+        self._delayed = metrics.counter(
+            "unified_ai_publish_buffer_delayed_total", "Publishes that waited for room in a full buffer"
+        )
+        self._dropped = metrics.counter(
+            "unified_ai_publish_buffer_dropped_total", "Publishes dropped because the buffer was full or a flush failed"
+        )
+        metrics.gauge(
+            "unified_ai_publish_buffer_depth", "Messages waiting in the publish buffer", callback=self._queue.qsize
+        )
+
+    async def put(self, channel: str, data: Any) -> bool:
+        """Queue ``data`` for ``channel``; return ``False`` if it was dropped."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        try:
+            self._queue.put_nowait((channel, data))
+        except asyncio.QueueFull:
+            if not self.block:
+                self._dropped.inc()
+                return False
+            self._delayed.inc()
+            await self._queue.put((channel, data))
+        return True
+
+    async def flush(self) -> None:
+        """Publish everything currently buffered."""
+        while not self._queue.empty():
+            batch: List[Tuple[str, Any]] = []
+            self._drain(batch)
+            await self._flush(batch)
+
+    async def close(self) -> None:
+        """Stop the background flusher and publish what is left.
+
+        A batch interrupted mid-flush is sent again, so shutdown delivery is
+        at least once.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._inflight:
+            batch, self._inflight = self._inflight, []
+            await self._flush(batch)
+        await self.flush()
+
+    def _drain(self, batch: List[Tuple[str, Any]]) -> None:
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _run(self) -> None:
+        while True:
+            self._inflight = batch = [await self._queue.get()]
+            self._drain(batch)
+            if len(batch) < self.max_batch:
+                await asyncio.sleep(self.flush_interval)
+                self._drain(batch)
+            await self._flush(batch)
+            self._inflight = []
+
+    async def _flush(self, batch: List[Tuple[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for channel, data in batch:
+                pipe.publish(channel, data)
+            await pipe.execute()
+        except Exception as exc:
+            self._errors.inc()
+            self._dropped.inc(len(batch))
+            self.logger.error("Buffered publish of %d messages failed: %s", len(batch), exc)
+            return
+        self._flushes.inc()
+        self._publishes.inc(len(batch))
@@ -4,50 +4,277 @@ import argparse
 import asyncio
 import json
 import base64
-from typing import Any, Optional
+import logging
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - pure Python fallback
+    np = None
+
+from .segment import FrozenSegment
+
+# Marks the compressed, bulk-XORed format.  Legacy payloads are base64 text,
+# whose alphabet has no ``:``, so the two can never be confused.
+SECURE_MAGIC = b"SR2"
+SECURE_PREFIX = "SR2:"
+# Replicas acknowledge sync messages on the sync channel plus this suffix.
+ACK_SUFFIX = ":ack"
+_CHUNK = 1 << 20
+
+
+def _xor(data: bytes, key: bytes) -> bytes:
+    """XOR ``data`` with ``key`` repeated, a whole chunk at a time."""
+    if not data:
+        return data
+    if np is not None:
+        stream = np.resize(np.frombuffer(key, dtype=np.uint8), len(data))
+        return np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), stream).tobytes()
+    # Chunks are a multiple of the key length so the keystream stays aligned.
+    chunk = max(1, _CHUNK // len(key)) * len(key)
+    keystream = key * (chunk // len(key))
+    full = int.from_bytes(keystream, "big")
+    out = []
+    for start in range(0, len(data), chunk):
+        piece = data[start : start + chunk]
+        stream = full if len(piece) == chunk else int.from_bytes(keystream[: len(piece)], "big")
+        out.append((int.from_bytes(piece, "big") ^ stream).to_bytes(len(piece), "big"))
+    return b"".join(out)
+
+
+def _alias_changes(aliases: Dict[str, str]) -> List[Dict[str, str]]:
+    return [{"op": "alias", "key": alias, "target": target} for alias, target in aliases.items()]
 
 
 class SystemReplicator:
     """Create duplicates of a running :class:`UnifiedAI` instance."""
 
-    def __init__(self, engine: "UnifiedAI", token: str = "replica", encryption_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        engine: "UnifiedAI",
+        token: str = "replica",
+        encryption_key: Optional[str] = None,
+        snapshot_batch: int = 1000,
+    ) -> None:
         self.engine = engine
         self.token = token
         self.key = encryption_key.encode() if encryption_key else None
+        self.snapshot_batch = snapshot_batch
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # Replica channel -> (brain log id, last acknowledged sequence).
+        self._acked: Dict[str, Tuple[str, int]] = {}
+        # Position of the primary's change log this engine has applied.
+        self._applied: Optional[Tuple[str, int]] = None
+        # Position and keys of a snapshot whose parts are still arriving.
+        self._incoming: Optional[Tuple[Tuple[str, int], Set[str]]] = None
+
+    async def _send_snapshot(self, url: str) -> bool:
+        """Publish the memories and enabled features to ``url`` as a snapshot.
+
+        The snapshot is split into parts of at most ``snapshot_batch``
+        memories, numbered from 0 with the last one marked ``final``, so only
+        one batch is held and serialised at a time.
+        """
+        brain = self.engine.brain
+        header = {
+            "type": "snapshot",
+            "log_id": brain.log_id,
+            "seq": brain.sequence,
+            "features": list(self.engine.feature_manager.enabled),
+        }
+        batches = brain.stream_memories(self.snapshot_batch)
+        memories = await anext(batches, [])
+        part = 0
+        sent = True
+        while True:
+            following = await anext(batches, None)
+            message = {**header, "part": part, "final": following is None, "memories": memories}
+            if following is None:
+                message["aliases"] = brain.aliases()
+            sent = await self.engine.optical.transfer_data(self._secure(message), url) and sent
+            if following is None:
+                return bool(sent)
+            memories, part = following, part + 1
 
-    async def _snapshot(self) -> dict[str, Any]:
-        """Collect BrainEngine memories and enabled features."""
-        memories = await self.engine.brain.export_memories()
-        return {"memories": memories, "features": list(self.engine.feature_manager.enabled)}
+    def _secure(self, data: Any) -> Union[str, bytes]:
+        """Wrap ``data`` with the token and, given a key, encrypt it.
 
-    def _secure(self, data: Any) -> str:
+        Encrypted payloads are zlib-compressed, XORed with the key and tagged
+        with ``SECURE_MAGIC``.  They are sent as raw bytes when the optical
+        codec is binary, and as ``SECURE_PREFIX`` plus base64 otherwise.
+        """
         payload = json.dumps({"token": self.token, "data": data})
         if not self.key:
             return payload
-        encoded = payload.encode()
-        key = self.key
-        xored = bytes(b ^ key[i % len(key)] for i, b in enumerate(encoded))
-        return base64.b64encode(xored).decode()
+        sealed = _xor(zlib.compress(payload.encode(), 1), self.key)
+        if getattr(self.engine.optical.codec, "binary", False):
+            return SECURE_MAGIC + sealed
+        return SECURE_PREFIX + base64.b64encode(sealed).decode()
+
+    def _unsecure(self, blob: Union[str, bytes]) -> Any:
+        """Reverse :meth:`_secure`, also accepting the legacy base64 format."""
+        if isinstance(blob, str) and blob.lstrip().startswith("{"):
+            payload = blob.encode()
+        elif not self.key:
+            raise ValueError("Encrypted replication payload but no key configured")
+        elif isinstance(blob, bytes) and blob.startswith(SECURE_MAGIC):
+            payload = zlib.decompress(_xor(blob[len(SECURE_MAGIC):], self.key))
+        elif isinstance(blob, str) and blob.startswith(SECURE_PREFIX):
+            payload = zlib.decompress(_xor(base64.b64decode(blob[len(SECURE_PREFIX):]), self.key))
+        else:
+            payload = _xor(base64.b64decode(blob), self.key)
+        message = json.loads(payload)
+        if message.get("token") != self.token:
+            raise ValueError("Invalid replication token")
+        return message["data"]
+
+    async def duplicate_local(self, shared: bool = False) -> "UnifiedAI":
+        """Spawn a copy of the engine within the current process.
 
-    async def duplicate_local(self) -> "UnifiedAI":
-        """Spawn a copy of the engine within the current process."""
+        With ``shared`` the copy reads the parent's memories from a frozen
+        segment (see :meth:`BrainEngine.freeze`) instead of copying them, and
+        keeps only its own changes.
+        """
         from . import UnifiedAI
 
-        snapshot = await self._snapshot()
         duplicate = UnifiedAI(self.engine.redis_url)
         await duplicate.connect()
         await duplicate.initialize()
-        for feat in snapshot["features"]:
+        for feat in list(self.engine.feature_manager.enabled):
             duplicate.feature_manager.enable(feat)
-        for mem in snapshot["memories"]:
-            await duplicate.brain.store_memory(mem["key"], mem["content"])
+        if shared:
+            duplicate.brain.attach_base(FrozenSegment.attach(self.engine.brain.freeze().name))
+        else:
+            # Stream batches straight into a bulk load instead of
+            # materialising a full snapshot or awaiting each memory.
+            memories = (mem async for batch in self.engine.brain.stream_memories() for mem in batch)
+            await duplicate.brain.import_memories(memories)
+        await duplicate.brain.apply_changes(_alias_changes(self.engine.brain.aliases()))
         await self.engine.optical.transfer_data(self._secure({"status": "spawned"}), f"sync:{self.token}")
         return duplicate
 
     async def duplicate_remote(self, url: str) -> bool:
         """Send a snapshot to a remote listener via the OpticalEngine."""
-        snapshot = await self._snapshot()
-        return await self.engine.optical.transfer_data(self._secure(snapshot), url)
+        return await self._send_snapshot(url)
+
+    async def sync_remote(self, url: str) -> bool:
+        """Bring the replica listening on ``url`` up to date.
+
+        Only the memory changes since the replica's last acknowledged
+        sequence number are sent.  A full snapshot goes out instead when the
+        replica is new, the brain has restarted or its change log no longer
+        reaches back that far.  A successful publish is not an
+        acknowledgement: the position only advances once the replica's ack
+        arrives (see :meth:`listen_acks`), so a lost message is resent.
+        """
+        brain = self.engine.brain
+        acked = self._acked.get(url)
+        changes = brain.changes_since(acked[1]) if acked and acked[0] == brain.log_id else None
+        if changes is None:
+            return await self._send_snapshot(url)
+        message = {
+            "type": "delta",
+            "since": acked[1],
+            "changes": changes,
+            "features": list(self.engine.feature_manager.enabled),
+            "log_id": brain.log_id,
+            "seq": brain.sequence,
+        }
+        return await self.engine.optical.transfer_data(self._secure(message), url)
+
+    def acknowledge(self, url: str, log_id: Optional[str], sequence: Optional[int]) -> None:
+        """Record that the replica on ``url`` has applied up to ``sequence``.
+
+        Acks never move the position backwards.  An ack without a
+        ``log_id`` means the replica refused a delta, so the next sync sends
+        a snapshot.
+        """
+        if log_id is None:
+            self._acked.pop(url, None)
+            return
+        acked = self._acked.get(url)
+        if acked is None or acked[0] != log_id or sequence > acked[1]:
+            self._acked[url] = (log_id, sequence)
+
+    async def listen_acks(self, url: str) -> None:
+        """Record the acknowledgements the replica on ``url`` sends back."""
+        async for blob in self.engine.optical.subscribe(url + ACK_SUFFIX):
+            try:
+                ack = self._unsecure(blob)
+            except ValueError as exc:
+                self.logger.warning("Ignoring replication ack: %s", exc)
+                continue
+            self.acknowledge(url, ack["log_id"], ack["seq"])
+
+    async def apply_sync(self, message: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Apply a ``sync_remote`` message to this replicator's engine.
+
+        Returns the ack to send back: the primary's log position now applied
+        here, or ``log_id`` ``None`` when a delta does not start at or before
+        that position, or a snapshot part arrives out of order, and a
+        snapshot is needed instead.  Snapshot parts before the final one are
+        applied as they come but return ``None``: nothing is acknowledged
+        until the whole snapshot is in.
+        """
+        position = (message["log_id"], message["seq"])
+        if message["type"] == "snapshot":
+            return await self._apply_snapshot_part(message, position)
+        if message["type"] == "delta":
+            applied = self._applied
+            if applied is None or applied[0] != message["log_id"] or message["since"] > applied[1]:
+                self.logger.warning("Refusing replication delta that does not follow %s", applied)
+                return {"log_id": None, "seq": None}
+            if message["seq"] <= applied[1]:
+                # Already covered by a later message.
+                return {"log_id": applied[0], "seq": applied[1]}
+        self._enable_features(message)
+        # Deltas carry each key's state as of ``seq``, so one starting
+        # before the applied position still moves the replica forward.
+        await self.engine.brain.apply_changes(message["changes"])
+        self._applied = position
+        return {"log_id": position[0], "seq": position[1]}
+
+    async def _apply_snapshot_part(
+        self, message: dict[str, Any], position: Tuple[str, int]
+    ) -> Optional[dict[str, Any]]:
+        part = message.get("part", 0)
+        if part == 0:
+            self._incoming = (position, set())
+        elif self._incoming is None or self._incoming[0] != position:
+            self.logger.warning("Refusing snapshot part %s without the parts before it", part)
+            self._incoming = None
+            return {"log_id": None, "seq": None}
+        self._enable_features(message)
+        keys = self._incoming[1]
+        keys.update(memory["key"] for memory in message["memories"])
+        await self.engine.brain.apply_changes(message["memories"])
+        if not message.get("final", True):
+            return None
+        self._incoming = None
+        aliases = message.get("aliases", {})
+        keys.update(aliases)
+        await self.engine.brain.apply_changes(_alias_changes(aliases))
+        # Memories the snapshot did not mention are gone on the primary.
+        self.engine.brain.retain(keys)
+        self._applied = position
+        return {"log_id": position[0], "seq": position[1]}
+
+    def _enable_features(self, message: dict[str, Any]) -> None:
+        for feat in message.get("features", []):
+            if feat not in self.engine.feature_manager.enabled:
+                self.engine.feature_manager.enable(feat)
+
+    async def serve_sync(self, url: str) -> None:
+        """Apply ``sync_remote`` messages arriving on ``url`` and acknowledge them."""
+        async for blob in self.engine.optical.subscribe(url):
+            try:
+                ack = await self.apply_sync(self._unsecure(blob))
+            except ValueError as exc:
+                self.logger.warning("Ignoring replication message: %s", exc)
+                continue
+            if ack is not None:
+                await self.engine.optical.transfer_data(self._secure(ack), url + ACK_SUFFIX)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -55,6 +282,7 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--remote", help="Remote host channel")
     parser.add_argument("--token", default="replica", help="Authentication token")
     parser.add_argument("--key", help="Optional encryption key")
+    parser.add_argument("--shared", action="store_true", help="Share memories with a local copy instead of copying them")
     return parser.parse_args()
 
 
@@ -71,7 +299,7 @@ def main() -> None:
         if args.remote:
             await replicator.duplicate_remote(args.remote)
         else:
-            await replicator.duplicate_local()
+            await replicator.duplicate_local(shared=args.shared)
 
     asyncio.run(run())
 
@@ -0,0 +1,159 @@
+"""Incrementally maintained inverted index with BM25 ranking."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over a mutable set of documents.
+
+    Each term maps to a postings dict of ``{key: term_frequency}``, so adding
+    or removing a document touches only its own terms and a query only scores
+    documents sharing at least one term with it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._docs: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._docs
+
+    def add(self, key: str, text: str) -> None:
+        """Index ``text`` under ``key``, replacing any previous version."""
+        if key in self._docs:
+            self.remove(key)
+        tokens = tokenize(text)
+        freqs: Dict[str, int] = {}
+        for token in tokens:
+            freqs[token] = freqs.get(token, 0) + 1
+        for term, tf in freqs.items():
+            self._postings.setdefault(term, {})[key] = tf
+        self._docs[key] = freqs
+        self._lengths[key] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, key: str) -> None:
+        freqs = self._docs.pop(key, None)
+        if freqs is None:
+            return
+        for term in freqs:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(key)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._docs.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._docs) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to ``k`` ``(key, score)`` pairs, best first.
+
+        Terms are scored rarest first.  Once ``k`` candidates are known and
+        the remaining terms could not lift an unseen document above the
+        current ``k``-th score even at their maximum contribution, those terms
+        only refine existing candidates instead of walking their (long)
+        postings lists.
+        """
+        if not self._docs or k <= 0:
+            return []
+        avg_length = self._total_length / len(self._docs) or 1.0
+        k1, b = self.k1, self.b
+        lengths = self._lengths
+        terms = sorted(
+            ((self.idf(term), self._postings[term]) for term in set(tokenize(query)) if term in self._postings),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        # Upper bound on what the terms from position i onwards can add.
+        remaining = [0.0] * (len(terms) + 1)
+        for i in range(len(terms) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + terms[i][0] * (k1 + 1)
+
+        scores: Dict[str, float] = {}
+        pruned = False
+        for i, (idf, postings) in enumerate(terms):
+            if not pruned and len(scores) >= k:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+                pruned = remaining[i] <= threshold
+            if pruned:
+                if len(scores) < len(postings):
+                    matches = [(key, postings[key]) for key in scores if key in postings]
+                else:
+                    matches = [(key, tf) for key, tf in postings.items() if key in scores]
+            else:
+                matches = postings.items()
+            for key, tf in matches:
+                norm = k1 * (1 - b + b * lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def search_layered(
+        self, query: str, k: int, base: Any, hidden: Set[int], hidden_length: int
+    ) -> List[Tuple[str, float]]:
+        """Search this index together with the postings of a frozen ``base`` segment.
+
+        Base memories whose record offsets are in ``hidden`` (shadowed by
+        this index or removed) are skipped; ``hidden_length`` is their total
+        token count.  Document frequencies and the average length cover both
+        layers, so scores match a single index holding every visible memory.
+        """
+        docs = len(self._docs) + len(base) - len(hidden)
+        if docs <= 0 or k <= 0:
+            return []
+        avg_length = (self._total_length + base.total_length - hidden_length) / docs or 1.0
+        k1, b = self.k1, self.b
+        # Overlay documents are scored by key, base ones by record offset.
+        scores: Dict[Any, float] = {}
+        for term in set(tokenize(query)):
+            overlay = self._postings.get(term, {})
+            base_hits = [hit for hit in base.postings(term) if hit[0] not in hidden]
+            df = len(overlay) + len(base_hits)
+            if not df:
+                continue
+            idf = math.log(1 + (docs - df + 0.5) / (df + 0.5))
+            hits = [(key, tf, self._lengths[key]) for key, tf in overlay.items()] + base_hits
+            for doc, tf, length in hits:
+                norm = k1 * (1 - b + b * length / avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(base.key_at(doc) if isinstance(doc, int) else doc, score) for doc, score in best]
+
+    def coverage(self, query: str, key: str, text: Optional[str] = None) -> float:
+        """Share of distinct terms the query and document ``key`` have in common.
+
+        Measured against whichever side has more distinct terms, so a short
+        query does not fully match a long document or vice versa.  ``text``
+        stands in for a document that is not in the index.
+        """
+        terms = set(tokenize(query))
+        doc = self._docs.get(key) or (set(tokenize(text)) if text is not None else {})
+        if not terms or not doc:
+            return 0.0
+        shared = sum(1 for term in terms if term in doc)
+        return shared / max(len(terms), len(doc))
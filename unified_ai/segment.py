@@ -0,0 +1,242 @@
+"""Frozen, shareable snapshots of :class:`~unified_ai.brain.BrainEngine` memories.
+
+A :class:`FrozenSegment` packs memories into one
+``multiprocessing.shared_memory`` block laid out as::
+
+    header    magic "UASG", version, record count, table size, total token
+              count, term count, term table size, term table offset
+    table     open-addressing hash table of record offsets (0 = empty slot)
+    records   key length, content length, timestamp, access count, token
+              count, key, content
+    terms     open-addressing hash table of term entry offsets
+    postings  per term: term length, posting count, term, then one
+              (record offset, term frequency) pair per memory containing it
+
+Lookups probe the tables in place, so the segment is never unpacked into
+Python objects; the postings let a BM25 search score the segment's
+memories without indexing them again (see :meth:`BM25Index.search_layered`).  Any number of engines, in this process or in others, can
+read one segment through their own :meth:`FrozenSegment.attach` mapping while
+keeping their own writes in a private overlay.  The segment lives until its
+owner calls :meth:`FrozenSegment.release`; every mapping is unmapped with
+:meth:`FrozenSegment.close`.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .search import tokenize
+
+SegmentRow = Tuple[str, str, float, int]
+
+MAGIC = b"UASG"
+VERSION = 2
+_HEADER = struct.Struct("<4sBIIQIIQ")
+_SLOT = struct.Struct("<Q")
+_RECORD = struct.Struct("<IIdII")
+_TERM = struct.Struct("<II")
+_POSTING = struct.Struct("<QI")
+
+
+def _table_size(count: int) -> int:
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def _hash_table(size: int, entries: Iterable[Tuple[int, int]]) -> List[int]:
+    table = [0] * size
+    mask = size - 1
+    for digest, position in entries:
+        slot = digest & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = position
+    return table
+
+
+class FrozenSegment:
+    """Read-only memory snapshot with an on-segment hash index."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False) -> None:
+        self._shm = shm
+        self._buf = shm.buf
+        self.owner = owner
+        try:
+            header = _HEADER.unpack_from(self._buf, 0)
+        except struct.error:
+            header = (None, None)
+        if header[:2] != (MAGIC, VERSION):
+            raise ValueError(f"{shm.name} is not a memory segment")
+        _magic, _version, self._count, self._slots, self.total_length, self.terms, term_slots, self._term_table = header
+        self._mask = self._slots - 1
+        self._term_mask = term_slots - 1
+        self._records = _HEADER.size + self._slots * _SLOT.size
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    @classmethod
+    def build(cls, rows: Iterable[SegmentRow]) -> "FrozenSegment":
+        """Pack ``(key, content, timestamp, access_count)`` rows into a new segment."""
+        records = []
+        slots = []
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        offset = 0
+        total_length = 0
+        for key, content, created, count in rows:
+            key_bytes = key.encode()
+            content_bytes = content.encode()
+            tokens = tokenize(content)
+            freqs: Dict[str, int] = {}
+            for token in tokens:
+                freqs[token] = freqs.get(token, 0) + 1
+            for term, tf in freqs.items():
+                postings.setdefault(term, []).append((offset, tf))
+            total_length += len(tokens)
+            records.append(_RECORD.pack(len(key_bytes), len(content_bytes), created, count, len(tokens)))
+            records.append(key_bytes)
+            records.append(content_bytes)
+            slots.append((zlib.crc32(key_bytes), offset))
+            offset += _RECORD.size + len(key_bytes) + len(content_bytes)
+        table_size = _table_size(len(slots))
+        start = _HEADER.size + table_size * _SLOT.size
+        # Record offsets are stored as absolute positions, never 0 since the
+        # header comes first.
+        table = _hash_table(table_size, ((digest, start + rel) for digest, rel in slots))
+
+        term_size = _table_size(len(postings))
+        term_table = start + offset
+        entries = []
+        entry_slots = []
+        position = term_table + term_size * _SLOT.size
+        for term, hits in postings.items():
+            term_bytes = term.encode()
+            entry_slots.append((zlib.crc32(term_bytes), position))
+            entries.append(_TERM.pack(len(term_bytes), len(hits)))
+            entries.append(term_bytes)
+            entries.append(b"".join(_POSTING.pack(start + rel, tf) for rel, tf in hits))
+            position += _TERM.size + len(term_bytes) + len(hits) * _POSTING.size
+        terms = _hash_table(term_size, entry_slots)
+
+        shm = shared_memory.SharedMemory(create=True, size=position)
+        _HEADER.pack_into(
+            shm.buf, 0, MAGIC, VERSION, len(slots), table_size, total_length, len(postings), term_size, term_table
+        )
+        shm.buf[_HEADER.size:start] = struct.pack(f"<{table_size}Q", *table)
+        shm.buf[start:term_table] = b"".join(records)
+        shm.buf[term_table : term_table + term_size * _SLOT.size] = struct.pack(f"<{term_size}Q", *terms)
+        shm.buf[term_table + term_size * _SLOT.size : position] = b"".join(entries)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FrozenSegment":
+        """Map an existing segment, built here or in another process."""
+        shm = shared_memory.SharedMemory(name=name)
+        # Attaching registers the segment with this process's resource
+        # tracker, which would unlink it from under the owner on exit.
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _find(self, key: str) -> int:
+        key_bytes = key.encode()
+        buf = self._buf
+        slot = zlib.crc32(key_bytes) & self._mask
+        while True:
+            (position,) = _SLOT.unpack_from(buf, _HEADER.size + slot * _SLOT.size)
+            if not position:
+                return 0
+            key_len = _RECORD.unpack_from(buf, position)[0]
+            start = position + _RECORD.size
+            if buf[start : start + key_len] == key_bytes:
+                return position
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self._find(key))
+
+    def position(self, key: str) -> int:
+        """Return the offset of ``key``'s record, or 0 if it is not in the segment."""
+        return self._find(key)
+
+    def get(self, key: str) -> Optional[Tuple[str, float, int]]:
+        """Return ``(content, timestamp, access_count)`` for ``key``."""
+        position = self._find(key)
+        if not position:
+            return None
+        key_len, content_len, created, count, _length = _RECORD.unpack_from(self._buf, position)
+        start = position + _RECORD.size + key_len
+        return bytes(self._buf[start : start + content_len]).decode(), created, count
+
+    def key_at(self, position: int) -> str:
+        key_len = _RECORD.unpack_from(self._buf, position)[0]
+        start = position + _RECORD.size
+        return bytes(self._buf[start : start + key_len]).decode()
+
+    def doc_length(self, position: int) -> int:
+        """Number of tokens in the content of the record at ``position``."""
+        return _RECORD.unpack_from(self._buf, position)[4]
+
+    def postings(self, term: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield ``(record offset, term frequency, token count)`` for memories containing ``term``."""
+        term_bytes = term.encode()
+        buf = self._buf
+        slot = zlib.crc32(term_bytes) & self._term_mask
+        while True:
+            (position,) = _SLOT.unpack_from(buf, self._term_table + slot * _SLOT.size)
+            if not position:
+                return
+            term_len, hits = _TERM.unpack_from(buf, position)
+            start = position + _TERM.size
+            if buf[start : start + term_len] == term_bytes:
+                break
+            slot = (slot + 1) & self._term_mask
+        for posting in range(start + term_len, start + term_len + hits * _POSTING.size, _POSTING.size):
+            record, tf = _POSTING.unpack_from(buf, posting)
+            yield record, tf, _RECORD.unpack_from(buf, record)[4]
+
+    def rows(self) -> Iterator[SegmentRow]:
+        buf = self._buf
+        position = self._records
+        for _ in range(self._count):
+            key_len, content_len, created, count, _length = _RECORD.unpack_from(buf, position)
+            position += _RECORD.size
+            key = bytes(buf[position : position + key_len]).decode()
+            position += key_len
+            content = bytes(buf[position : position + content_len]).decode()
+            position += content_len
+            yield key, content, created, count
+
+    def keys(self) -> Iterator[str]:
+        for key, _content, _created, _count in self.rows():
+            yield key
+
+    def release(self) -> None:
+        """Drop the segment's name once the owner no longer needs to share it.
+
+        Readers that already hold it keep working until they let go of it.
+        """
+        if self.owner:
+            self.owner = False
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        """Unmap the segment from this process; it is unusable afterwards."""
+        if self._buf is not None:
+            self._buf = None
+            self._shm.close()
@@ -0,0 +1,139 @@
+"""Single-flight coalescing of identical concurrent requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import MetricsRegistry
+
+
+def normalize_query(text: str) -> str:
+    """Canonical form used to decide whether two queries are identical."""
+    return unicodedata.normalize("NFC", text)
+
+
+class SingleFlight:
+    """Share one in-flight computation between callers with the same key.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs, or up to ``window`` seconds after it finished successfully, receive
+    the same result.  The shared work runs in its own task, so a caller
+    cancelling its request does not cancel it for the others.  Failures are
+    never reused after the computation ends.
+    """
+
+    def __init__(
+        self,
+        window: float = 0.0,
+        metrics: Optional[MetricsRegistry] = None,
+        normalize: Callable[[str], str] = normalize_query,
+    ) -> None:
+        self.window = window
+        self.normalize = normalize
+        self._inflight: Dict[str, Tuple[asyncio.Task, float]] = {}
+        self._recent: Dict[str, Tuple[float, Any, float]] = {}
+        metrics = metrics or MetricsRegistry()
+        self._hits = metrics.counter("unified_ai_singleflight_hits_total", "Requests served by a shared computation")
+        self._misses = metrics.counter("unified_ai_singleflight_misses_total", "Requests that started a computation")
+        self._saved = metrics.counter(
+            "unified_ai_singleflight_saved_seconds_total", "Latency avoided by sharing a computation"
+        )
+        metrics.gauge(
+            "unified_ai_singleflight_hit_ratio", "Share of requests served by a shared computation", callback=self.hit_rate
+        )
+
+    def hit_rate(self) -> float:
+        total = self._hits.value + self._misses.value
+        return self._hits.value / total if total else 0.0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        key = self.normalize(key)
+        now = time.perf_counter()
+        recent = self._recent.get(key)
+        if recent is not None:
+            expires, result, duration = recent
+            if now < expires:
+                self._hits.inc()
+                self._saved.inc(duration)
+                return result
+            del self._recent[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self._misses.inc()
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = (task, now)
+            task.add_done_callback(lambda done: self._finish(key, done, now))
+            return await asyncio.shield(task)
+
+        task, started = inflight
+        self._hits.inc()
+        result = await asyncio.shield(task)
+        # The caller only waited for the part of the computation still left.
+        self._saved.inc(now - started)
+        return result
+
+    async def do_many(self, keys: Sequence[str], func: Callable[[List[str]], Awaitable[List[Any]]]) -> List[Any]:
+        """Batch form of :meth:`do`, returning one result per key in order.
+
+        Keys with a computation in flight or finished within the window reuse
+        it, as do repeats within ``keys``.  The remaining keys are computed by
+        a single ``func`` call given their first spelling, which returns their
+        results in the same order; concurrent :meth:`do` callers share them.
+        """
+        now = time.perf_counter()
+        normalized = [self.normalize(key) for key in keys]
+        results: Dict[str, Any] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        missing: Dict[str, str] = {}
+        for key, original in zip(normalized, keys):
+            if key in results or key in tasks or key in missing:
+                self._hits.inc()
+                continue
+            recent = self._recent.get(key)
+            if recent is not None and now < recent[0]:
+                self._hits.inc()
+                self._saved.inc(recent[2])
+                results[key] = recent[1]
+                continue
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self._hits.inc()
+                self._saved.inc(now - inflight[1])
+                tasks[key] = inflight[0]
+                continue
+            self._misses.inc()
+            missing[key] = original
+        if missing:
+            batch = asyncio.ensure_future(func(list(missing.values())))
+            for index, key in enumerate(missing):
+                task = asyncio.ensure_future(_pick(batch, index))
+                self._inflight[key] = (task, now)
+                task.add_done_callback(lambda done, key=key: self._finish(key, done, now))
+                tasks[key] = task
+        if tasks:
+            shared = await asyncio.shield(asyncio.gather(*tasks.values()))
+            results.update(zip(tasks, shared))
+        return [results[key] for key in normalized]
+
+    def _finish(self, key: str, task: asyncio.Task, started: float) -> None:
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self.window > 0:
+            finished = time.perf_counter()
+            self._recent[key] = (finished + self.window, task.result(), finished - started)
+            asyncio.get_running_loop().call_later(self.window, self._expire, key, finished + self.window)
+
+    def _expire(self, key: str, expires: float) -> None:
+        entry = self._recent.get(key)
+        if entry is not None and entry[0] == expires:
+            del self._recent[key]
+
+
+async def _pick(batch: "asyncio.Future[List[Any]]", index: int) -> Any:
+    return (await asyncio.shield(batch))[index]
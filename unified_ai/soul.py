@@ -1,4 +1,5 @@
 import logging
+from typing import List, Sequence
 
 try:  # pragma: no cover - optional dependency
     from transformers import pipeline
@@ -30,10 +31,25 @@ class SoulEngine:
             except Exception as exc:  # pragma: no cover - defensive
                 self.logger.error("Emotion analysis failed: %s", exc)
                 return "neutral"
-        signals = analyse_text(text)
-        if signals.score > 0:
+        return self._label_from_score(analyse_text(text).score)
+
+    async def analyze_emotions(self, texts: Sequence[str]) -> List[str]:
+        """Return emotion labels for a batch of texts in a single pass."""
+        if not texts:
+            return []
+        if self.classifier:
+            try:
+                return [result["label"].lower() for result in self.classifier(list(texts))]
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.error("Batch emotion analysis failed: %s", exc)
+                return ["neutral"] * len(texts)
+        return [self._label_from_score(analyse_text(text).score) for text in texts]
+
+    @staticmethod
+    def _label_from_score(score: int) -> str:
+        if score > 0:
             return "positive"
-        if signals.score < 0:
+        if score < 0:
             return "negative"
         return "neutral"
 
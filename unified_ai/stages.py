@@ -0,0 +1,101 @@
+"""Small dependency-graph executor for the interaction pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+StageObserver = Callable[[str, float], None]
+
+
+class StageAborted(Exception):
+    """Raised when a guard stage returns a falsy result."""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"Stage '{stage}' rejected the input")
+        self.stage = stage
+
+
+@dataclass
+class Stage:
+    name: str
+    func: StageFunc
+    deps: Tuple[str, ...] = ()
+    guard: bool = False
+
+
+@dataclass
+class StageGraph:
+    """Run stages as soon as their dependencies finish.
+
+    Stages without a dependency between them run concurrently.  A *guard*
+    stage aborts the whole graph when it returns a falsy value: every other
+    stage still pending or in flight is cancelled and :class:`StageAborted` is
+    raised.  Stages that merely run alongside a guard are therefore
+    speculative.  Wall time of each stage is recorded in ``timings`` and
+    reported to ``observer`` when one is given.
+    """
+
+    observer: Optional[StageObserver] = None
+    stages: Dict[str, Stage] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, name: str, func: StageFunc, *deps: str, guard: bool = False) -> "StageGraph":
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Unknown dependency '{dep}' for stage '{name}'")
+        self.stages[name] = Stage(name, func, deps, guard)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def execute(stage: Stage) -> Any:
+            for dep in stage.deps:
+                await tasks[dep]
+            started = time.perf_counter()
+            result = await stage.func(results)
+            elapsed = time.perf_counter() - started
+            self.timings[stage.name] = elapsed
+            if self.observer is not None:
+                self.observer(stage.name, elapsed)
+            if stage.guard and not result:
+                # Cancel before yielding so speculative stages that have not
+                # been scheduled yet never start.
+                for name, task in tasks.items():
+                    if name != stage.name:
+                        task.cancel()
+                raise StageAborted(stage.name)
+            results[stage.name] = result
+            return result
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.create_task(execute(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return results
+
+    def critical_path(self) -> List[str]:
+        """Return the chain of stages with the largest cumulative wall time."""
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for stage in self.stages.values():
+            if stage.name not in self.timings:
+                continue
+            upstream = max(
+                (best[dep] for dep in stage.deps if dep in best),
+                key=lambda item: item[0],
+                default=(0.0, []),
+            )
+            best[stage.name] = (upstream[0] + self.timings[stage.name], upstream[1] + [stage.name])
+        if not best:
+            return []
+        return max(best.values(), key=lambda item: item[0])[1]
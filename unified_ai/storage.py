@@ -0,0 +1,281 @@
+"""Durable append-only storage for :class:`~unified_ai.brain.BrainEngine`.
+
+State lives in two kinds of files next to ``path``:
+
+``<path>.snapshot``
+    A compacted image of every memory, headed by the log generation it
+    covers.
+``<path>.log.<gen>``
+    Records appended since that snapshot, one JSON array per line:
+    ``["p", key, content, timestamp, access_count]`` for a put, with the
+    expiry deadline in epoch seconds appended for a memory that has one,
+    ``["a", key, access_count]`` for an access-count update,
+    ``["l", alias, key]`` for a key folded into another memory as a
+    near-duplicate and ``["d", key]`` for a removal, which also drops the
+    aliases of ``key``.
+
+Every record is an absolute overwrite, so replaying a record twice is
+harmless.  Appends are buffered in memory and written plus fsynced by a
+background task once per ``commit_interval``; the file I/O runs in a worker
+thread so the event loop never waits on the disk.  Once ``snapshot_every``
+records have accumulated the log is rotated and a new snapshot written.
+Loading memory-maps the snapshot and the remaining logs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+EntryFactory = Callable[[str, str, int], Any]
+SnapshotRow = Tuple[str, str, str, int, Optional[float]]
+SnapshotSource = Callable[[], Callable[[], Iterable[SnapshotRow]]]
+AliasSource = Callable[[], Dict[str, str]]
+
+
+class AppendOnlyStorage:
+    """Append-only log with periodic compacted snapshots."""
+
+    def __init__(self, path: str, commit_interval: float = 0.05, snapshot_every: int = 100_000) -> None:
+        self.path = Path(path)
+        self.commit_interval = commit_interval
+        self.snapshot_every = snapshot_every
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.generation = 0
+        self.records_since_snapshot = 0
+        self._pending: List[str] = []
+        self._touched: Dict[str, int] = {}
+        self._log: Optional[Any] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot_source: Optional[SnapshotSource] = None
+        self._alias_source: Optional[AliasSource] = None
+
+    # ------------------------------------------------------------------ files
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".snapshot")
+
+    def log_path(self, generation: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.log.{generation}")
+
+    def _log_generations(self) -> List[int]:
+        prefix = self.path.name + ".log."
+        gens = []
+        for candidate in self.path.parent.glob(prefix + "*"):
+            suffix = candidate.name[len(prefix):]
+            if suffix.isdigit():
+                gens.append(int(suffix))
+        return sorted(gens)
+
+    # ---------------------------------------------------------------- loading
+
+    def load(self, make_entry: EntryFactory) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, str]]:
+        """Rebuild the stored memories; ``make_entry(content, timestamp, count)``.
+
+        Returns the memories, the expiry deadlines of those stored with one
+        and the alias to canonical key map.  Blocking; call it through
+        ``asyncio.to_thread`` from async code.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        state = _Replay(make_entry)
+        snapshot_gen = 0
+        if self.snapshot_path.exists():
+            lines = _mapped_lines(self.snapshot_path)
+            header = next(lines, None)
+            if header is not None:
+                snapshot_gen = json.loads(header)["generation"]
+                self._replay(lines, state, self.snapshot_path)
+        replayed = 0
+        for gen in self._log_generations():
+            if gen < snapshot_gen:
+                continue
+            path = self.log_path(gen)
+            replayed += self._replay(_mapped_lines(path), state, path)
+        # Append to a fresh log so nothing lands behind a torn tail record.
+        self.generation = max([snapshot_gen] + self._log_generations()) + 1
+        self.records_since_snapshot = replayed
+        return state.memories, state.deadlines, state.aliases
+
+    def _replay(self, lines: Iterator[bytes], state: "_Replay", source: Path) -> int:
+        count = 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn write at the tail of the log after a crash.
+                self.logger.warning("Ignoring truncated record in %s", source)
+                break
+            state.apply(record)
+            count += 1
+        return count
+
+    # ---------------------------------------------------------------- writing
+
+    def start(self, snapshot_source: SnapshotSource, alias_source: Optional[AliasSource] = None) -> None:
+        """Begin group commits.
+
+        ``snapshot_source`` is called on the event loop when compacting and
+        returns a function producing ``(key, content, timestamp, count,
+        expires)`` rows, ``expires`` being ``None`` for memories that never
+        expire; that function runs in a worker thread.  ``alias_source``
+        returns a copy of the alias to canonical key map.
+        """
+        self._snapshot_source = snapshot_source
+        self._alias_source = alias_source
+        self._log = open(self.log_path(self.generation), "a", encoding="utf-8")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def put(self, key: str, content: str, timestamp: str, access_count: int, expires: Optional[float] = None) -> None:
+        self._touched.pop(key, None)
+        self._append(_put_record(key, content, timestamp, access_count, expires))
+
+    def alias(self, alias: str, key: str) -> None:
+        self._append(["l", alias, key])
+
+    def touch(self, key: str, access_count: int) -> None:
+        # Only the latest count per commit interval is written.
+        self._touched[key] = access_count
+
+    def delete(self, key: str) -> None:
+        self._touched.pop(key, None)
+        self._append(["d", key])
+
+    def _append(self, record: list) -> None:
+        self._pending.append(json.dumps(record, separators=(",", ":")))
+
+    async def sync(self) -> None:
+        """Write and fsync everything appended so far."""
+        async with self._lock:
+            if self._touched:
+                for key, count in self._touched.items():
+                    self._append(["a", key, count])
+                self._touched = {}
+            if not self._pending or self._log is None:
+                return
+            lines, self._pending = self._pending, []
+            self.records_since_snapshot += len(lines)
+            await asyncio.to_thread(_write_lines, self._log, lines)
+
+    async def compact(self) -> None:
+        """Rotate the log and write a snapshot covering everything before it."""
+        if self._snapshot_source is None or self._log is None:
+            return
+        await self.sync()
+        async with self._lock:
+            covered = self.generation
+            self._log.close()
+            self.generation += 1
+            self._log = open(self.log_path(self.generation), "a", encoding="utf-8")
+            self.records_since_snapshot = 0
+            rows = self._snapshot_source()
+            aliases = self._alias_source() if self._alias_source is not None else {}
+            await asyncio.to_thread(self._write_snapshot, rows, aliases, covered)
+
+    def _write_snapshot(
+        self, rows: Callable[[], Iterable[SnapshotRow]], aliases: Dict[str, str], covered: int
+    ) -> None:
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"generation": covered + 1}) + "\n")
+            for row in rows():
+                fh.write(json.dumps(_put_record(*row), separators=(",", ":")) + "\n")
+            for alias, key in aliases.items():
+                fh.write(json.dumps(["l", alias, key], separators=(",", ":")) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.snapshot_path)
+        for gen in self._log_generations():
+            if gen <= covered:
+                self.log_path(gen).unlink(missing_ok=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.commit_interval)
+            try:
+                await self.sync()
+                if self.records_since_snapshot >= self.snapshot_every:
+                    await self.compact()
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.error("Group commit failed: %s", exc)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.sync()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+class _Replay:
+    """State rebuilt while replaying the snapshot and logs."""
+
+    def __init__(self, make_entry: EntryFactory) -> None:
+        self.make_entry = make_entry
+        self.memories: Dict[str, Any] = {}
+        self.deadlines: Dict[str, float] = {}
+        self.aliases: Dict[str, str] = {}
+        # Canonical key -> its aliases, to drop them when it is removed.
+        self.aliased: Dict[str, Set[str]] = {}
+
+    def apply(self, record: list) -> None:
+        op, key = record[0], record[1]
+        if op == "p":
+            self._unalias(key)
+            self.memories[key] = self.make_entry(record[2], record[3], record[4])
+            if len(record) > 5:
+                self.deadlines[key] = record[5]
+            else:
+                self.deadlines.pop(key, None)
+        elif op == "a":
+            entry = self.memories.get(key)
+            if entry is not None:
+                entry.access_count = record[2]
+        elif op == "l":
+            self._unalias(key)
+            self.aliases[key] = record[2]
+            self.aliased.setdefault(record[2], set()).add(key)
+        elif op == "d":
+            self._unalias(key)
+            self.memories.pop(key, None)
+            self.deadlines.pop(key, None)
+            for alias in self.aliased.pop(key, ()):
+                del self.aliases[alias]
+
+    def _unalias(self, key: str) -> None:
+        target = self.aliases.pop(key, None)
+        if target is not None:
+            self.aliased[target].discard(key)
+
+
+def _put_record(key: str, content: str, timestamp: str, access_count: int, expires: Optional[float]) -> list:
+    record = ["p", key, content, timestamp, access_count]
+    if expires is not None:
+        record.append(expires)
+    return record
+
+
+def _write_lines(fh: Any, lines: List[str]) -> None:
+    fh.write("\n".join(lines) + "\n")
+    fh.flush()
+    os.fsync(fh.fileno())
+
+
+def _mapped_lines(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b""):
+                if line.strip():
+                    yield line
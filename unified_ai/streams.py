@@ -0,0 +1,125 @@
+"""Redis Streams consumer-group transport for the engine listener."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Any, Awaitable, Callable, Optional, Set
+
+from .codec import ReprCodec
+
+MessageHandler = Callable[[Any], Awaitable[None]]
+
+
+def default_consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class StreamConsumer:
+    """Share a stream between worker processes with XREADGROUP/XACK.
+
+    Each worker joins ``group`` under its own ``consumer`` name and handles up
+    to ``concurrency`` messages at once.  A message is acknowledged only after
+    ``handler`` returns, so work held by a crashed worker stays pending and is
+    reclaimed with XAUTOCLAIM once it has been idle for ``claim_idle_ms``.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        stream: str,
+        group: str,
+        handler: MessageHandler,
+        consumer: Optional[str] = None,
+        concurrency: int = 16,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 30000,
+        claim_interval: float = 5.0,
+        codec: Any = None,
+    ) -> None:
+        self.redis = redis_client
+        self.stream = stream
+        self.group = group
+        self.handler = handler
+        self.consumer = consumer or default_consumer_name()
+        self.concurrency = concurrency
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self.codec = codec or ReprCodec()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def ensure_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def run(self) -> None:
+        await self.ensure_group()
+        loop = asyncio.get_running_loop()
+        next_claim = loop.time()
+        try:
+            while True:
+                if loop.time() >= next_claim:
+                    await self.reclaim()
+                    next_claim = loop.time() + self.claim_interval
+                free = self.concurrency - len(self._inflight)
+                if free <= 0:
+                    await asyncio.wait(self._inflight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                response = await self.redis.xreadgroup(
+                    self.group, self.consumer, {self.stream: ">"}, count=free, block=self.block_ms
+                )
+                for _stream, entries in response or []:
+                    for entry_id, fields in entries:
+                        await self._dispatch(entry_id, fields)
+        finally:
+            for task in self._inflight:
+                task.cancel()
+
+    async def reclaim(self) -> int:
+        """Take over messages left pending by consumers that went away."""
+        start = "0-0"
+        claimed = 0
+        while True:
+            response = await self.redis.xautoclaim(
+                self.stream, self.group, self.consumer, self.claim_idle_ms, start_id=start, count=self.concurrency
+            )
+            start, entries = response[0], response[1]
+            for entry_id, fields in entries:
+                if fields:
+                    await self._dispatch(entry_id, fields)
+                    claimed += 1
+                else:
+                    # The entry was trimmed from the stream; nothing left to do.
+                    await self.redis.xack(self.stream, self.group, entry_id)
+            if start in ("0-0", b"0-0") or not entries:
+                break
+        if claimed:
+            self.logger.info("Reclaimed %d pending messages on %s", claimed, self.stream)
+        return claimed
+
+    async def _dispatch(self, entry_id: Any, fields: dict) -> None:
+        await self._slots.acquire()
+        task = asyncio.create_task(self._handle(entry_id, fields))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _handle(self, entry_id: Any, fields: dict) -> None:
+        try:
+            data = fields.get("data", fields.get(b"data"))
+            await self.handler(self.codec.decode(data))
+            await self.redis.xack(self.stream, self.group, entry_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Left unacknowledged so it is retried after ``claim_idle_ms``.
+            self.logger.error("Handling stream entry %s failed: %s", entry_id, exc)
+        finally:
+            self._slots.release()
@@ -3,22 +3,33 @@ import asyncio
 import base64
 import json
 import logging
+import os
+import re
 import sqlite3
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Optional, Dict, List
+from typing import Any, AsyncGenerator, AsyncIterable, Iterable, Optional, Dict, List, Union
 from textblob import TextBlob
 import tkinter as tk
 from tkinter import scrolledtext
-from datetime import datetime
+from datetime import datetime, timezone
+from urllib.parse import quote
 
 try:
     import redis.asyncio as redis
 except ImportError:
     redis = None
+try:
+    import aiosqlite
+except ImportError:
+    aiosqlite = None
 try:
     from transformers import pipeline
 except ImportError:
     pipeline = None
+try:
+    from .metrics import MetricsRegistry
+except ImportError:  # run as a script from this directory
+    from metrics import MetricsRegistry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -123,51 +134,409 @@ class AuraEngine:
         return True
 
 # BrainEngine
+async def _batches(records: Union[Iterable[Any], AsyncIterable[Any]], size: int) -> AsyncGenerator[List[Any], None]:
+    batch: List[Any] = []
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    else:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+# Statement text is kept constant so sqlite's statement cache reuses the
+# prepared statements.
+UPSERT_MEMORY = (
+    "INSERT INTO memories (key, content, timestamp, access_count) VALUES (?, ?, datetime('now'), 0) "
+    "ON CONFLICT(key) DO UPDATE SET content = excluded.content, timestamp = excluded.timestamp"
+)
+ADD_ACCESS = "UPDATE memories SET access_count = access_count + ? WHERE key = ?"
+# Timestamps are stored as sqlite's UTC "YYYY-MM-DD HH:MM:SS" so they sort
+# correctly; imported ISO strings are converted, unparseable ones kept as is.
+IMPORT_MEMORY = (
+    "INSERT INTO memories (key, content, timestamp, access_count) VALUES (?1, ?2, COALESCE(datetime(?3), ?3), ?4) "
+    "ON CONFLICT(key) DO UPDATE SET content = excluded.content, timestamp = excluded.timestamp, "
+    "access_count = excluded.access_count"
+)
+
+# Schema changes, applied in order; a database's PRAGMA user_version records
+# how many it has.  Append new steps here, never edit released ones.  Every
+# statement tolerates databases created before versioning existed.
+MIGRATIONS: List[List[str]] = [
+    ["CREATE TABLE IF NOT EXISTS memories (key TEXT PRIMARY KEY, content TEXT, timestamp TEXT, access_count INTEGER)"],
+    # External-content FTS5 index over memories.content, kept in sync by triggers.
+    [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(content, content='memories', content_rowid='rowid')",
+        "CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN "
+        "INSERT INTO memories_fts(rowid, content) VALUES (new.rowid, new.content); END",
+        "CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN "
+        "INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.rowid, old.content); END",
+        "CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN "
+        "INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.rowid, old.content); "
+        "INSERT INTO memories_fts(rowid, content) VALUES (new.rowid, new.content); END",
+        # Backfills rows written before the index existed.
+        "INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')",
+    ],
+    [
+        "CREATE INDEX IF NOT EXISTS memories_timestamp ON memories (timestamp)",
+        "CREATE INDEX IF NOT EXISTS memories_access_count ON memories (access_count)",
+    ],
+    # Row count maintained by triggers so memory_count never scans the table.
+    # Upserts that hit an existing key run the UPDATE path and leave it alone.
+    [
+        "CREATE TABLE IF NOT EXISTS memory_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "INSERT OR REPLACE INTO memory_stats (name, value) VALUES ('rows', (SELECT COUNT(*) FROM memories))",
+        "CREATE TRIGGER IF NOT EXISTS memory_stats_insert AFTER INSERT ON memories BEGIN "
+        "UPDATE memory_stats SET value = value + 1 WHERE name = 'rows'; END",
+        "CREATE TRIGGER IF NOT EXISTS memory_stats_delete AFTER DELETE ON memories BEGIN "
+        "UPDATE memory_stats SET value = value - 1 WHERE name = 'rows'; END",
+    ],
+    # Earlier imports kept ISO "T"-separated timestamps, which sort after
+    # same-day ones written by datetime('now').
+    ["UPDATE memories SET timestamp = datetime(timestamp) WHERE timestamp LIKE '%T%' AND datetime(timestamp) IS NOT NULL"],
+]
+SEARCH_MEMORIES = (
+    "SELECT m.key, m.content, bm25(memories_fts) AS rank FROM memories_fts "
+    "JOIN memories m ON m.rowid = memories_fts.rowid WHERE memories_fts MATCH ? ORDER BY rank LIMIT ?"
+)
+COUNT_MEMORIES = "SELECT value FROM memory_stats WHERE name = 'rows'"
+TOP_ACCESSED = "SELECT key, content, timestamp, access_count FROM memories ORDER BY access_count DESC LIMIT ?"
+RECENT_SINCE = (
+    "SELECT key, content, timestamp, access_count FROM memories WHERE timestamp >= datetime(?) "
+    "ORDER BY timestamp DESC LIMIT ?"
+)
+_WORD = re.compile(r"\w+")
+# Left out of full-text queries: they match most rows, so scoring them would
+# make every query cost a scan of a large part of the index.
+STOP_WORDS = frozenset(
+    "a an and are as at be but by do for from have i in is it me my of on or so that the this to was we what with you".split()
+)
+
+
+def _fts_query(text: str, operator: str = "OR") -> Optional[str]:
+    words = list(dict.fromkeys(_WORD.findall(text.lower())))
+    terms = [word for word in words if word not in STOP_WORDS] or words
+    if not terms:
+        return None
+    # Quote every word so user input is never parsed as FTS5 syntax.
+    return f" {operator} ".join(f'"{term}"' for term in terms)
+
 class BrainEngine:
-    def __init__(self, db_path: str = ":memory:") -> None:
+    """sqlite-backed memory store with group commits.
+
+    Writes are queued and a single writer task applies everything queued
+    within ``commit_window`` seconds (up to ``max_batch`` statements) in one
+    transaction.  Each caller returns only after the transaction holding its
+    write has committed, so durability matches a commit per write.  Bulk
+    loads go through the same queue, so only the writer task ever opens or
+    ends a transaction on ``db``; when a transaction fails, its writes are
+    retried one at a time so only the failing write reports the error.
+
+    Reads are plain SELECTs: access counts accumulate in memory and are added
+    to the table in one batch every ``access_flush_interval`` seconds, once
+    ``access_flush_size`` keys are pending, and on ``close``.  Stored counts
+    are therefore eventually consistent.
+
+    Reads go through a pool of ``read_pool_size`` read-only connections, each
+    with its own worker thread, so they run alongside one another and
+    alongside the writer instead of queueing behind it.  Time spent waiting
+    for a free connection is recorded in the
+    ``unified_ai_read_pool_wait_seconds`` histogram of ``metrics`` and
+    summarised by ``pool_stats``.  An in-memory
+    database cannot be shared between connections, so there reads use the
+    writer's connection.
+
+    Memory content is indexed by an FTS5 table; ``search`` ranks matches with
+    BM25 inside sqlite and ``reason`` recalls the best one when it shares at
+    least ``recall_threshold`` of its distinct words with the input.
+
+    The schema is versioned through ``MIGRATIONS``.  Indexes on ``timestamp``
+    and ``access_count`` back ``recent_since`` and ``top_k_accessed``, and a
+    trigger-maintained counter makes ``memory_count`` a single-row lookup.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        commit_window: float = 0.002,
+        max_batch: int = 512,
+        access_flush_interval: float = 1.0,
+        access_flush_size: int = 1000,
+        recall_threshold: float = 0.8,
+        read_pool_size: int = 4,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self.recall_threshold = recall_threshold
+        self.commit_window = commit_window
+        self.max_batch = max_batch
+        self.access_flush_interval = access_flush_interval
+        self.access_flush_size = access_flush_size
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._writes: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._pending_access: Dict[str, int] = {}
+        self._access_flusher: Optional[asyncio.Task] = None
+        self._size_flush: Optional[asyncio.Task] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_connections: List[Any] = []
+        self.read_wait_max = 0.0
+        self.metrics = metrics or MetricsRegistry()
+        self._read_wait = self.metrics.histogram(
+            "unified_ai_read_pool_wait_seconds", "Time reads waited for a pooled read-only connection"
+        )
+        self.metrics.gauge(
+            "unified_ai_read_pool_idle",
+            "Pooled read-only connections not lent out",
+            callback=lambda: self._readers.qsize() if self._readers is not None else 0,
+        )
 
     async def initialize(self) -> None:
-        self.db = await aiosqlite.connect(self.db_path)
-        await self.db.execute(
-            "CREATE TABLE IF NOT EXISTS memories (key TEXT PRIMARY KEY, content TEXT, timestamp TEXT, access_count INTEGER)"
-        )
-        await self.db.commit()
+        self.db = await aiosqlite.connect(self.db_path, cached_statements=256)
+        # WAL lets readers proceed during a commit and turns each commit into
+        # one sequential log append; synchronous=FULL keeps every commit durable.
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=FULL")
+        await self._migrate()
         self.rules = {
             "productivity": "Try time-blocking and prioritizing tasks with a Pomodoro technique.",
             "learning": "Consider spaced repetition and hands-on projects.",
         }
+        self._writes = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop())
+        self._access_flusher = asyncio.create_task(self._flush_access_loop())
+        await self._open_readers()
 
-    async def store_memory(self, key: str, value: str) -> None:
+    async def _open_readers(self) -> None:
+        if self.read_pool_size <= 0 or self.db_path in ("", ":memory:") or "mode=memory" in self.db_path:
+            return
+        # The writer has already switched the file to WAL, which readers need
+        # to run next to a writer; mode=ro keeps them from ever taking a write lock.
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+        self._readers = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            conn = await aiosqlite.connect(uri, uri=True, cached_statements=256)
+            self._reader_connections.append(conn)
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def read_connection(self) -> AsyncGenerator[Any, None]:
+        """Borrow a read-only connection from the pool for the duration of a block."""
+        if self._readers is None:
+            yield self.db
+            return
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        conn = await self._readers.get()
+        waited = loop.time() - started
+        self._read_wait.observe(waited)
+        self.read_wait_max = max(self.read_wait_max, waited)
         try:
-            await self.db.execute(
-                "INSERT OR REPLACE INTO memories (key, content, timestamp, access_count) VALUES (?, ?, datetime('now'), COALESCE((SELECT access_count FROM memories WHERE key = ?),0))",
-                (key, value, key),
-            )
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Read pool size and how long reads have waited for a free connection."""
+        return {
+            "size": len(self._reader_connections),
+            "idle": self._readers.qsize() if self._readers is not None else 0,
+            "acquisitions": self._read_wait.count,
+            "wait_seconds_total": self._read_wait.sum,
+            "wait_seconds_max": self.read_wait_max,
+        }
+
+    async def _migrate(self) -> None:
+        """Apply the ``MIGRATIONS`` this database has not seen, one transaction each."""
+        async with self.db.execute("PRAGMA user_version") as cursor:
+            (version,) = await cursor.fetchone()
+        for target, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            await self.db.execute("BEGIN")
+            try:
+                for statement in statements:
+                    await self.db.execute(statement)
+                await self.db.execute(f"PRAGMA user_version = {target}")
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+            self.logger.info("Migrated memories schema to version %d", target)
+
+    async def _write(self, sql: str, params: tuple) -> None:
+        """Queue a write and wait until the batch containing it is committed."""
+        await self._write_many(sql, [params])
+
+    async def _write_many(self, sql: str, rows: List[tuple]) -> None:
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((sql, rows, future))
+        await future
+
+    async def _write_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._writes.get()
+            if item is None:
+                break
+            batch = [item]
+            if self.commit_window:
+                await asyncio.sleep(self.commit_window)
+            while len(batch) < self.max_batch and not self._writes.empty():
+                item = self._writes.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch: List[tuple]) -> None:
+        try:
+            # Consecutive writes of the same statement go out as one executemany.
+            start = 0
+            while start < len(batch):
+                sql = batch[start][0]
+                end = start
+                while end < len(batch) and batch[end][0] == sql:
+                    end += 1
+                await self.db.executemany(sql, [params for _, rows, _ in batch[start:end] for params in rows])
+                start = end
             await self.db.commit()
+        except Exception as exc:
+            await self.db.rollback()
+            if len(batch) > 1:
+                # Retry each write on its own so one bad write does not fail
+                # the others that happened to share its transaction.
+                for item in batch:
+                    await self._commit_batch([item])
+                return
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def store_memory(self, key: str, value: str) -> None:
+        try:
+            await self._write(UPSERT_MEMORY, (key, value))
         except Exception as exc:
             self.logger.error("Storing memory failed: %s", exc)
 
+    async def store_many(self, records: Union[Iterable[Any], AsyncIterable[Any]], batch_size: int = 1000) -> int:
+        """Store ``(key, content)`` pairs, handing the writer one ``executemany`` per batch."""
+        stored = 0
+        async for batch in _batches(records, batch_size):
+            await self._write_many(UPSERT_MEMORY, [tuple(record) for record in batch])
+            stored += len(batch)
+        return stored
+
+    async def import_memories(self, memories: Union[Iterable[Any], AsyncIterable[Any]], batch_size: int = 1000) -> int:
+        """Bulk-load exported memories, keeping their timestamps and access counts."""
+        stored = 0
+        async for batch in _batches(memories, batch_size):
+            await self._write_many(
+                IMPORT_MEMORY,
+                [(m["key"], m["content"], m["timestamp"], m.get("access_count", 0)) for m in batch],
+            )
+            stored += len(batch)
+        return stored
+
     async def retrieve_memory(self, key: str) -> Optional[str]:
         try:
-            async with self.db.execute(
-                "SELECT content, access_count FROM memories WHERE key = ?",
-                (key,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    await self.db.execute(
-                        "UPDATE memories SET access_count = access_count + 1 WHERE key = ?",
-                        (key,),
-                    )
-                    await self.db.commit()
-                    return row[0]
+            async with self.read_connection() as db:
+                async with db.execute(
+                    "SELECT content, access_count FROM memories WHERE key = ?",
+                    (key,),
+                ) as cursor:
+                    row = await cursor.fetchone()
+            if row:
+                self._pending_access[key] = self._pending_access.get(key, 0) + 1
+                if len(self._pending_access) >= self.access_flush_size and (
+                    self._size_flush is None or self._size_flush.done()
+                ):
+                    self._size_flush = asyncio.create_task(self.flush_access_counts())
+                return row[0]
             return None
         except Exception as exc:
             self.logger.error("Retrieving memory failed: %s", exc)
             return None
 
+    async def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Return up to ``k`` memories ranked by FTS5 BM25 relevance to ``query``."""
+        return await self._search(_fts_query(query), k)
+
+    async def _search(self, match: Optional[str], k: int) -> List[Dict[str, Any]]:
+        if match is None or k <= 0:
+            return []
+        async with self.read_connection() as db:
+            async with db.execute(SEARCH_MEMORIES, (match, k)) as cursor:
+                rows = await cursor.fetchall()
+        return [{"key": key, "content": content, "score": -rank} for key, content, rank in rows]
+
+    async def _recall(self, text: str) -> Optional[str]:
+        # A recall needs nearly every word anyway, so require all content words;
+        # the intersection is far cheaper than ranking every partial match.
+        best = await self._search(_fts_query(text, "AND"), 1)
+        if not best:
+            return None
+        words = set(_WORD.findall(text.lower()))
+        doc = set(_WORD.findall(best[0]["content"].lower()))
+        if len(words & doc) / max(len(words), len(doc)) < self.recall_threshold:
+            return None
+        return await self.retrieve_memory(best[0]["key"])
+
+    async def top_k_accessed(self, k: int = 10) -> List[Dict[str, Any]]:
+        """Return the ``k`` most accessed memories, as of the last access-count flush."""
+        return await self._select(TOP_ACCESSED, (k,))
+
+    async def recent_since(self, since: Union[datetime, str], limit: int = 100) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` memories stored at or after ``since``, newest first.
+
+        Stored timestamps are UTC, and so is a naive ``since``, whether a
+        ``datetime`` (as from ``datetime.utcnow()`` or a memory's exported
+        timestamp) or a string read by sqlite's ``datetime()``.  Aware values
+        are converted.
+        """
+        if isinstance(since, datetime):
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc)
+            since = since.strftime("%Y-%m-%d %H:%M:%S")
+        return await self._select(RECENT_SINCE, (since, limit))
+
+    async def _select(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        async with self.read_connection() as db:
+            async with db.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+        return [
+            {"key": key, "content": content, "timestamp": timestamp, "access_count": count}
+            for key, content, timestamp, count in rows
+        ]
+
+    async def flush_access_counts(self) -> None:
+        """Add the access counts gathered since the last flush to the table."""
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
+        try:
+            await self._write_many(ADD_ACCESS, [(count, key) for key, count in pending.items()])
+        except Exception as exc:
+            self.logger.error("Flushing access counts failed: %s", exc)
+            for key, count in pending.items():
+                self._pending_access[key] = self._pending_access.get(key, 0) + count
+
+    async def _flush_access_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.access_flush_interval)
+            await self.flush_access_counts()
+
     async def reason(self, text: str) -> str:
         lowered = text.lower()
         for key, val in self.rules.items():
@@ -175,6 +544,8 @@ class BrainEngine:
                 await self.learn(text)
                 return f"Reasoned: {val}"
         mem = await self.retrieve_memory(lowered)
+        if mem is None:
+            mem = await self._recall(lowered)
         if mem:
             return f"I recall you said: {mem}"
         await self.store_memory(lowered, text)
@@ -190,11 +561,26 @@ class BrainEngine:
             return False
 
     async def memory_count(self) -> int:
-        async with self.db.execute("SELECT COUNT(*) FROM memories") as cursor:
-            row = await cursor.fetchone()
-            return row[0] if row else 0
+        async with self.read_connection() as db:
+            async with db.execute(COUNT_MEMORIES) as cursor:
+                row = await cursor.fetchone()
+                return row[0] if row else 0
 
     async def close(self) -> None:
+        if self._access_flusher is not None:
+            self._access_flusher.cancel()
+            await asyncio.gather(self._access_flusher, return_exceptions=True)
+            self._access_flusher = None
+        if self._writer is not None:
+            await self.flush_access_counts()
+            # Flush queued writes before closing the connection.
+            await self._writes.put(None)
+            await self._writer
+            self._writer = None
+        for conn in self._reader_connections:
+            await conn.close()
+        self._reader_connections = []
+        self._readers = None
         await self.db.close()
 
 # SoulEngine
@@ -258,7 +644,8 @@ class UnifiedAI:
         self.redis_url = redis_url
         self.redis = redis.from_url(redis_url, decode_responses=True) if redis else None
         self.soul = SoulEngine()
-        self.brain = BrainEngine()
+        self.metrics = MetricsRegistry()
+        self.brain = BrainEngine(metrics=self.metrics)
         self.optical = OpticalEngine(self.redis, self.feature_manager)
         self.aura = AuraEngine()
         self.speech = SpeechEngine(self.optical)
@@ -313,19 +700,19 @@ class SystemReplicator:
         self.key = encryption_key.encode() if encryption_key else None
 
     async def _snapshot(self) -> Dict[str, Any]:
+        await self.engine.brain.flush_access_counts()
         memories: List[Dict[str, Any]] = []
-        async with self.engine.brain.db.execute(
-            "SELECT key, content, timestamp, access_count FROM memories"
-        ) as cursor:
-            async for row in cursor:
-                memories.append(
-                    {
-                        "key": row[0],
-                        "content": row[1],
-                        "timestamp": row[2],
-                        "access_count": row[3],
-                    }
-                )
+        async with self.engine.brain.read_connection() as db:
+            async with db.execute("SELECT key, content, timestamp, access_count FROM memories") as cursor:
+                async for row in cursor:
+                    memories.append(
+                        {
+                            "key": row[0],
+                            "content": row[1],
+                            "timestamp": row[2],
+                            "access_count": row[3],
+                        }
+                    )
         return {"memories": memories, "features": list(self.engine.feature_manager.enabled)}
 
     def _secure(self, data: Any) -> str:
@@ -344,8 +731,7 @@ class SystemReplicator:
         await duplicate.initialize()
         for feat in snapshot["features"]:
             duplicate.feature_manager.enable(feat)
-        for mem in snapshot["memories"]:
-            await duplicate.brain.store_memory(mem["key"], mem["content"])
+        await duplicate.brain.import_memories(snapshot["memories"])
         await self.engine.optical.transfer_data(self._secure({"status": "spawned"}), f"sync:{self.token}")
         return duplicate
 
@@ -410,11 +796,13 @@ class ChatbotGUI:
         try:
             features = self.engine.list_enabled_features()
             memory_count = await self.engine.brain.memory_count()
+            pool = self.engine.brain.pool_stats()
             redis_ok = await self.engine.redis.ping() if redis and self.engine.redis else False
             status = f"Status at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}:\n"
             status += f"Redis Connected: {redis_ok}\n"
             status += f"Enabled Features: {', '.join(features) or 'None'}\n"
-            status += f"Memory Count: {memory_count}"
+            status += f"Memory Count: {memory_count}\n"
+            status += f"Read Pool: {pool['idle']}/{pool['size']} idle, max wait {pool['wait_seconds_max'] * 1000:.1f} ms"
             self.display_message(status, "purple")
         except Exception as exc:
             self.display_message(f"Status Error: {exc}", "red")
@@ -446,7 +834,8 @@ async def lifespan(app: Optional[Any] = None, engine: Optional[UnifiedAI] = None
 
 if __name__ == "__main__":
     try:
-        import aiosqlite
+        if aiosqlite is None:
+            raise ImportError("aiosqlite")
         asyncio.run(main())
     except ImportError:
         print("Please install required dependencies: pip install aiosqlite textblob")
@@ -0,0 +1,203 @@
+"""Coordination between pre-forked API worker processes through Redis."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .streams import default_consumer_name
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle
+    from . import UnifiedAI
+
+
+def _text(value: Any) -> str:
+    # Engines with a binary codec talk to Redis without decoding.
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _entry_key(entry_id: str) -> tuple:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class WorkerCoordinator:
+    """Track live workers and share enabled features and memories between them.
+
+    Every worker heartbeats into a sorted set; the deployment is *ready* once
+    ``expected`` workers have heartbeated within ``ttl`` seconds.  Entries
+    older than that, left by workers that crashed, are pruned before
+    counting.  Enabled network features live in a Redis set and are merged
+    into each worker's :class:`NetworkFeatureManager` on every heartbeat.
+
+    Memories are shared as well.  Every ``sync_interval`` seconds a worker
+    appends the brain changes it made itself (see
+    :meth:`BrainEngine.changes_since`) to the ``memory_log`` stream, keeps
+    the ``memories`` and ``memory_access`` hashes holding every shared memory
+    and near-duplicate alias up to date in the same transaction, and merges the changes other workers
+    logged into its own brain (see :meth:`BrainEngine.apply_changes`).  A
+    starting worker, or one that fell behind the ``memory_log_size`` entries
+    kept in the stream, loads the hashes first.  Sharing is eventually
+    consistent: a memory stored by one worker is recalled by the others
+    after the next sync, and concurrent writes to one key keep the newer.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        expected: int,
+        worker_id: Optional[str] = None,
+        namespace: str = "unified_ai",
+        heartbeat: float = 2.0,
+        ttl: float = 6.0,
+        sync_interval: float = 0.05,
+        memory_log_size: int = 10_000,
+    ) -> None:
+        self.redis = redis_client
+        self.expected = expected
+        self.worker_id = worker_id or default_consumer_name()
+        self.workers_key = f"{namespace}:workers"
+        self.features_key = f"{namespace}:features"
+        self.memories_key = f"{namespace}:memories"
+        self.access_key = f"{namespace}:memory_access"
+        self.memory_log_key = f"{namespace}:memory_log"
+        self.heartbeat = heartbeat
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.memory_log_size = memory_log_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._engine: Optional["UnifiedAI"] = None
+        self._tasks: List[asyncio.Task] = []
+        # Brain sequence pushed so far, and the last memory log entry read.
+        self._pushed = 0
+        self._last_id = "0-0"
+
+    async def start(self, engine: "UnifiedAI") -> None:
+        """Publish local features, load shared memories and announce readiness."""
+        self._engine = engine
+        engine.coordinator = self
+        if engine.feature_manager.enabled:
+            await self.redis.sadd(self.features_key, *engine.feature_manager.enabled)
+        self._pushed = engine.brain.sequence
+        await self._hydrate()
+        await self._beat()
+        self._tasks = [asyncio.create_task(self._run()), asyncio.create_task(self._sync_loop())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._engine is not None:
+            # Hand over the last local changes before leaving.
+            await self._push()
+        await self.redis.zrem(self.workers_key, self.worker_id)
+
+    async def share_feature(self, feature: str) -> None:
+        await self.redis.sadd(self.features_key, feature)
+
+    async def live_workers(self) -> int:
+        # Crashed workers never remove themselves; drop their stale entries.
+        await self.redis.zremrangebyscore(self.workers_key, "-inf", f"({time.time() - self.ttl}")
+        return await self.redis.zcard(self.workers_key)
+
+    async def ready(self) -> bool:
+        return await self.live_workers() >= self.expected
+
+    async def _beat(self) -> None:
+        await self.redis.zadd(self.workers_key, {self.worker_id: time.time()})
+        if self._engine is not None:
+            for feature in await self.redis.smembers(self.features_key):
+                feature = _text(feature)
+                if feature not in self._engine.feature_manager.enabled:
+                    self._engine.feature_manager.enable(feature)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            try:
+                await self._beat()
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.error("Worker heartbeat failed: %s", exc)
+
+    # -------------------------------------------------------------- memories
+
+    async def sync_memories(self) -> None:
+        """Push this worker's memory changes and merge those of the others."""
+        await self._push()
+        await self._pull()
+
+    async def _push(self) -> None:
+        brain = self._engine.brain
+        mark = brain.sequence
+        changes = brain.changes_since(self._pushed, merged=False)
+        if changes is None:
+            # The change log no longer reaches back; share everything.
+            changes = [{"op": "put", **memory} for memory in await brain.export_memories()]
+            changes += [{"op": "alias", "key": alias, "target": target} for alias, target in brain.aliases().items()]
+        if changes:
+            pipe = self.redis.pipeline(transaction=True)
+            for change in changes:
+                key = change["key"]
+                if change["op"] == "put":
+                    record = {field: change[field] for field in ("content", "timestamp")}
+                    pipe.hset(self.memories_key, key, json.dumps(record))
+                    pipe.hset(self.access_key, key, change["access_count"])
+                elif change["op"] == "access":
+                    pipe.hset(self.access_key, key, change["access_count"])
+                elif change["op"] == "alias":
+                    pipe.hset(self.memories_key, key, json.dumps({"alias": change["target"]}))
+                    pipe.hdel(self.access_key, key)
+                else:
+                    pipe.hdel(self.memories_key, key)
+                    pipe.hdel(self.access_key, key)
+            pipe.xadd(
+                self.memory_log_key,
+                {"worker": self.worker_id, "changes": json.dumps(changes)},
+                maxlen=self.memory_log_size,
+                approximate=True,
+            )
+            await pipe.execute()
+        self._pushed = mark
+
+    async def _pull(self) -> None:
+        brain = self._engine.brain
+        oldest = await self.redis.xrange(self.memory_log_key, count=1)
+        if oldest and _entry_key(_text(oldest[0][0])) > _entry_key(self._last_id):
+            # Entries this worker never read may have been trimmed away.
+            await self._hydrate()
+        for _stream, entries in await self.redis.xread({self.memory_log_key: self._last_id}, count=100):
+            for entry_id, fields in entries:
+                self._last_id = _text(entry_id)
+                fields = {_text(name): _text(value) for name, value in fields.items()}
+                if fields["worker"] != self.worker_id:
+                    await brain.apply_changes(json.loads(fields["changes"]), merge=True)
+
+    async def _hydrate(self) -> None:
+        latest = await self.redis.xrevrange(self.memory_log_key, count=1)
+        # Entries after this one are read from the stream; replaying any
+        # already reflected in the hashes is harmless.
+        self._last_id = _text(latest[0][0]) if latest else "0-0"
+        memories = await self.redis.hgetall(self.memories_key)
+        counts: Dict[str, int] = {
+            _text(key): int(count) for key, count in (await self.redis.hgetall(self.access_key)).items()
+        }
+        changes = []
+        for key, record in memories.items():
+            key, record = _text(key), json.loads(record)
+            if "alias" in record:
+                changes.append({"op": "alias", "key": key, "target": record["alias"]})
+            else:
+                changes.append({"op": "put", "key": key, "access_count": counts.get(key, 0), **record})
+        await self._engine.brain.apply_changes(changes, merge=True)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync_memories()
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.error("Memory sync failed: %s", exc)